@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""
+Compare the throughput of writing CRLF terminated SRT output as bytes, with
+the line endings replaced in every block and the text encoded by a codecs
+stream writer, against srt.compose_to translating and encoding whole batches.
+
+Formatting the timestamps dominates both, so the output stage is also timed
+on its own, starting from blocks which are already formatted with "\n".
+
+Usage: python benchmarks/bench_compose.py [subtitles]
+"""
+
+import codecs
+import io
+import sys
+import time
+from datetime import timedelta
+
+import srt
+
+REPEATS = 5
+# Roughly srt.COMPOSE_FLUSH_SIZE worth of the blocks from make_subs
+BLOCKS_PER_BATCH = 1000
+
+
+def make_subs(count):
+    return [
+        srt.Subtitle(
+            index,
+            timedelta(seconds=index),
+            timedelta(seconds=index, milliseconds=900),
+            "Line {} of some dialogue\nand a second line".format(index),
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def per_block(subs, output, encoding):
+    # How output was written before compose_to could encode: every block
+    # replaces its own line endings, and goes through a codecs writer
+    writer = codecs.getwriter(encoding)(output)
+    writer.write(srt.compose(subs, reindex=False, eol="\r\n"))
+
+
+def per_block_to(subs, output, encoding):
+    writer = codecs.getwriter(encoding)(output)
+    batch = []
+    batch_size = 0
+    for sub in subs:
+        block = sub.to_srt(eol="\r\n")
+        batch.append(block)
+        batch_size += len(block)
+        if batch_size >= srt.COMPOSE_FLUSH_SIZE:
+            writer.write("".join(batch))
+            batch = []
+            batch_size = 0
+    writer.write("".join(batch))
+
+
+def batched(subs, output, encoding):
+    srt.compose_to(subs, output, reindex=False, eol="\r\n", encoding=encoding)
+
+
+def stage_per_block(blocks, output, encoding):
+    writer = codecs.getwriter(encoding)(output)
+    for start in range(0, len(blocks), BLOCKS_PER_BATCH):
+        batch = blocks[start : start + BLOCKS_PER_BATCH]
+        writer.write("".join(block.replace("\n", "\r\n") for block in batch))
+
+
+def stage_batched(blocks, output, encoding):
+    encode = srt.srt._batch_encoder(encoding)
+    for start in range(0, len(blocks), BLOCKS_PER_BATCH):
+        batch = "".join(blocks[start : start + BLOCKS_PER_BATCH])
+        output.write(encode(batch.replace("\n", "\r\n")))
+
+
+def bench(name, func, data, encoding):
+    elapsed = float("inf")
+    for _ in range(REPEATS):
+        output = io.BytesIO()
+        start = time.perf_counter()
+        func(data, output, encoding)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    size = len(output.getvalue()) / 1024 / 1024
+    print("  {:<26} {:8.3f}s {:8.1f}MB/s".format(name, elapsed, size / elapsed))
+    return output.getvalue()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    subs = make_subs(count)
+    blocks = [sub.to_srt() for sub in subs]
+    print("{} subtitles, best of {}".format(count, REPEATS))
+    for encoding in ("utf-8", "utf-16"):
+        print(encoding + ":")
+        results = [
+            bench("per-block replace, whole", per_block, subs, encoding),
+            bench("per-block replace, batched", per_block_to, subs, encoding),
+            bench("compose_to, encoding", batched, subs, encoding),
+        ]
+        print(encoding + ", output stage only:")
+        results += [
+            bench("per-block replace", stage_per_block, blocks, encoding),
+            bench("batch replace", stage_batched, blocks, encoding),
+        ]
+        assert len(set(results)) == 1
+
+
+if __name__ == "__main__":
+    main()
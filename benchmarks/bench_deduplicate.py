@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Compare srt.tools.deduplicate, which streams over subtitles in order of start
+time, against the previous version, which sorted the whole list by content
+and deleted each duplicate from it. The previous version is quadratic, so it's
+only run on the first OLD_VERSION_LIMIT subtitles.
+
+The peak memory of the new version is measured over a stream of subtitles,
+so it only counts what deduplicate itself holds on to.
+
+The --similarity mode is timed on FUZZY_COUNT subtitles of random words, some
+repeated with a character changed, like OCR duplicates.
+
+Usage: python benchmarks/bench_deduplicate.py [subtitles]
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+import srt
+from srt.tools import _cli, _utils
+from srt.tools.deduplicate import deduplicate
+
+OLD_VERSION_LIMIT = 100000
+FUZZY_COUNT = 20000
+# Every line of dialogue is repeated this many times, a second apart
+REPEATS = 4
+
+
+def make_subs(count):
+    for index in range(count):
+        start = index * 250
+        yield srt.Subtitle(
+            index + 1,
+            start,
+            start + 200,
+            "Line {} of some dialogue".format(index // REPEATS),
+        )
+
+
+def make_noisy_subs(count):
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = [
+        "".join(rng.choice(letters) for _ in range(rng.randint(2, 8)))
+        for _ in range(3000)
+    ]
+    start = 0
+    for index in range(count):
+        if index == 0 or rng.random() < 0.6:
+            line = " ".join(rng.choice(words) for _ in range(rng.randint(4, 10)))
+            content = line
+        else:
+            position = rng.randrange(len(line))
+            content = line[:position] + rng.choice("l1I0O,.") + line[position + 1 :]
+        yield srt.Subtitle(index + 1, start, start + 200, content)
+        start += 400
+
+
+def old_deduplicate(orig_subs, acceptable_diff):
+    indices_to_remove = set()
+    sorted_subs = sorted(
+        enumerate(orig_subs), key=lambda sub: (sub[1].content, sub[1].start)
+    )
+    if sorted_subs:
+        acceptable_diff = _utils.timestamp_like(
+            acceptable_diff, sorted_subs[0][1].start
+        )
+
+    for subs in _cli.sliding_window(sorted_subs, width=2, inclusive=False):
+        cur_idx, cur_sub = subs[0]
+        next_idx, next_sub = subs[1]
+        if cur_sub.content == next_sub.content and (
+            not acceptable_diff or cur_sub.start + acceptable_diff >= next_sub.start
+        ):
+            indices_to_remove.add(next_idx)
+
+    offset = 0
+    for idx in indices_to_remove:
+        del orig_subs[idx - offset]
+        offset += 1
+
+
+def bench_old(count, acceptable_diff):
+    subs = list(make_subs(count))
+    start = time.perf_counter()
+    old_deduplicate(subs, acceptable_diff)
+    return time.perf_counter() - start, len(subs)
+
+
+def bench_new(count, acceptable_diff):
+    start = time.perf_counter()
+    kept = sum(1 for _ in deduplicate(make_subs(count), acceptable_diff))
+    return time.perf_counter() - start, kept
+
+
+def bench_similar(count, acceptable_diff, similarity):
+    subs = list(make_noisy_subs(count))
+    start = time.perf_counter()
+    kept = sum(1 for _ in deduplicate(subs, acceptable_diff, similarity))
+    return time.perf_counter() - start, kept
+
+
+def peak_memory(count, acceptable_diff):
+    # Measured separately, since tracemalloc slows everything down
+    gc.collect()
+    tracemalloc.start()
+    for _ in deduplicate(make_subs(count), acceptable_diff):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    old_count = min(count, OLD_VERSION_LIMIT)
+    row = "  {:<10} {:>8} subtitles {:8.3f}s, {} kept"
+
+    for acceptable_diff in (timedelta(milliseconds=5000), timedelta(0)):
+        print("acceptable_diff={}:".format(acceptable_diff))
+        print(row.format("previous", old_count, *bench_old(old_count, acceptable_diff)))
+        for stream_count in sorted({old_count, count}):
+            elapsed, kept = bench_new(stream_count, acceptable_diff)
+            print(row.format("streaming", stream_count, elapsed, kept))
+        peak = peak_memory(count, acceptable_diff)
+        print("  streaming peak memory: {:.2f}MB".format(peak / 1024 / 1024))
+
+    for acceptable_diff in (timedelta(milliseconds=5000), timedelta(0)):
+        print("acceptable_diff={}, with OCR-like noise:".format(acceptable_diff))
+        for similarity in (None, 0.9, 0.7):
+            elapsed, kept = bench_similar(FUZZY_COUNT, acceptable_diff, similarity)
+            name = "exact" if similarity is None else "sim={}".format(similarity)
+            print(row.format(name, FUZZY_COUNT, elapsed, kept))
+
+
+if __name__ == "__main__":
+    main()
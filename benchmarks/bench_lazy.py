@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Compare the memory used by srt.parse and srt.parse_lazy, both when only
+reading the times of each subtitle, and when keeping every subtitle.
+
+Usage: python benchmarks/bench_lazy.py [blocks]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+import srt
+
+
+def make_srt(blocks):
+    subs = (
+        srt.Subtitle(
+            index,
+            timedelta(seconds=index),
+            timedelta(seconds=index, milliseconds=900),
+            "Line {} of some dialogue\nand a second line".format(index),
+        )
+        for index in range(1, blocks + 1)
+    )
+    return srt.compose(subs, reindex=False, eol="\r\n").encode("utf-8")
+
+
+def bench(name, func, keep):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if keep:
+        subs = list(func())
+        total = sum(sub.end - sub.start for sub in subs)
+    else:
+        total = sum(sub.end - sub.start for sub in func())
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        "  {:<20} {:8.3f}s {:8.1f}MB peak  (total {}ms)".format(
+            name, elapsed, peak / 1024 / 1024, total
+        )
+    )
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data = make_srt(blocks)
+    print("{} blocks, {:.1f}MB".format(blocks, len(data) / 1024 / 1024))
+    text = data.decode("utf-8")
+    cases = [
+        ("parse", lambda: srt.parse(text, milliseconds=True)),
+        ("parse_lazy, str", lambda: srt.parse_lazy(text, milliseconds=True)),
+        ("parse_lazy, bytes", lambda: srt.parse_lazy(data, milliseconds=True)),
+    ]
+    for keep in (False, True):
+        print("keeping every subtitle:" if keep else "only reading the times:")
+        for name, func in cases:
+            bench(name, func, keep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""
+Time srt mux's time matching on many tracks which are each in order, like
+the files of a film in several languages.
+
+The previous version sorted all of the subtitles, and walked a sliding
+window over them for start times and then for end times. The current one
+sorts them by start once, and matches both in one sweep with
+srt.tools.mux.match_times. Either way, compose sorts them again for output.
+
+Putting the tracks in order of start time is also timed on its own, both by
+sorting them all at once and by merging them with a heap. sorted() finds the
+runs which are already in order and merges those itself, so it's the faster
+k-way merge of the two.
+
+Usage: python benchmarks/bench_mux.py [tracks] [subtitles per track]
+"""
+
+import collections
+import copy
+import heapq
+import operator
+import random
+import sys
+import time
+from datetime import timedelta
+
+import srt
+from srt.tools import _cli, _utils
+from srt.tools.mux import match_times
+
+REPEATS = 3
+ACCEPTABLE_DIFF = timedelta(milliseconds=600)
+
+
+def make_tracks(tracks, count):
+    rng = random.Random(0)
+    made = []
+    for track in range(tracks):
+        subs = []
+        start = 0
+        for index in range(count):
+            # Every track says roughly the same thing at roughly the same time
+            start += 2500
+            jitter = start + rng.randint(-300, 300)
+            subs.append(
+                srt.Subtitle(
+                    index + 1,
+                    timedelta(milliseconds=jitter),
+                    timedelta(milliseconds=jitter + rng.randint(1000, 2000)),
+                    "Track {} line {}".format(track, index),
+                )
+            )
+        made.append(subs)
+    return made
+
+
+def old_mux(subs, acceptable_diff, attr, width=5):
+    sorted_subs = sorted(subs, key=operator.attrgetter(attr))
+    acceptable_diff = _utils.timestamp_like(
+        acceptable_diff, getattr(sorted_subs[0], attr)
+    )
+    for window in _cli.sliding_window(sorted_subs, width=width):
+        current_comp = getattr(window[0], attr)
+        for future_sub in window[1:]:
+            if current_comp + acceptable_diff > getattr(future_sub, attr):
+                setattr(future_sub, attr, current_comp)
+            else:
+                break
+
+
+def previous(tracks):
+    subs = [sub for track in tracks for sub in track]
+    old_mux(subs, ACCEPTABLE_DIFF, "start")
+    old_mux(subs, ACCEPTABLE_DIFF, "end")
+    return srt.compose(subs, in_place=True)
+
+
+def current(tracks):
+    subs = [sub for track in tracks for sub in track]
+    by_start = sorted(subs, key=operator.attrgetter("start"))
+    collections.deque(match_times(by_start, ACCEPTABLE_DIFF), maxlen=0)
+    return srt.compose(subs, in_place=True)
+
+
+def sort_all(tracks):
+    return sorted(
+        (sub for track in tracks for sub in track), key=operator.attrgetter("start")
+    )
+
+
+def heap_merge(tracks):
+    return list(heapq.merge(*tracks, key=operator.attrgetter("start")))
+
+
+def best_time(func, tracks):
+    best = None
+    for _ in range(REPEATS):
+        copied = copy.deepcopy(tracks)
+        start = time.perf_counter()
+        result = func(copied)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    track_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    tracks = make_tracks(track_count, count)
+    row = "  {:<12} {:8.3f}s"
+
+    print("Matching and composing {} tracks of {}:".format(track_count, count))
+    previous_time, previous_output = best_time(previous, tracks)
+    current_time, current_output = best_time(current, tracks)
+    print(row.format("previous", previous_time))
+    print(row.format("current", current_time))
+    print("  same output: {}".format(previous_output == current_output))
+
+    print("Putting them in order of start time:")
+    for func in (sort_all, heap_merge):
+        print(row.format(func.__name__, best_time(func, tracks)[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Compare srt.parse and srt.compose against their parallel versions.
+
+Usage: python benchmarks/bench_parallel.py [blocks] [workers]
+"""
+
+import sys
+import time
+from datetime import timedelta
+
+import srt
+from srt.parallel import compose_parallel, parse_parallel
+
+
+def make_subs(blocks):
+    return [
+        srt.Subtitle(
+            index,
+            timedelta(seconds=index),
+            timedelta(seconds=index, milliseconds=900),
+            "Line {} of some dialogue\nand a second line".format(index),
+        )
+        for index in range(1, blocks + 1)
+    ]
+
+
+def timed(name, func):
+    start = time.perf_counter()
+    result = func()
+    print("  {:<30} {:8.3f}s".format(name, time.perf_counter() - start))
+    return result
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    subs = make_subs(blocks)
+
+    print("{} blocks".format(blocks))
+    text = timed("compose", lambda: srt.compose(subs))
+    timed("compose_parallel", lambda: compose_parallel(subs, workers=workers))
+    for milliseconds in (False, True):
+        suffix = ", milliseconds" if milliseconds else ""
+        timed(
+            "parse" + suffix,
+            lambda: list(srt.parse(text, milliseconds=milliseconds)),
+        )
+        timed(
+            "parse_parallel" + suffix,
+            lambda: list(
+                parse_parallel(text, milliseconds=milliseconds, workers=workers)
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+"""
+Compare srt.parse against tokenizing every block with SRT_REGEX.
+
+Usage: python benchmarks/bench_parse.py [blocks] [repeats]
+"""
+
+import sys
+import timeit
+from datetime import timedelta
+
+import srt
+from srt import srt as srt_module
+
+
+def make_srt(blocks, eol="\n"):
+    subs = (
+        srt.Subtitle(
+            index,
+            timedelta(seconds=index),
+            timedelta(seconds=index, milliseconds=900),
+            "Line {} of some dialogue\nand a second line".format(index),
+        )
+        for index in range(1, blocks + 1)
+    )
+    return srt.compose(subs, reindex=False, eol=eol)
+
+
+def regex_tokenize(text):
+    return [srt_module._match_to_block(m) for m in srt.SRT_REGEX.finditer(text)]
+
+
+def regex_parse(text):
+    return [
+        srt_module._block_to_subtitle(srt_module._match_to_block(m))
+        for m in srt.SRT_REGEX.finditer(text)
+    ]
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    for eol in ("\n", "\r\n"):
+        text = make_srt(blocks, eol=eol)
+        cases = [
+            ("tokenize, SRT_REGEX", lambda: regex_tokenize(text)),
+            ("tokenize, fast path", lambda: list(srt_module._tokenize(text))),
+            ("parse, SRT_REGEX", lambda: regex_parse(text)),
+            ("parse, fast path", lambda: list(srt.parse(text))),
+        ]
+        print("{} blocks, eol={!r}".format(blocks, eol))
+        for name, func in cases:
+            best = min(timeit.repeat(func, number=1, repeat=repeats))
+            print("  {:<22} {:8.3f}s".format(name, best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+"""
+Compare the memory use and speed of srt.Subtitle against the old __dict__
+based implementation.
+
+Usage: python benchmarks/bench_subtitle.py [subtitles]
+"""
+
+import functools
+import gc
+import pickle
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+import srt
+
+
+@functools.total_ordering
+class DictSubtitle:
+    """srt.Subtitle as it was before it used __slots__."""
+
+    def __init__(self, index, start, end, content, proprietary=""):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.content = content
+        self.proprietary = proprietary
+
+    def __hash__(self):
+        return hash(frozenset(vars(self).items()))
+
+    def __eq__(self, other):
+        return vars(self) == vars(other)
+
+    def __lt__(self, other):
+        return self.start < other.start or (
+            self.start == other.start and self.end < other.end
+        )
+
+    def copy(self):
+        return DictSubtitle(**vars(self))
+
+
+def make_fields(count):
+    # Shared across both classes, so only the subtitle objects are measured
+    return [
+        (
+            index,
+            timedelta(seconds=(index * 7919) % count),
+            timedelta(seconds=(index * 7919) % count, milliseconds=900),
+            "Line {}".format(index),
+        )
+        for index in range(count)
+    ]
+
+
+def timed(name, func):
+    start = time.perf_counter()
+    result = func()
+    print("  {:<14} {:8.3f}s".format(name, time.perf_counter() - start))
+    return result
+
+
+def bench(cls, fields):
+    print(cls.__name__)
+    gc.collect()
+    tracemalloc.start()
+    subs = timed("create", lambda: [cls(*f) for f in fields])
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print("  {:<14} {:8.1f}MB".format("memory", size / 1024 / 1024))
+
+    timed("hash", lambda: [hash(sub) for sub in subs])
+    copies = timed("copy", lambda: [sub.copy() for sub in subs])
+    timed("eq", lambda: [a == b for a, b in zip(subs, copies)])
+    timed("sort", lambda: sorted(subs))
+    data = timed("pickle", lambda: pickle.dumps(subs, pickle.HIGHEST_PROTOCOL))
+    timed("unpickle", lambda: pickle.loads(data))
+    print("  {:<14} {:8.1f}MB".format("pickle size", len(data) / 1024 / 1024))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    fields = make_fields(count)
+    print("{} subtitles".format(count))
+    bench(DictSubtitle, fields)
+    bench(srt.Subtitle, fields)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,36 @@
 """A simple library for parsing, modifying, and composing SRT files."""
+
+import importlib
+import sys
+
 from srt import tools
 from .srt import *
+
+# These pull in modules of their own which most callers never need, so they're
+# only imported when first used
+_LAZY_ATTRIBUTES = {
+    "SubtitleIndex": "index",
+    "SubtitleTable": "table",
+    "compose_parallel": "parallel",
+    "parse_many": "parallel",
+    "parse_parallel": "parallel",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module("." + _LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Modules can only have __getattr__ (PEP 562) from Python 3.7, so import
+    # them all up front instead
+    for _name in _LAZY_ATTRIBUTES:
+        globals()[_name] = __getattr__(_name)
+    del _name
@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+
+"""Look up which subtitles are shown at a time, or during a range of time."""
+
+from bisect import bisect_left, bisect_right
+
+from .srt import _SORT_KEY
+
+
+class SubtitleIndex:
+    """
+    An index of subtitles by time, built once in O(n log n) time and O(n)
+    space, so that many queries can be answered without going through every
+    subtitle. Queries give their results in order of start time.
+
+    A query takes O(log n) time for each subtitle it finds which started
+    before the time or range asked about and is still shown then, plus one
+    more O(log n), plus O(1) for each subtitle starting within the range. That
+    is O((k + 1) log n) rather than O(log n + k) for k results, since each of
+    those subtitles is found by going down the tree on its own, but only a
+    handful of subtitles are ever shown at once, and a structure which met the
+    tighter bound and still gave results in order, like a sparse table for
+    range maximum queries, would take O(n log n) space to build.
+
+    The subtitles are kept sorted by start and end time, as in
+    :py:func:`srt.sort_and_reindex`, with a tree of the latest end time in
+    each range of them, so that subtitles which have already ended can be
+    skipped. Times given to queries must be in the same form as the
+    subtitles' times, either :py:class:`~datetime.timedelta` objects or
+    milliseconds. The subtitles are not copied, and must not be retimed
+    while they're indexed.
+
+    .. doctest::
+
+        >>> from datetime import timedelta
+        >>> from srt import Subtitle
+        >>> subs = [
+        ...     Subtitle(1, timedelta(seconds=1), timedelta(seconds=5), 'x'),
+        ...     Subtitle(2, timedelta(seconds=2), timedelta(seconds=3), 'y'),
+        ... ]
+        >>> index = SubtitleIndex(subs)
+        >>> [sub.content for sub in index.at(timedelta(seconds=4))]
+        ['x']
+
+    :param subtitles: The subtitles to index, in any order
+    :type subtitles: iterable of :py:class:`~srt.Subtitle` objects
+    """
+
+    def __init__(self, subtitles):
+        self.subtitles = sorted(subtitles, key=_SORT_KEY)
+        self.starts = [subtitle.start for subtitle in self.subtitles]
+
+        # A complete binary tree stored in a list, where node n has children
+        # 2n and 2n + 1, and the leaves are the subtitles in order. Each node
+        # holds the latest end of the subtitles under it, or None if there
+        # aren't any.
+        self._leaves = 1
+        while self._leaves < len(self.subtitles):
+            self._leaves *= 2
+        self._max_ends = [None] * (2 * self._leaves)
+        for position, subtitle in enumerate(self.subtitles):
+            self._max_ends[self._leaves + position] = subtitle.end
+        for node in range(self._leaves - 1, 0, -1):
+            left, right = self._max_ends[2 * node], self._max_ends[2 * node + 1]
+            if right is None or (left is not None and left >= right):
+                self._max_ends[node] = left
+            else:
+                self._max_ends[node] = right
+
+    def __len__(self):
+        return len(self.subtitles)
+
+    def __iter__(self):
+        return iter(self.subtitles)
+
+    def __repr__(self):
+        return "%s(<%d subtitles>)" % (type(self).__name__, len(self))
+
+    def at(self, time):
+        """
+        Find the subtitles shown at a time, which start at or before it and
+        end after it.
+
+        :param time: The time to look at
+        :rtype: list of :py:class:`~srt.Subtitle` objects
+        """
+        return self._take(self._ending_after(time, 0, bisect_right(self.starts, time)))
+
+    def overlapping(self, start, end):
+        """
+        Find the subtitles shown at any time from ``start`` up to ``end``, or
+        which start within that range, even if they're shown for no time.
+
+        :param start: The start of the range, which is included
+        :param end: The end of the range, which is not included
+        :rtype: list of :py:class:`~srt.Subtitle` objects
+        """
+        first_start = bisect_left(self.starts, start)
+        last_start = bisect_left(self.starts, end)
+        positions = self._ending_after(start, 0, min(first_start, last_start))
+        positions.extend(range(first_start, last_start))
+        return self._take(positions)
+
+    def starting(self, start, end):
+        """
+        Find the subtitles which start from ``start`` up to ``end``.
+
+        :param start: The start of the range, which is included
+        :param end: The end of the range, which is not included
+        :rtype: list of :py:class:`~srt.Subtitle` objects
+        """
+        return self.subtitles[
+            bisect_left(self.starts, start) : bisect_left(self.starts, end)
+        ]
+
+    def _take(self, positions):
+        return [self.subtitles[position] for position in positions]
+
+    def _ending_after(self, time, first, last):
+        """
+        Find the subtitles from position ``first`` up to ``last`` which end
+        after ``time``, by only going into the parts of the tree which do.
+        This takes O(log n) time for each one found, since every node visited
+        is on the path to one of them, or on one of the two paths bounding the
+        range.
+
+        :rtype: list of positions, in order
+        """
+        positions = []
+        # Right children are pushed first, so that left ones are visited first
+        stack = [(1, 0, self._leaves)]
+        while stack:
+            node, node_first, node_last = stack.pop()
+            max_end = self._max_ends[node]
+            if (
+                node_last <= first
+                or node_first >= last
+                or max_end is None
+                or max_end <= time
+            ):
+                continue
+            if node >= self._leaves:
+                positions.append(node_first)
+                continue
+            middle = (node_first + node_last) // 2
+            stack.append((2 * node + 1, middle, node_last))
+            stack.append((2 * node, node_first, middle))
+        return positions
@@ -0,0 +1,372 @@
+#!/usr/bin/python3
+
+"""Parse and compose large amounts of SRT data using several processes."""
+
+import collections
+import concurrent.futures
+import itertools
+import os
+import re
+
+from .srt import (
+    FILE_TYPES,
+    RGX_TIMESTAMP,
+    SRTParseError,
+    _SORT_KEY,
+    _block_to_subtitle,
+    _check_contiguity,
+    _report_skipped,
+    _skip_reason,
+    _tokenize,
+    parse,
+    srt_timestamp_to_milliseconds,
+    srt_timestamp_to_timedelta,
+)
+
+# Input is only split right before an index line and a timestamp line which
+# come after a blank line. SRT_REGEX always starts a block there, and none of
+# its lookaheads can see past it from an earlier block, so each shard tokenizes
+# exactly as it would as part of the whole input.
+SHARD_BOUNDARY_REGEX = re.compile(
+    r"\n\r?\n([0-9]+\r?\n{ts} *-[ -] *> *{ts})".format(ts=RGX_TIMESTAMP)
+)
+SHARDS_PER_WORKER = 4
+FILES_IN_FLIGHT_PER_WORKER = 2
+
+
+def parse_parallel(
+    srt,
+    ignore_errors=False,
+    milliseconds=False,
+    workers=None,
+    shards=None,
+    executor=None,
+):
+    """
+    Like :py:func:`srt.parse`, but split the input into shards which are parsed
+    in a pool of processes. The subtitles, and any :py:class:`srt.SRTParseError`
+    raised, are the same as from :py:func:`srt.parse`, including the character
+    offsets reported in the error.
+
+    This is only worth it for very large inputs, since every subtitle has to
+    be sent back from the process which parsed it.
+
+    :param srt: Subtitles in SRT format
+    :type srt: str or a file-like object
+    :param bool ignore_errors: See :py:func:`srt.parse`
+    :param bool milliseconds: See :py:func:`srt.parse`
+    :param int workers: The amount of processes to use (default: the amount
+                        of CPUs)
+    :param int shards: The amount of pieces to split the input into (default:
+                       four for each worker)
+    :param executor: A :py:class:`concurrent.futures.Executor` to use instead
+                     of starting a new process pool
+    :returns: The subtitles contained in the SRT file as
+              :py:class:`srt.Subtitle` objects
+    :rtype: :term:`generator` of :py:class:`srt.Subtitle` objects
+    :raises SRTParseError: See :py:func:`srt.parse`
+    """
+    if milliseconds:
+        to_time = srt_timestamp_to_milliseconds
+    else:
+        to_time = srt_timestamp_to_timedelta
+
+    if isinstance(srt, FILE_TYPES):
+        srt = srt.read()
+
+    workers = workers or os.cpu_count() or 1
+    bounds = _shard_bounds(srt, shards or workers * SHARDS_PER_WORKER)
+    starts = bounds[:-1]
+    pieces = [srt[start:end] for start, end in zip(starts, bounds[1:])]
+
+    with _executor_or_pool(executor, workers) as pool:
+        results = pool.map(_parse_shard, pieces, [to_time] * len(pieces))
+        expected_start = 0
+
+        for offset, shard_blocks in zip(starts, results):
+            for start, end, subtitle in shard_blocks:
+                start += offset
+                if start == offset and expected_start < offset:
+                    # SRT_REGEX starts a block with any whitespace before it,
+                    # which could be at the end of the previous shard
+                    preceding = srt[expected_start:offset]
+                    start = expected_start + len(preceding.rstrip())
+                _check_contiguity(srt, expected_start, start, ignore_errors)
+                yield subtitle
+                expected_start = offset + end
+
+        _check_contiguity(srt, expected_start, len(srt), ignore_errors)
+
+
+def compose_parallel(
+    subtitles,
+    reindex=True,
+    start_index=1,
+    strict=True,
+    eol=None,
+    workers=None,
+    shards=None,
+    executor=None,
+):
+    r"""
+    Like :py:func:`srt.compose`, but format the subtitles in a pool of
+    processes. The result is the same as from :py:func:`srt.compose`.
+
+    When reindexing, the subtitles are sorted and the ones which aren't useful
+    are skipped first, so each shard's first index is the sum of the lengths of
+    the shards before it.
+
+    :param subtitles: The subtitles to convert to SRT blocks
+    :type subtitles: :term:`iterator` of :py:class:`srt.Subtitle` objects
+    :param bool reindex: See :py:func:`srt.compose`
+    :param int start_index: See :py:func:`srt.compose`
+    :param bool strict: See :py:func:`srt.compose`
+    :param str eol: The end of line string to use (default "\\n")
+    :param int workers: The amount of processes to use (default: the amount
+                        of CPUs)
+    :param int shards: The amount of pieces to split the subtitles into
+                       (default: four for each worker)
+    :param executor: A :py:class:`concurrent.futures.Executor` to use instead
+                     of starting a new process pool
+    :returns: A single SRT formatted string
+    :rtype: str
+    """
+    if reindex:
+        subtitles = _useful_subtitles(sorted(subtitles, key=_SORT_KEY))
+    else:
+        subtitles = list(subtitles)
+
+    workers = workers or os.cpu_count() or 1
+    shard_count = shards or workers * SHARDS_PER_WORKER
+    shard_len = -(-len(subtitles) // shard_count) or 1
+    pieces = [
+        subtitles[start : start + shard_len]
+        for start in range(0, len(subtitles), shard_len)
+    ]
+
+    if reindex:
+        lengths = [len(piece) for piece in pieces]
+        indexes = list(itertools.accumulate([start_index] + lengths[:-1]))
+    else:
+        indexes = [None] * len(pieces)
+
+    with _executor_or_pool(executor, workers) as pool:
+        return "".join(
+            pool.map(
+                _compose_shard,
+                pieces,
+                indexes,
+                [strict] * len(pieces),
+                [eol] * len(pieces),
+            )
+        )
+
+
+def parse_many(
+    paths,
+    ignore_errors=False,
+    milliseconds=False,
+    encoding="utf-8-sig",
+    workers=None,
+    ordered=True,
+    queue_depth=None,
+    executor=None,
+):
+    """
+    Parse many SRT files in a pool of processes.
+
+    Only ``queue_depth`` files are read or parsed at once, and only that many
+    results are held waiting to be consumed, so ``paths`` can be a lazy
+    iterable over a very large amount of files.
+
+    :param paths: The paths of the files to parse
+    :type paths: iterable of str
+    :param bool ignore_errors: See :py:func:`srt.parse`
+    :param bool milliseconds: See :py:func:`srt.parse`
+    :param str encoding: The encoding of the files. The default, "utf-8-sig",
+                         is the same as the command line tools, and accepts
+                         UTF-8 with or without a byte order mark.
+    :param int workers: The amount of processes to use (default: the amount
+                        of CPUs)
+    :param bool ordered: If True, results are in the same order as ``paths``,
+                         otherwise they are in the order they're finished
+    :param int queue_depth: The most files to have in flight at once (default:
+                            two for each worker)
+    :param executor: A :py:class:`concurrent.futures.Executor` to use instead
+                     of starting a new process pool
+    :returns: ``(path, subtitles)`` for each file, where ``subtitles`` is a
+              list of :py:class:`srt.Subtitle` objects, or the exception
+              which stopped the file from being read or parsed: an
+              :py:class:`OSError`, a :py:class:`UnicodeDecodeError`, or an
+              :py:class:`srt.SRTParseError`
+    :rtype: :term:`generator` of tuples
+    """
+    workers = workers or os.cpu_count() or 1
+    queue_depth = queue_depth or workers * FILES_IN_FLIGHT_PER_WORKER
+
+    jobs = ((path, ignore_errors, milliseconds, encoding) for path in paths)
+
+    with _executor_or_pool(executor, workers) as pool:
+        for job, future in _submit_bounded(
+            pool, _parse_file, jobs, queue_depth, ordered
+        ):
+            yield job[0], future.result()
+
+
+def _submit_bounded(pool, func, jobs, queue_depth, ordered):
+    """
+    Call ``func(*job)`` in a pool for each job, with only ``queue_depth`` jobs
+    submitted at once. The next jobs are submitted as soon as earlier ones are
+    finished, so the pool is kept busy while the results are consumed.
+
+    :param pool: The :py:class:`concurrent.futures.Executor` to submit to
+    :param func: The function to call
+    :param jobs: The arguments to call ``func`` with, which are only taken as
+                 they're needed
+    :type jobs: iterable of tuples
+    :param int queue_depth: The most jobs to have in flight at once
+    :param bool ordered: If True, jobs are given back in the order they were
+                         taken, otherwise in the order they're finished
+    :returns: Each job, and the finished future for it
+    :rtype: :term:`generator` of tuples
+    """
+    jobs = iter(jobs)
+    in_flight = collections.OrderedDict()
+
+    def submit_more():
+        for job in itertools.islice(jobs, queue_depth - len(in_flight)):
+            in_flight[pool.submit(func, *job)] = job
+
+    submit_more()
+    while in_flight:
+        if ordered:
+            done = [next(iter(in_flight))]
+            concurrent.futures.wait(done)
+        else:
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+        for future in done:
+            yield in_flight.pop(future), future
+        submit_more()
+
+
+def _shard_bounds(srt, shard_count):
+    """
+    Find where to split SRT data into roughly equal shards.
+
+    :param str srt: The data to split
+    :param int shard_count: The amount of shards wanted
+    :returns: The start of every shard, followed by the end of the data
+    :rtype: list of int
+    """
+    bounds = [0]
+    shard_len = max(len(srt) // shard_count, 1)
+
+    for target in range(shard_len, len(srt), shard_len):
+        if target <= bounds[-1]:
+            continue
+        match = SHARD_BOUNDARY_REGEX.search(srt, target)
+        if match is None:
+            break
+        bounds.append(match.start(1))
+
+    bounds.append(len(srt))
+    return bounds
+
+
+def _parse_shard(shard, to_time):
+    """
+    Tokenize one shard of SRT data, without checking that it is contiguous.
+
+    :param str shard: The data to parse
+    :param to_time: The function to convert SRT timestamps with
+    :returns: The start and end of each block in ``shard``, and its subtitle
+    :rtype: list of tuples
+    """
+    return [
+        (block[0], block[1], _block_to_subtitle(block, to_time))
+        for block in _tokenize(shard)
+    ]
+
+
+def _parse_file(path, ignore_errors, milliseconds, encoding):
+    """
+    Read and parse one file for :py:func:`parse_many`.
+
+    :returns: The subtitles in the file, or the exception which stopped it
+              from being read or parsed
+    :rtype: list of :py:class:`srt.Subtitle` objects, or an exception
+    """
+    try:
+        # Not opened in text mode, so that line endings are left alone like in
+        # the command line tools
+        with open(path, "rb") as srt_file:
+            srt = srt_file.read().decode(encoding)
+        return list(parse(srt, ignore_errors=ignore_errors, milliseconds=milliseconds))
+    except (OSError, UnicodeDecodeError, SRTParseError) as thrown_exc:
+        return thrown_exc
+
+
+def _compose_shard(subtitles, start_index, strict, eol):
+    """
+    Format one shard of subtitles.
+
+    :param list subtitles: The subtitles to format
+    :param int start_index: The index to give the first subtitle, or None to
+                            keep the existing indexes
+    :param bool strict: See :py:func:`srt.compose`
+    :param str eol: See :py:func:`srt.compose`
+    :rtype: str
+    """
+    if start_index is not None:
+        # The executor may not be a process pool, so these could be the
+        # caller's own objects
+        subtitles = [
+            subtitle._replace(index=index)
+            for index, subtitle in enumerate(subtitles, start=start_index)
+        ]
+    return "".join(subtitle.to_srt(strict=strict, eol=eol) for subtitle in subtitles)
+
+
+def _useful_subtitles(subtitles):
+    """
+    Drop the subtitles which :py:func:`srt.sort_and_reindex` would skip.
+
+    :param list subtitles: The sorted subtitles
+    :rtype: list
+    """
+    useful = []
+    for subtitle in subtitles:
+        reason = _skip_reason(subtitle)
+        if reason is not None:
+            _report_skipped(subtitle.index, reason)
+            continue
+        useful.append(subtitle)
+    return useful
+
+
+def _executor_or_pool(executor, workers):
+    """
+    Use ``executor`` if given, without shutting it down afterwards, or start a
+    process pool with ``workers`` processes.
+    """
+    if executor is None:
+        return concurrent.futures.ProcessPoolExecutor(workers)
+    return _Borrowed(executor)
+
+
+class _Borrowed:
+    """
+    A context manager giving an executor that we don't own.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+
+    def __enter__(self):
+        return self.executor
+
+    def __exit__(self, *exc_info):
+        return False
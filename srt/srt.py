@@ -2,8 +2,17 @@
 
 """A simple library for parsing, modifying, and composing SRT files."""
 
+import array
+import codecs
+import collections
+import contextlib
 import functools
+import heapq
+import mmap
+import operator
 import re
+import sys
+import threading
 from datetime import timedelta
 import logging
 import io
@@ -27,7 +36,7 @@ RGX_POSSIBLE_CRLF = r"\r?\n"
 
 TS_REGEX = re.compile(RGX_TIMESTAMP_PARSEABLE)
 MULTI_WS_REGEX = re.compile(r"\n\n+")
-SRT_REGEX = re.compile(
+RGX_SRT_BLOCK = (
     r"\s*({idx})\s*{eof}({ts}) *-[ -] *> *({ts}) ?({proprietary})(?:{eof}|\Z)({content})"
     # Many sub editors don't add a blank line to the end, and many editors and
     # players accept that. We allow it to be missing in input.
@@ -45,7 +54,10 @@ SRT_REGEX = re.compile(
     # inside the subtitle content. We look ahead a little to check that the
     # next lines look like an index and a timestamp as a best-effort
     # solution to work around these.
-    r"(?=(?:{idx}\s*{eof}{ts}|\Z))".format(
+    r"(?=(?:{idx}\s*{eof}{ts}|\Z))"
+)
+SRT_REGEX = re.compile(
+    RGX_SRT_BLOCK.format(
         idx=RGX_INDEX,
         ts=RGX_TIMESTAMP,
         proprietary=RGX_PROPRIETARY,
@@ -55,20 +67,110 @@ SRT_REGEX = re.compile(
     re.DOTALL,
 )
 
-ZERO_TIMEDELTA = timedelta(0)
 
-# Info message if truthy return -> Function taking a Subtitle, skip if True
-SUBTITLE_SKIP_CONDITIONS = (
-    ("No content", lambda sub: not sub.content.strip()),
-    ("Start time < 0 seconds", lambda sub: sub.start < ZERO_TIMEDELTA),
-    ("Subtitle start time >= end time", lambda sub: sub.start >= sub.end),
+def _utf8_alternatives(ascii_class, chars):
+    """
+    Make a pattern for a bytes regex matching one of ``chars`` in UTF-8, or
+    one byte matching ``ascii_class``. The pattern is returned as a str, with
+    each byte as the character of the same value.
+    """
+    alternatives = [ascii_class]
+    alternatives.extend(
+        re.escape(char.encode("utf-8")).decode("latin-1") for char in chars
+    )
+    return "(?:{})".format("|".join(alternatives))
+
+
+# The characters other than ASCII which \s matches in str patterns
+UNICODE_WHITESPACE = (
+    "\x85\xa0\u1680"
+    + "".join(map(chr, range(0x2000, 0x200B)))
+    + "\u2028\u2029\u202f\u205f\u3000"
+)
+RGX_WHITESPACE_UTF8 = _utf8_alternatives(r"[\t-\r\x1c- ]", UNICODE_WHITESPACE)
+RGX_TIMESTAMP_UTF8 = _utf8_alternatives("[,.:]", "，．。：").join(
+    [RGX_TIMESTAMP_FIELD] * 4
+)
+# SRT_REGEX for bytes-like input encoded in UTF-8, matching exactly the same
+# blocks as SRT_REGEX does on the decoded text
+SRT_BYTES_REGEX = re.compile(
+    RGX_SRT_BLOCK.replace(r"\s", RGX_WHITESPACE_UTF8)
+    .format(
+        idx=RGX_INDEX,
+        ts=RGX_TIMESTAMP_UTF8,
+        proprietary=RGX_PROPRIETARY,
+        content=RGX_CONTENT,
+        eof=RGX_POSSIBLE_CRLF,
+    )
+    .encode("latin-1"),
+    re.DOTALL,
+)
+
+# The fast path tokenizer only handles blocks whose timestamp line starts with
+# this exact shape, once it has been encoded and every ASCII digit masked to
+# "0" using FAST_TS_LINE_MASK. Anything which isn't ASCII is replaced with "?"
+# when encoding, so non-ASCII digits don't match.
+FAST_TS_LINE_SHAPE = b"00:00:00,000 --> 00:00:00,000"
+FAST_TS_LINE_MASK = bytes.maketrans(b"0123456789", b"0000000000")
+FAST_TS_LEN = 12
+FAST_TS_LINE_LEN = len(FAST_TS_LINE_SHAPE)
+FAST_TS_END_START = FAST_TS_LINE_LEN - FAST_TS_LEN
+ASCII_DIGITS = "0123456789"
+# Timestamps of this shape, after masking with FAST_TS_MASK, are decoded by
+# slicing instead of with TS_REGEX. The mask folds "." into "," too.
+FAST_TS_SHAPE = FAST_TS_LINE_SHAPE[:FAST_TS_LEN]
+FAST_TS_MASK = bytes.maketrans(b"0123456789.", b"0000000000,")
+# Splits a run of timestamps of FAST_TS_SHAPE into their fields
+FAST_TS_FIELD_SEPARATORS = str.maketrans(":,.", "   ")
+# A line starting with one of these might be the index line of the next block
+INDEX_START_CHARS = frozenset("-" + ASCII_DIGITS)
+
+ZERO_TIMEDELTA = timedelta(0)
+# The reasons sort_and_reindex skips subtitles for, in the order they're
+# checked, each with a function telling whether a subtitle is skipped for it.
+# The rules themselves are in _skip_reason.
+SUBTITLE_SKIP_CONDITIONS = tuple(
+    (reason, lambda sub, reason=reason: _skip_reason(sub) == reason)
+    for reason in (
+        "No content",
+        "Start time < 0 seconds",
+        "Subtitle start time >= end time",
+    )
 )
 
 SECONDS_IN_HOUR = 3600
 SECONDS_IN_MINUTE = 60
 HOURS_IN_DAY = 24
+SECONDS_IN_DAY = SECONDS_IN_HOUR * HOURS_IN_DAY
 MICROSECONDS_IN_MILLISECOND = 1000
+MILLISECONDS_IN_SECOND = 1000
+MILLISECONDS_IN_MINUTE = MILLISECONDS_IN_SECOND * SECONDS_IN_MINUTE
+MILLISECONDS_IN_HOUR = MILLISECONDS_IN_SECOND * SECONDS_IN_HOUR
+MILLISECONDS_IN_DAY = MILLISECONDS_IN_HOUR * HOURS_IN_DAY
 FILE_TYPES = (io.IOBase,)
+BYTES_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+BINARY_FILE_TYPES = (io.RawIOBase, io.BufferedIOBase)
+# SRT_BYTES_REGEX can parse data in these encodings without decoding it first
+UTF8_ENCODINGS = ("utf-8", "utf-8-sig")
+# compose_to writes once it has at least this many characters of blocks
+COMPOSE_FLUSH_SIZE = 64 * 1024
+# The Diagnostics collecting reports in the current thread, if any, is its
+# "current" attribute. contextvars would follow asyncio tasks as well, but
+# needs Python 3.7.
+_ACTIVE_DIAGNOSTICS = threading.local()
+# Subtitles are sorted by this, which orders them the same as Subtitle.__lt__
+_SORT_KEY = operator.attrgetter("start", "end")
+# Roughly how many bytes a Subtitle with timedelta times takes up while being
+# sorted, not counting its strings
+SUBTITLE_SIZE_ESTIMATE = 256
+# How many subtitles to pickle together when sorting on disk
+SORT_RUN_CHUNK_SIZE = 1024
+# Timestamps in the first this many hours are formatted from precomputed
+# "HH:MM:SS," prefixes for each second, which are built the first time they're
+# needed. Later (or negative) ones are formatted field by field.
+TIMESTAMP_TABLE_HOURS = 4
+_SECOND_PREFIXES = []
+_MILLISECOND_SUFFIXES = []
 
 
 @functools.total_ordering
@@ -77,11 +179,16 @@ class Subtitle:
     The metadata relating to a single subtitle. Subtitles are sorted by start
     time by default.
 
+    Times are usually :py:class:`~datetime.timedelta` objects, but may also be
+    ints counting milliseconds (see the ``milliseconds`` argument to
+    :py:func:`parse`). Both work everywhere in this library, but the start and
+    end of a subtitle should use the same representation.
+
     :param int index: The SRT index for this subtitle
     :param start: The time that the subtitle should start being shown
-    :type start: :py:class:`datetime.timedelta`
+    :type start: :py:class:`datetime.timedelta` or int
     :param end: The time that the subtitle should stop being shown
-    :type end: :py:class:`datetime.timedelta`
+    :type end: :py:class:`datetime.timedelta` or int
     :param str proprietary: Proprietary metadata for this subtitle
     :param str content: The subtitle content. Should not contain OS-specific
                         line separators, only \\n. This is taken care of
@@ -89,6 +196,10 @@ class Subtitle:
                         Subtitle objects.
     """
 
+    # Saves the memory of a __dict__ per subtitle, which adds up when keeping
+    # many files' worth of subtitles around.
+    __slots__ = ("index", "start", "end", "content", "proprietary")
+
     # pylint: disable=R0913
     def __init__(self, index, start, end, content, proprietary=""):
         self.index = index
@@ -97,19 +208,74 @@ class Subtitle:
         self.content = content
         self.proprietary = proprietary
 
+    def _astuple(self):
+        return (self.index, self.start, self.end, self.content, self.proprietary)
+
     def __hash__(self):
-        return hash(frozenset(vars(self).items()))
+        return hash(self._astuple())
 
     def __eq__(self, other):
-        return vars(self) == vars(other)
+        if not isinstance(other, Subtitle):
+            return NotImplemented
+        return self._astuple() == other._astuple()
 
     def __lt__(self, other):
-        return self.start < other.start or (
-            self.start == other.start and self.end < other.end
-        )
+        return (self.start, self.end) < (other.start, other.end)
+
+    def __reduce__(self):
+        # Pickle as the constructor arguments, which is much smaller and faster
+        # than the default handling of __slots__.
+        return (type(self), self._astuple())
+
+    def copy(self):
+        """
+        Make a copy of this :py:class:`Subtitle`.
+
+        :rtype: :py:class:`Subtitle`
+        """
+        return type(self)(*self._astuple())
+
+    def _replace(self, **changes):
+        r"""
+        Make a copy of this :py:class:`Subtitle` with some attributes changed,
+        like ``_replace`` on a :py:func:`~collections.namedtuple`.
+
+        .. doctest::
+
+            >>> sub = Subtitle(1, timedelta(seconds=1), timedelta(seconds=2), 'a')
+            >>> sub._replace(index=2, content='b')  # doctest: +ELLIPSIS
+            Subtitle(index=2, ..., content='b', proprietary='')
+
+        :param changes: The attributes to change, and their new values
+        :rtype: :py:class:`Subtitle`
+        :raises AttributeError: If a change is not for one of this class's
+                                attributes
+        """
+        new = self.copy()
+        for name, value in changes.items():
+            setattr(new, name, value)
+        return new
+
+    @property
+    def start_timedelta(self):
+        """
+        The start time as a :py:class:`~datetime.timedelta`, even when it is
+        stored as milliseconds.
+        """
+        return _as_timedelta(self.start)
+
+    @property
+    def end_timedelta(self):
+        """
+        The end time as a :py:class:`~datetime.timedelta`, even when it is
+        stored as milliseconds.
+        """
+        return _as_timedelta(self.end)
 
     def __repr__(self):
-        item_list = ", ".join("%s=%r" % (k, v) for k, v in vars(self).items())
+        item_list = ", ".join(
+            "%s=%r" % (k, v) for k, v in zip(self.__slots__, self._astuple())
+        )
         return "%s(%s)" % (type(self).__name__, item_list)
 
     def to_srt(self, strict=True, eol="\n"):
@@ -124,33 +290,151 @@ class Subtitle:
                   SRT formatted subtitle block
         :rtype: str
         """
-        output_content = self.content
-        output_proprietary = self.proprietary
-
-        if output_proprietary:
-            # output_proprietary is output directly next to the timestamp, so
-            # we need to add the space as a field delimiter.
-            output_proprietary = " " + output_proprietary
-
-        if strict:
-            output_content = make_legal_content(output_content)
-
-        if eol is None:
-            eol = "\n"
-        elif eol != "\n":
-            output_content = output_content.replace("\n", eol)
-
-        template = "{idx}{eol}{start} --> {end}{prop}{eol}{content}{eol}{eol}"
-        return template.format(
-            idx=self.index,
-            start=timedelta_to_srt_timestamp(self.start),
-            end=timedelta_to_srt_timestamp(self.end),
-            prop=output_proprietary,
-            content=output_content,
-            eol=eol,
+        return _format_block(
+            self.index,
+            _format_timestamp(self.start),
+            _format_timestamp(self.end),
+            self.content,
+            self.proprietary,
+            strict,
+            eol,
         )
 
 
+class SubtitleView:
+    r"""
+    A subtitle from :py:func:`parse_lazy`, which only knows where its content
+    and proprietary metadata are in the parsed data until they are used.
+
+    The index, start and end are read when the view is created, like they are
+    for a :py:class:`Subtitle`. The content and proprietary metadata are sliced
+    out of the source, decoded and normalised the first time they're accessed.
+
+    A view keeps the whole source alive, so convert the views you want to keep
+    to :py:class:`Subtitle` objects with :py:meth:`to_subtitle`.
+
+    .. doctest::
+
+        >>> view = next(parse_lazy(b"1\r\n00:00:01,000 --> 00:00:02,000\r\na\r\nb"))
+        >>> view.start
+        datetime.timedelta(seconds=1)
+        >>> view.content
+        'a\nb'
+    """
+
+    # The spans of every view from the same parse are kept together in one
+    # _SpanTable, so each view only costs a few pointers on top of its times.
+    __slots__ = ("index", "start", "end", "_spans", "_row", "_proprietary", "_content")
+
+    # pylint: disable=R0913
+    def __init__(self, index, start, end, spans, row):
+        self.index = index
+        self.start = start
+        self.end = end
+        self._spans = spans
+        self._row = row
+        self._proprietary = None
+        self._content = None
+
+    @property
+    def proprietary(self):
+        """
+        The proprietary metadata, read from the source on first access.
+        """
+        if self._proprietary is None:
+            self._proprietary = self._spans.text(self._row * 4)
+        return self._proprietary
+
+    @property
+    def content(self):
+        """
+        The content, read from the source on first access.
+        """
+        if self._content is None:
+            content = self._spans.text(self._row * 4 + 2)
+            self._content = content.replace("\r\n", "\n")
+        return self._content
+
+    def to_subtitle(self):
+        """
+        Convert this view to a :py:class:`Subtitle`, which doesn't refer to
+        the source any more.
+
+        :rtype: :py:class:`Subtitle`
+        """
+        return Subtitle(
+            self.index, self.start, self.end, self.content, self.proprietary
+        )
+
+    def __repr__(self):
+        return "%s(index=%r, start=%r, end=%r)" % (
+            type(self).__name__,
+            self.index,
+            self.start,
+            self.end,
+        )
+
+
+class _SpanTable:
+    """
+    The source of some :py:class:`SubtitleView` objects, and where their
+    proprietary metadata and content are in it. Each view has four entries in
+    ``offsets``: the start and end of its proprietary metadata, and then of its
+    content.
+    """
+
+    __slots__ = ("source", "offsets")
+
+    def __init__(self, source):
+        self.source = source
+        self.offsets = array.array("q")
+
+    def text(self, entry):
+        """
+        Get the text between the offsets at ``entry`` and ``entry + 1``.
+
+        :rtype: str
+        """
+        return _decode_slice(self.source, self.offsets[entry], self.offsets[entry + 1])
+
+
+def _format_block(index, start, end, content, proprietary, strict, eol):
+    """
+    Build an SRT block from its fields. See :py:meth:`Subtitle.to_srt`.
+
+    :param int index: The SRT index
+    :param str start: The start time, already formatted as an SRT timestamp
+    :param str end: The end time, already formatted as an SRT timestamp
+    :param str content: The subtitle content
+    :param str proprietary: Proprietary metadata
+    :param bool strict: Whether to make the content legal first
+    :param str eol: The end of line string to use, or None for "\\n"
+    :rtype: str
+    """
+    if proprietary:
+        # proprietary is output directly next to the timestamp, so we need to
+        # add the space as a field delimiter.
+        proprietary = " " + proprietary
+
+    if strict:
+        content = make_legal_content(content)
+
+    if eol is None:
+        eol = "\n"
+    elif eol != "\n":
+        content = content.replace("\n", eol)
+
+    template = "{idx}{eol}{start} --> {end}{prop}{eol}{content}{eol}{eol}"
+    return template.format(
+        idx=index,
+        start=start,
+        end=end,
+        prop=proprietary,
+        content=content,
+        eol=eol,
+    )
+
+
 def make_legal_content(content):
     r"""
     Remove illegal content from a content block. Illegal content includes:
@@ -174,7 +458,14 @@ def make_legal_content(content):
         return content
 
     legal_content = MULTI_WS_REGEX.sub("\n", content.strip("\n"))
-    LOG.info("Legalised content %r to %r", content, legal_content)
+    _report(
+        logging.INFO,
+        "legalised",
+        (content, legal_content),
+        "Legalised content %r to %r",
+        content,
+        legal_content,
+    )
     return legal_content
 
 
@@ -195,13 +486,172 @@ def timedelta_to_srt_timestamp(timedelta_timestamp):
     :rtype: str
     """
 
+    secs = timedelta_timestamp.days * SECONDS_IN_DAY + timedelta_timestamp.seconds
+    msecs = timedelta_timestamp.microseconds // MICROSECONDS_IN_MILLISECOND
+    prefixes = _SECOND_PREFIXES or _build_timestamp_tables()
+    if 0 <= secs < len(prefixes):
+        return prefixes[secs] + _MILLISECOND_SUFFIXES[msecs]
+
     hrs, secs_remainder = divmod(timedelta_timestamp.seconds, SECONDS_IN_HOUR)
     hrs += timedelta_timestamp.days * HOURS_IN_DAY
     mins, secs = divmod(secs_remainder, SECONDS_IN_MINUTE)
-    msecs = timedelta_timestamp.microseconds // MICROSECONDS_IN_MILLISECOND
     return "%02d:%02d:%02d,%03d" % (hrs, mins, secs, msecs)
 
 
+def milliseconds_to_srt_timestamp(msecs):
+    r"""
+    Convert a number of milliseconds to an SRT timestamp.
+
+    .. doctest::
+
+        >>> milliseconds_to_srt_timestamp(4984567)
+        '01:23:04,567'
+
+    :param int msecs: The number of milliseconds to convert
+    :returns: The timestamp in SRT format
+    :rtype: str
+    """
+
+    secs, msecs = divmod(msecs, MILLISECONDS_IN_SECOND)
+    prefixes = _SECOND_PREFIXES or _build_timestamp_tables()
+    if 0 <= secs < len(prefixes):
+        return prefixes[secs] + _MILLISECOND_SUFFIXES[msecs]
+    return _format_fields(secs, msecs)
+
+
+def milliseconds_to_srt_timestamps(msecs_list):
+    r"""
+    Convert many numbers of milliseconds to SRT timestamps at once. This gives
+    the same results as calling :py:func:`milliseconds_to_srt_timestamp` on
+    each of them, but is faster for long columns of times, like those in a
+    :py:class:`~srt.SubtitleTable`.
+
+    .. doctest::
+
+        >>> milliseconds_to_srt_timestamps([1000, 4984567])
+        ['00:00:01,000', '01:23:04,567']
+
+    :param msecs_list: The numbers of milliseconds to convert
+    :type msecs_list: iterable of int
+    :returns: The timestamps in SRT format, in the same order
+    :rtype: list of str
+    """
+    prefixes = _SECOND_PREFIXES or _build_timestamp_tables()
+    suffixes = _MILLISECOND_SUFFIXES
+    table_len = len(prefixes)
+    timestamps = []
+    append = timestamps.append
+
+    for msecs in msecs_list:
+        secs, msecs = divmod(msecs, MILLISECONDS_IN_SECOND)
+        if 0 <= secs < table_len:
+            append(prefixes[secs] + suffixes[msecs])
+        else:
+            append(_format_fields(secs, msecs))
+
+    return timestamps
+
+
+def _format_fields(secs, msecs):
+    """
+    Format an SRT timestamp field by field, for times outside the prefix
+    table.
+
+    :param int secs: The whole seconds of the time
+    :param int msecs: The remaining milliseconds, from 0 to 999
+    :rtype: str
+    """
+    mins, secs = divmod(secs, SECONDS_IN_MINUTE)
+    hrs, mins = divmod(mins, SECONDS_IN_MINUTE)
+    return "%02d:%02d:%02d,%03d" % (hrs, mins, secs, msecs)
+
+
+def _build_timestamp_tables():
+    """
+    Build the "HH:MM:SS," prefix for each second in the first
+    :py:data:`TIMESTAMP_TABLE_HOURS` hours, and the "mmm" suffix for each
+    millisecond.
+
+    The tables are only replaced, never changed, so another thread building
+    them at the same time does no harm.
+
+    :returns: The prefixes
+    :rtype: list of str
+    """
+    global _SECOND_PREFIXES, _MILLISECOND_SUFFIXES  # pylint: disable=W0603
+
+    # The suffixes have to be there before anything can see the prefixes
+    _MILLISECOND_SUFFIXES = ["%03d" % msecs for msecs in range(MILLISECONDS_IN_SECOND)]
+    _SECOND_PREFIXES = [
+        "%02d:%02d:%02d," % (hrs, mins, secs)
+        for hrs in range(TIMESTAMP_TABLE_HOURS)
+        for mins in range(SECONDS_IN_MINUTE)
+        for secs in range(SECONDS_IN_MINUTE)
+    ]
+    return _SECOND_PREFIXES
+
+
+def timedelta_to_milliseconds(timedelta_timestamp):
+    r"""
+    Convert a :py:class:`~datetime.timedelta` to a number of milliseconds,
+    discarding any microseconds like :py:func:`timedelta_to_srt_timestamp`.
+
+    .. doctest::
+
+        >>> import datetime
+        >>> timedelta_to_milliseconds(datetime.timedelta(seconds=1.5))
+        1500
+
+    :param datetime.timedelta timedelta_timestamp: The timedelta to convert
+    :returns: The number of milliseconds
+    :rtype: int
+    """
+
+    return (
+        timedelta_timestamp.days * MILLISECONDS_IN_DAY
+        + timedelta_timestamp.seconds * MILLISECONDS_IN_SECOND
+        + timedelta_timestamp.microseconds // MICROSECONDS_IN_MILLISECOND
+    )
+
+
+def _format_timestamp(timestamp):
+    """
+    Convert a subtitle time in either representation to an SRT timestamp.
+
+    :param timestamp: The time to convert
+    :type timestamp: :py:class:`datetime.timedelta` or int
+    :rtype: str
+    """
+    if isinstance(timestamp, timedelta):
+        return timedelta_to_srt_timestamp(timestamp)
+    return milliseconds_to_srt_timestamp(timestamp)
+
+
+def _as_timedelta(timestamp):
+    """
+    Convert a subtitle time in either representation to a timedelta.
+
+    :param timestamp: The time to convert
+    :type timestamp: :py:class:`datetime.timedelta` or int
+    :rtype: datetime.timedelta
+    """
+    if isinstance(timestamp, timedelta):
+        return timestamp
+    return timedelta(milliseconds=timestamp)
+
+
+def _is_negative(timestamp):
+    """
+    Check whether a subtitle time in either representation is before zero.
+
+    :param timestamp: The time to check
+    :type timestamp: :py:class:`datetime.timedelta` or int
+    :rtype: bool
+    """
+    # timedelta() and int() are both zero
+    return timestamp < type(timestamp)()
+
+
 def srt_timestamp_to_timedelta(timestamp):
     r"""
     Convert an SRT timestamp to a :py:class:`~datetime.timedelta`.
@@ -216,15 +666,88 @@ def srt_timestamp_to_timedelta(timestamp):
     :rtype: datetime.timedelta
     :raises TimestampParseError: If the timestamp is not parseable
     """
+    return timedelta(milliseconds=srt_timestamp_to_milliseconds(timestamp))
+
+
+def srt_timestamp_to_milliseconds(timestamp):
+    r"""
+    Convert an SRT timestamp to a number of milliseconds.
+
+    .. doctest::
+
+        >>> srt_timestamp_to_milliseconds('01:23:04,567')
+        4984567
+
+    :param str timestamp: A timestamp in SRT format
+    :returns: The timestamp in milliseconds
+    :rtype: int
+    :raises TimestampParseError: If the timestamp is not parseable
+    """
+    # Optimisation: Almost every timestamp is HH:MM:SS,mmm. Those can be
+    # sliced up directly, which is much faster than going through TS_REGEX.
+    shape = timestamp.encode("ascii", "replace").translate(FAST_TS_MASK)
+    if shape == FAST_TS_SHAPE:
+        return (
+            int(timestamp[:2]) * MILLISECONDS_IN_HOUR
+            + int(timestamp[3:5]) * MILLISECONDS_IN_MINUTE
+            + int(timestamp[6:8]) * MILLISECONDS_IN_SECOND
+            + int(timestamp[9:])
+        )
 
     match = TS_REGEX.match(timestamp)
     if match is None:
         raise TimestampParseError("Unparseable timestamp: {}".format(timestamp))
     hrs, mins, secs, msecs = map(int, match.groups())
-    return timedelta(hours=hrs, minutes=mins, seconds=secs, milliseconds=msecs)
+    return (
+        hrs * MILLISECONDS_IN_HOUR
+        + mins * MILLISECONDS_IN_MINUTE
+        + secs * MILLISECONDS_IN_SECOND
+        + msecs
+    )
+
+
+def srt_timestamps_to_milliseconds(timestamps):
+    r"""
+    Convert many SRT timestamps to numbers of milliseconds at once. This gives
+    the same results as calling :py:func:`srt_timestamp_to_milliseconds` on
+    each of them, but is faster when they're all HH:MM:SS,mmm.
+
+    .. doctest::
 
+        >>> srt_timestamps_to_milliseconds(['00:00:01,000', '1:2:3.4'])
+        [1000, 3723004]
 
-def sort_and_reindex(subtitles, start_index=1, in_place=False, skip=True):
+    :param timestamps: The timestamps in SRT format
+    :type timestamps: iterable of str
+    :returns: The timestamps in milliseconds, in the same order
+    :rtype: list of int
+    :raises TimestampParseError: If any timestamp is not parseable
+    """
+    timestamps = list(timestamps)
+    joined = " ".join(timestamps)
+    shapes = joined.encode("ascii", "replace").translate(FAST_TS_MASK)
+    if shapes != b" ".join([FAST_TS_SHAPE] * len(timestamps)):
+        return [srt_timestamp_to_milliseconds(ts) for ts in timestamps]
+
+    fields = iter(map(int, joined.translate(FAST_TS_FIELD_SEPARATORS).split()))
+    return [
+        hrs * MILLISECONDS_IN_HOUR
+        + mins * MILLISECONDS_IN_MINUTE
+        + secs * MILLISECONDS_IN_SECOND
+        + msecs
+        for hrs, mins, secs, msecs in zip(fields, fields, fields, fields)
+    ]
+
+
+def sort_and_reindex(
+    subtitles,
+    start_index=1,
+    in_place=False,
+    skip=True,
+    window=None,
+    max_memory=None,
+    temp_dir=None,
+):
     """
     Reorder subtitles to be sorted by start time order, and rewrite the indexes
     to be in that same order. This ensures that the SRT file will play in an
@@ -239,6 +762,19 @@ def sort_and_reindex(subtitles, start_index=1, in_place=False, skip=True):
     - The start time is negative
     - The start time is equal to or later than the end time
 
+    Subtitles are sorted by their start and end times, without comparing
+    :py:class:`Subtitle` objects themselves, and subtitles which are already
+    in order are only checked once. Either way, all of the subtitles have to
+    be read before the first one is yielded. If they are known to be at most
+    ``window`` places away from where they belong, pass ``window`` to sort
+    them as they are read instead, holding only that many at once.
+
+    To sort more subtitles than fit in memory, pass ``max_memory``. Whenever
+    the subtitles read so far take up roughly that many bytes, they are sorted
+    and written to a temporary file, and the files are merged at the end. The
+    subtitles which were written out are new objects when they are read back,
+    so ``in_place`` only applies to the ones which never were.
+
     .. doctest::
 
         >>> from datetime import timedelta
@@ -260,41 +796,191 @@ def sort_and_reindex(subtitles, start_index=1, in_place=False, skip=True):
                           <https://en.wikipedia.org/wiki/in-place_algorithm>`_
     :param bool skip: Whether to skip subtitles considered not useful (see
                       above for rules)
+    :param int window: If given, how many places away from its sorted
+                       position any subtitle may be
+    :param int max_memory: If given, roughly how many bytes of subtitles to
+                           hold in memory before sorting them on disk
+    :param str temp_dir: The directory to create temporary files in when
+                         sorting on disk (default: the system's temporary
+                         directory)
     :returns: The sorted subtitles
     :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    :raises ValueError: If a subtitle is further out of place than ``window``
+                        allows, or if both ``window`` and ``max_memory`` are
+                        given
     """
-    skipped_subs = 0
-    for sub_num, subtitle in enumerate(sorted(subtitles), start=start_index):
-        if not in_place:
-            subtitle = Subtitle(**vars(subtitle))
-
+    if window is not None and max_memory is not None:
+        raise ValueError("Only one of window and max_memory can be given")
+
+    if window is not None:
+        subtitles = _sort_within_window(subtitles, window)
+    elif max_memory is not None:
+        subtitles = _sort_external(subtitles, max_memory, temp_dir)
+    else:
+        subtitles = sorted(subtitles, key=_SORT_KEY)
+
+    index = start_index
+    for subtitle in subtitles:
         if skip:
-            try:
-                _should_skip_sub(subtitle)
-            except _ShouldSkipException as thrown_exc:
-                LOG.info("Skipped subtitle at index %d: %s", subtitle.index, thrown_exc)
-                skipped_subs += 1
+            reason = _skip_reason(subtitle)
+            if reason is not None:
+                _report_skipped(subtitle.index, reason)
                 continue
 
-        subtitle.index = sub_num - skipped_subs
-
+        if not in_place:
+            subtitle = subtitle.copy()
+        subtitle.index = index
+        index += 1
         yield subtitle
 
 
-def _should_skip_sub(subtitle):
+def _skip_reason(subtitle):
+    """
+    Check whether a subtitle should be skipped by
+    :py:func:`sort_and_reindex`.
+
+    :param subtitle: The :py:class:`Subtitle` to check
+    :returns: Why the subtitle should be skipped, or None if it shouldn't be
+    :rtype: str or None
+    """
+    if not subtitle.content.strip():
+        return "No content"
+    if _is_negative(subtitle.start):
+        return "Start time < 0 seconds"
+    if subtitle.start >= subtitle.end:
+        return "Subtitle start time >= end time"
+    return None
+
+
+def _sort_external(subtitles, max_memory, temp_dir):
+    """
+    Sort subtitles in runs of about ``max_memory`` bytes, writing each run but
+    the last to a temporary file, and then merge the runs. Subtitles with the
+    same times stay in the order they came in, like with :py:func:`sorted`.
+
+    :param subtitles: The subtitles to sort
+    :type subtitles: iterable of :py:class:`Subtitle` objects
+    :param int max_memory: Roughly how many bytes of subtitles to hold at once
+    :param str temp_dir: The directory to create the temporary files in
+    :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    """
+    # Sorting on disk is rare, so don't slow down importing srt for it
+    import tempfile  # pylint: disable=import-outside-toplevel
+
+    with contextlib.ExitStack() as stack:
+        runs = []
+        run = []
+        run_size = 0
+
+        for subtitle in subtitles:
+            run.append(subtitle)
+            run_size += _approximate_size(subtitle)
+            if run_size >= max_memory:
+                run_file = stack.enter_context(tempfile.TemporaryFile(dir=temp_dir))
+                _write_run(sorted(run, key=_SORT_KEY), run_file)
+                runs.append(_read_run(run_file))
+                run = []
+                run_size = 0
+
+        runs.append(sorted(run, key=_SORT_KEY))
+        # Ties come from earlier runs first, which came earlier in the input
+        yield from heapq.merge(*runs, key=_SORT_KEY)
+
+
+def _approximate_size(subtitle):
     """
-    Check if a subtitle should be skipped based on the rules in
-    SUBTITLE_SKIP_CONDITIONS.
+    Estimate how many bytes of memory a subtitle takes up.
 
-    :param subtitle: A :py:class:`Subtitle` to check whether to skip
-    :raises _ShouldSkipException: If the subtitle should be skipped
+    :param subtitle: The :py:class:`Subtitle` to measure
+    :rtype: int
     """
-    for info_msg, sub_skipper in SUBTITLE_SKIP_CONDITIONS:
-        if sub_skipper(subtitle):
-            raise _ShouldSkipException(info_msg)
+    return (
+        SUBTITLE_SIZE_ESTIMATE
+        + sys.getsizeof(subtitle.content)
+        + sys.getsizeof(subtitle.proprietary)
+    )
 
 
-def parse(srt, ignore_errors=False):
+def _write_run(subtitles, run_file):
+    """
+    Write a sorted run of subtitles to a file, pickled in chunks so that it can
+    be read back a chunk at a time.
+
+    :param list subtitles: The subtitles to write
+    :param run_file: The file to write to, in binary mode
+    """
+    # Only used for the temporary files which sort_and_reindex writes and
+    # reads back itself, never for data from anywhere else
+    # pylint: disable-next=import-outside-toplevel
+    import pickle  # nosec
+
+    for start in range(0, len(subtitles), SORT_RUN_CHUNK_SIZE):
+        chunk = subtitles[start : start + SORT_RUN_CHUNK_SIZE]
+        pickle.dump(chunk, run_file, pickle.HIGHEST_PROTOCOL)
+    run_file.seek(0)
+
+
+def _read_run(run_file):
+    """
+    Read back a run written by :py:func:`_write_run`, a chunk at a time.
+
+    :param run_file: The file to read from, in binary mode
+    :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import pickle  # nosec
+
+    while True:
+        try:
+            # The run was written by _write_run in this process
+            chunk = pickle.load(run_file)  # nosec
+        except EOFError:
+            return
+        yield from chunk
+
+
+def _sort_within_window(subtitles, window):
+    """
+    Sort subtitles which are each at most ``window`` places away from their
+    sorted position, holding no more than ``window + 1`` of them at once.
+    Subtitles with the same times stay in the order they came in, like with
+    :py:func:`sorted`.
+
+    :param subtitles: The nearly sorted subtitles
+    :type subtitles: iterable of :py:class:`Subtitle` objects
+    :param int window: How far out of place any subtitle may be
+    :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    :raises ValueError: If a subtitle sorts before one already yielded
+    """
+    heap = []
+    last_key = None
+
+    for arrival, subtitle in enumerate(subtitles):
+        key = _SORT_KEY(subtitle)
+        if last_key is not None and key < last_key:
+            raise ValueError(
+                "Subtitle at index {} is more than {} places out of order".format(
+                    subtitle.index, window
+                )
+            )
+        # The arrival number breaks ties, so subtitles are never compared
+        heapq.heappush(heap, (key, arrival, subtitle))
+        if len(heap) > window:
+            last_key, _, subtitle = heapq.heappop(heap)
+            yield subtitle
+
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def parse(
+    srt,
+    ignore_errors=False,
+    chunk_size=None,
+    milliseconds=False,
+    encoding="utf-8-sig",
+    diagnostics=None,
+):
     r'''
     Convert an SRT formatted string to a :term:`generator` of Subtitle objects.
 
@@ -317,12 +1003,33 @@ def parse(srt, ignore_errors=False):
         >>> list(subs)  # doctest: +ELLIPSIS
         [Subtitle(...index=422...), Subtitle(...index=423...)]
 
+    If ``srt`` is a bytes-like object, like :py:class:`bytes`,
+    :py:class:`memoryview` or :py:class:`mmap.mmap`, or a file opened in
+    binary mode, it is decoded using ``encoding``. UTF-8 data is parsed
+    without decoding it first, and only the content and proprietary metadata
+    of each subtitle are decoded. In that case, the character offsets in any
+    :py:class:`SRTParseError` count bytes instead.
+
     :param srt: Subtitles in SRT format
-    :type srt: str or a file-like object
+    :type srt: str, a bytes-like object, or a file-like object
     :param ignore_errors: If True, garbled SRT data will be ignored, and we'll
                           continue trying to parse the rest of the file,
                           instead of raising :py:class:`SRTParseError` and
                           stopping execution.
+    :param int chunk_size: If set and ``srt`` is a file-like object, read it in
+                           chunks of this many characters and yield each
+                           subtitle as soon as its block is complete, instead
+                           of reading the whole file into memory first
+    :param bool milliseconds: If True, the start and end of each subtitle are
+                              ints counting milliseconds, instead of
+                              :py:class:`~datetime.timedelta` objects. This is
+                              faster if you are going to work with the times
+                              as numbers anyway.
+    :param str encoding: The encoding of ``srt``, if it is bytes. The default
+                         is UTF-8, skipping any byte order mark.
+    :param diagnostics: A :py:class:`Diagnostics` to collect the unparseable
+                        data skipped with ``ignore_errors`` into, instead of
+                        logging it
     :returns: The subtitles contained in the SRT file as :py:class:`Subtitle`
               objects
     :rtype: :term:`generator` of :py:class:`Subtitle` objects
@@ -330,63 +1037,459 @@ def parse(srt, ignore_errors=False):
                            ``ignore_errors`` is False.
     '''
 
-    expected_start = 0
+    if diagnostics is not None:
+        subtitles = parse(srt, ignore_errors, chunk_size, milliseconds, encoding)
+        yield from diagnostics.wrap(subtitles)
+        return
+
+    if milliseconds:
+        to_time = srt_timestamp_to_milliseconds
+    else:
+        to_time = srt_timestamp_to_timedelta
 
-    # Transparently read files -- the whole thing is needed for regex's
-    # finditer
     if isinstance(srt, FILE_TYPES):
+        if chunk_size:
+            if isinstance(srt, BINARY_FILE_TYPES):
+                srt = codecs.getreader(encoding)(srt)
+            yield from _parse_chunked(srt, ignore_errors, chunk_size, to_time)
+            return
+
+        # Transparently read files -- the whole thing is needed for regex's
+        # finditer
         srt = srt.read()
 
-    for match in SRT_REGEX.finditer(srt):
-        actual_start = match.start()
-        _check_contiguity(srt, expected_start, actual_start, ignore_errors)
-        raw_index, raw_start, raw_end, proprietary, content = match.groups()
+    if isinstance(srt, BYTES_TYPES):
+        yield from _parse_bytes(srt, ignore_errors, to_time, encoding)
+        return
 
-        # pytype sees that this is Optional[str] and thus complains that they
-        # can be None, but they can't realistically be None, since we're using
-        # finditer and all match groups are mandatory in the regex.
-        content = content.replace("\r\n", "\n")  # pytype: disable=attribute-error
+    yield from _parse_string(srt, ignore_errors, to_time)
 
-        try:
-            raw_index = int(raw_index)
-        except ValueError:
-            # Index 123.4. Handled separately, since it's a rare case and we
-            # don't want to affect general performance.
-            #
-            # The pytype disable is for the same reason as content, above.
-            raw_index = int(raw_index.split(".")[0])  # pytype: disable=attribute-error
 
+def _parse_string(srt, ignore_errors, to_time, offset=0):
+    """
+    Parse a complete SRT formatted string.
+
+    :param str srt: The data to parse
+    :param bool ignore_errors: See :py:func:`parse`
+    :param to_time: The function to convert SRT timestamps with
+    :param int offset: The position of ``srt`` in the original input, used to
+                       report errors relative to the start of the input
+    :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    """
+    for block in _parse_blocks(srt, ignore_errors, offset):
+        yield _block_to_subtitle(block, to_time)
+
+
+def _parse_bytes(srt, ignore_errors, to_time, encoding):
+    """
+    Parse a complete bytes-like object of SRT data.
+
+    :param srt: The data to parse
+    :param bool ignore_errors: See :py:func:`parse`
+    :param to_time: The function to convert SRT timestamps with
+    :param str encoding: The encoding of ``srt``
+    :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    """
+    codec_name = codecs.lookup(encoding).name
+    if codec_name not in UTF8_ENCODINGS:
+        yield from _parse_string(str(srt, encoding), ignore_errors, to_time)
+        return
+
+    # Positions are reported relative to the end of any BOM, like they would
+    # be after decoding with utf-8-sig
+    bom_len = 0
+    if codec_name == "utf-8-sig" and srt[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+        bom_len = len(codecs.BOM_UTF8)
+    expected_start = bom_len
+
+    for block in _tokenize_spans(srt, bom_len):
+        start, end, index, raw_start, raw_end, proprietary_span, content_span = block
+        _check_contiguity(srt, expected_start, start, ignore_errors, -bom_len)
         yield Subtitle(
-            index=raw_index,
-            start=srt_timestamp_to_timedelta(raw_start),
-            end=srt_timestamp_to_timedelta(raw_end),
-            content=content,
-            proprietary=proprietary,
+            index,
+            to_time(raw_start),
+            to_time(raw_end),
+            _decode_slice(srt, *content_span).replace("\r\n", "\n"),
+            _decode_slice(srt, *proprietary_span),
         )
+        expected_start = end
+
+    _check_contiguity(srt, expected_start, len(srt), ignore_errors, -bom_len)
+
+
+def _parse_blocks(srt, ignore_errors, offset=0):
+    """
+    Like :py:func:`_parse_string`, but yield the blocks from
+    :py:func:`_tokenize` instead of building subtitles from them.
+
+    :param str srt: The data to parse
+    :param bool ignore_errors: See :py:func:`parse`
+    :param int offset: See :py:func:`_parse_string`
+    :rtype: :term:`generator` of tuples
+    """
+    expected_start = 0
+
+    for block in _tokenize(srt):
+        _check_contiguity(srt, expected_start, block[0], ignore_errors, offset)
+        yield block
+        expected_start = block[1]
+
+    _check_contiguity(srt, expected_start, len(srt), ignore_errors, offset)
+
 
-        expected_start = match.end()
+def _parse_chunked(stream, ignore_errors, chunk_size, to_time):
+    """
+    Parse an SRT formatted file-like object without reading it all at once.
+
+    Blocks are only accepted once another block has been found after them in
+    the buffer. That block's timestamp arrow can't be consumed by any of the
+    lookaheads which decide where the earlier block ends, so data read later
+    can't change the earlier result. The last block and anything after it are
+    carried over to be parsed again with more data.
+
+    Carried over data is only parsed again once at least as much again has
+    been read after it, so a long run of data without two blocks in it, like
+    unparseable data or a very large block, is parsed a number of times
+    logarithmic in its size instead of once per chunk. This keeps the total
+    work linear in the size of the input.
+
+    :param stream: The file-like object to read from
+    :param bool ignore_errors: See :py:func:`parse`
+    :param int chunk_size: The amount of characters to read at once
+    :param to_time: The function to convert SRT timestamps with
+    :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    """
+    chunks = []
+    buffered = 0
+    next_parse = 0
+    offset = 0
+
+    for chunk in iter(lambda: stream.read(chunk_size), ""):
+        chunks.append(chunk)
+        buffered += len(chunk)
+        if buffered < next_parse:
+            continue
+
+        buffer = "".join(chunks)
+        expected_start = 0
+        held_block = None
+
+        for block in _tokenize(buffer):
+            if held_block is not None:
+                _check_contiguity(
+                    buffer, expected_start, held_block[0], ignore_errors, offset
+                )
+                yield _block_to_subtitle(held_block, to_time)
+                expected_start = held_block[1]
+            held_block = block
+
+        chunks = [buffer[expected_start:]]
+        buffered = len(chunks[0])
+        next_parse = 2 * buffered
+        offset += expected_start
+
+    yield from _parse_string("".join(chunks), ignore_errors, to_time, offset)
+
+
+def parse_lazy(srt, ignore_errors=False, milliseconds=False):
+    r"""
+    Like :py:func:`parse`, but give :py:class:`SubtitleView` objects, which
+    don't read their content or proprietary metadata until it's used. This
+    saves memory and time when only the times, or only a few of the
+    subtitles, are needed.
+
+    Along with a str, this accepts UTF-8 encoded bytes-like objects, like
+    :py:class:`bytes`, :py:class:`memoryview` or :py:class:`mmap.mmap`, which
+    are parsed without being decoded first. The subtitles are the same as from
+    parsing the decoded text, but the character offsets in any
+    :py:class:`SRTParseError` count bytes instead.
+
+    :param srt: Subtitles in SRT format
+    :type srt: str, a bytes-like object, or a file-like object
+    :param bool ignore_errors: See :py:func:`parse`
+    :param bool milliseconds: See :py:func:`parse`
+    :rtype: :term:`generator` of :py:class:`SubtitleView` objects
+    :raises SRTParseError: See :py:func:`parse`
+    """
+    if milliseconds:
+        to_time = srt_timestamp_to_milliseconds
+    else:
+        to_time = srt_timestamp_to_timedelta
+
+    if isinstance(srt, FILE_TYPES):
+        srt = srt.read()
+
+    spans = _SpanTable(srt)
+    expected_start = 0
+
+    for row, block in enumerate(_tokenize_spans(srt)):
+        start, end, index, raw_start, raw_end, proprietary_span, content_span = block
+        _check_contiguity(srt, expected_start, start, ignore_errors)
+        spans.offsets.extend(proprietary_span + content_span)
+        yield SubtitleView(index, to_time(raw_start), to_time(raw_end), spans, row)
+        expected_start = end
 
     _check_contiguity(srt, expected_start, len(srt), ignore_errors)
 
 
-def _check_contiguity(srt, expected_start, actual_start, warn_only):
+def _tokenize(srt):
+    """
+    Split an SRT formatted string into blocks.
+
+    The string is split at every blank line, and each piece which is a
+    well-formed block is handled without :py:data:`SRT_REGEX`. A piece is only
+    accepted once the piece after it is known to be a well-formed block too,
+    since that is what decides where :py:data:`SRT_REGEX` ends the content.
+    Anything else is matched with :py:data:`SRT_REGEX`, starting from the same
+    position, so the result is always the same as running
+    ``SRT_REGEX.finditer`` over the whole string.
+
+    :param str srt: The data to split
+    :returns: ``(start, end, index, raw_start, raw_end, proprietary, content)``
+              for each block, with the content's line endings normalised
+    :rtype: :term:`generator` of tuples
+    """
+    length = len(srt)
+    first_eol = srt.find("\n")
+    crlf = first_eol > 0 and srt[first_eol - 1] == "\r"
+    separator = "\r\n\r\n" if crlf else "\n\n"
+    separator_len = len(separator)
+    pieces = srt.split(separator)
+    fields = [_fast_fields(piece, crlf) for piece in pieces]
+    fields[-1] = _fast_fields(pieces[-1], crlf, final=True)
+
+    pos = 0
+    piece_end = 0
+
+    for piece_num, piece in enumerate(pieces):
+        piece_start = piece_end
+        piece_end += len(piece) + separator_len
+
+        if piece_start < pos:
+            # Already consumed by SRT_REGEX
+            continue
+
+        while pos < piece_start:
+            # SRT_REGEX ended in the middle of the previous piece, keep using
+            # it until we're back at the start of a piece.
+            match = SRT_REGEX.search(srt, pos)
+            if match is None:
+                return
+            yield _match_to_block(match)
+            pos = match.end()
+
+        if pos != piece_start:
+            continue
+
+        # The last piece has no separator after it, and only the last piece
+        # can be followed by the end of the input.
+        piece_fields = fields[piece_num]
+        if piece_fields is not None and (
+            piece_end >= length or fields[piece_num + 1] is not None
+        ):
+            pos = min(piece_end, length)
+            yield (piece_start, pos) + piece_fields
+            continue
+
+        match = SRT_REGEX.search(srt, pos)
+        if match is None:
+            return
+        yield _match_to_block(match)
+        pos = match.end()
+
+    # SRT_REGEX may have stopped before the end of the last piece
+    for match in SRT_REGEX.finditer(srt, pos):
+        yield _match_to_block(match)
+
+
+def _fast_fields(piece, crlf, final=False):
+    """
+    Read a piece of :py:func:`_tokenize`'s input which is a well-formed block.
+
+    :param str piece: The text of the block, without the blank line after it
+    :param bool crlf: Whether lines end with \\r\\n instead of \\n
+    :param bool final: Whether this piece is at the end of the input
+    :returns: ``(index, raw_start, raw_end, proprietary, content)`` or None if
+              the piece doesn't fit the fast path's grammar
+    """
+    if crlf:
+        normalised = piece.replace("\r\n", "\n")
+        # Every line ending must have been \r\n, with no stray \r left
+        stripped = len(piece) - len(normalised)
+        if "\r" in normalised or normalised.count("\n") != stripped:
+            return None
+        piece = normalised
+    elif "\r" in piece:
+        return None
+
+    lines = piece.split("\n", 2)
+    if len(lines) == 1:
+        return None
+
+    raw_index, line = lines[0], lines[1]
+    line_shape = line[:FAST_TS_LINE_LEN].encode("ascii", "replace")
+    if (
+        not raw_index
+        or raw_index.strip(ASCII_DIGITS)
+        or line_shape.translate(FAST_TS_LINE_MASK) != FAST_TS_LINE_SHAPE
+        or line[FAST_TS_LINE_LEN : FAST_TS_LINE_LEN + 1] not in ("", " ")
+    ):
+        return None
+
+    content = lines[2] if len(lines) == 3 else ""
+    if final and content.endswith("\n"):
+        content = content[:-1]
+
+    # A line after the first which might be an index line could end the block
+    # early, since SRT_REGEX tolerates a missing blank line between blocks.
+    line_end = content.find("\n")
+    while line_end != -1:
+        if content[line_end + 1 : line_end + 2] in INDEX_START_CHARS:
+            return None
+        line_end = content.find("\n", line_end + 1)
+
+    return (
+        int(raw_index),
+        line[:FAST_TS_LEN],
+        line[FAST_TS_END_START:FAST_TS_LINE_LEN],
+        line[FAST_TS_LINE_LEN + 1 :],
+        content,
+    )
+
+
+def _tokenize_spans(srt, pos=0):
+    """
+    Like :py:func:`_tokenize`, but give the position of the proprietary
+    metadata and content of each block instead of copying them out.
+
+    :param srt: The data to split, either a str or a bytes-like object in
+                UTF-8
+    :param int pos: Where in ``srt`` to start
+    :returns: ``(start, end, index, raw_start, raw_end, proprietary_span,
+              content_span)`` for each block, where the spans are ``(start,
+              end)`` tuples, and raw_start and raw_end are always str
+    :rtype: :term:`generator` of tuples
+    """
+    if isinstance(srt, str):
+        for match in SRT_REGEX.finditer(srt, pos):
+            raw_index, raw_start, raw_end = match.group(1, 2, 3)
+            yield (
+                match.start(),
+                match.end(),
+                _parse_index(raw_index),
+                raw_start,
+                raw_end,
+                match.span(4),
+                match.span(5),
+            )
+        return
+
+    for match in SRT_BYTES_REGEX.finditer(srt, pos):
+        raw_index, raw_start, raw_end = match.group(1, 2, 3)
+        yield (
+            match.start(),
+            match.end(),
+            _parse_index(raw_index.decode("ascii")),
+            raw_start.decode("utf-8"),
+            raw_end.decode("utf-8"),
+            match.span(4),
+            match.span(5),
+        )
+
+
+def _match_to_block(match):
+    """
+    Convert a match of :py:data:`SRT_REGEX` to the same form as the blocks
+    yielded by :py:func:`_tokenize`.
+
+    :param match: The match to convert
+    :rtype: tuple
+    """
+    raw_index, raw_start, raw_end, proprietary, content = match.groups()
+
+    # pytype sees that this is Optional[str] and thus complains that they
+    # can be None, but they can't realistically be None, since we're using
+    # finditer and all match groups are mandatory in the regex.
+    content = content.replace("\r\n", "\n")  # pytype: disable=attribute-error
+
+    return (
+        match.start(),
+        match.end(),
+        _parse_index(raw_index),
+        raw_start,
+        raw_end,
+        proprietary,
+        content,
+    )
+
+
+def _parse_index(raw_index):
+    """
+    Convert an index matched by :py:data:`RGX_INDEX` to an int.
+
+    :param str raw_index: The index
+    :rtype: int
+    """
+    try:
+        return int(raw_index)
+    except ValueError:
+        # Index 123.4. Handled separately, since it's a rare case and we
+        # don't want to affect general performance.
+        return int(raw_index.split(".")[0])
+
+
+def _decode_slice(srt, start, end):
+    """
+    Get part of the data being parsed as a str.
+
+    :param srt: A str, or a bytes-like object in UTF-8
+    :param int start: Where the part starts in ``srt``
+    :param int end: Where the part ends in ``srt``
+    :rtype: str
+    """
+    part = srt[start:end]
+    if isinstance(part, str):
+        return part
+    return bytes(part).decode("utf-8")
+
+
+def _block_to_subtitle(block, to_time=srt_timestamp_to_timedelta):
+    """
+    Convert a block from :py:func:`_tokenize` to a :py:class:`Subtitle`.
+
+    :param tuple block: The block to convert
+    :param to_time: The function to convert SRT timestamps with
+    :rtype: :py:class:`Subtitle`
+    """
+    _, _, index, raw_start, raw_end, proprietary, content = block
+    return Subtitle(
+        index,
+        to_time(raw_start),
+        to_time(raw_end),
+        content,
+        proprietary,
+    )
+
+
+def _check_contiguity(srt, expected_start, actual_start, warn_only, offset=0):
     """
     If ``warn_only`` is False, raise :py:class:`SRTParseError` with diagnostic
     info if expected_start does not equal actual_start. Otherwise, log a
     warning.
 
-    :param str srt: The data being matched
+    :param srt: The data being matched, see :py:func:`_decode_slice`
     :param int expected_start: The expected next start, as from the last
                                iteration's match.end()
     :param int actual_start: The actual start, as from this iteration's
                              match.start()
+    :param int offset: The position of ``srt`` in the original input
     :raises SRTParseError: If the matches are not contiguous and ``warn_only``
                            is False
     """
     if expected_start != actual_start:
-        unmatched_content = srt[expected_start:actual_start]
+        unmatched_content = _decode_slice(srt, expected_start, actual_start)
 
-        if expected_start == 0 and (
+        if offset + expected_start == 0 and (
             unmatched_content.isspace() or unmatched_content == "\ufeff"
         ):
             # #50: Leading whitespace has nowhere to be captured like in an
@@ -394,13 +1497,27 @@ def _check_contiguity(srt, expected_start, actual_start, warn_only):
             return
 
         if warn_only:
-            LOG.warning("Skipped unparseable SRT data: %r", unmatched_content)
+            _report(
+                logging.WARNING,
+                "unparseable",
+                unmatched_content,
+                "Skipped unparseable SRT data: %r",
+                unmatched_content,
+            )
         else:
-            raise SRTParseError(expected_start, actual_start, unmatched_content)
+            raise SRTParseError(
+                offset + expected_start, offset + actual_start, unmatched_content
+            )
 
 
 def compose(
-    subtitles, reindex=True, start_index=1, strict=True, eol=None, in_place=False
+    subtitles,
+    reindex=True,
+    start_index=1,
+    strict=True,
+    eol=None,
+    in_place=False,
+    diagnostics=None,
 ):
     r"""
     Convert an iterator of :py:class:`Subtitle` objects to a string of joined
@@ -429,8 +1546,14 @@ def compose(
               :py:class:`Subtitle` represented as an SRT block
     :param bool in_place: Whether to reindex subs in-place for performance
                           (version <=1.0.0 behaviour)
+    :param diagnostics: A :py:class:`Diagnostics` to collect the subtitles
+                        skipped or legalised into, instead of logging them
     :rtype: str
     """
+    if diagnostics is not None:
+        with diagnostics:
+            return compose(subtitles, reindex, start_index, strict, eol, in_place)
+
     if reindex:
         subtitles = sort_and_reindex(
             subtitles, start_index=start_index, in_place=in_place
@@ -439,6 +1562,269 @@ def compose(
     return "".join(subtitle.to_srt(strict=strict, eol=eol) for subtitle in subtitles)
 
 
+def compose_to(
+    subtitles,
+    stream,
+    reindex=True,
+    start_index=1,
+    strict=True,
+    eol=None,
+    in_place=False,
+    flush_size=COMPOSE_FLUSH_SIZE,
+    encoding=None,
+    max_memory=None,
+    temp_dir=None,
+    diagnostics=None,
+):
+    r"""
+    Like :py:func:`compose`, but write the SRT blocks to a file-like object as
+    they are formatted, instead of joining them all into one string.
+
+    Blocks are collected into batches of at least ``flush_size`` characters,
+    and each batch is written with a single call to ``stream.write``. If
+    ``subtitles`` is a generator and ``reindex`` is False, output starts before
+    the generator is finished, and only one batch is held in memory at once.
+
+    If ``encoding`` is given, ``stream`` must be in binary mode, and each
+    batch is encoded before it is written. Either way, blocks are formatted
+    with "\n", and ``eol`` is applied to each batch as a whole, instead of to
+    each line of each block.
+
+    With ``max_memory``, subtitles which don't fit in memory are sorted on
+    disk when reindexing, as in :py:func:`sort_and_reindex`, so the whole
+    output never has to be held at once.
+
+    .. doctest::
+
+        >>> from datetime import timedelta
+        >>> from io import BytesIO
+        >>> start = timedelta(seconds=1)
+        >>> end = timedelta(seconds=2)
+        >>> subs = [Subtitle(index=1, start=start, end=end, content='x')]
+        >>> output = BytesIO()
+        >>> compose_to(subs, output, eol='\r\n', encoding='utf-8')
+        >>> output.getvalue()
+        b'1\r\n00:00:01,000 --> 00:00:02,000\r\nx\r\n\r\n'
+
+    :param subtitles: The subtitles to convert to SRT blocks
+    :type subtitles: :term:`iterator` of :py:class:`Subtitle` objects
+    :param stream: The file-like object to write to
+    :param bool reindex: See :py:func:`compose`
+    :param int start_index: See :py:func:`compose`
+    :param bool strict: See :py:func:`compose`
+    :param str eol: The end of line string to use (default "\n")
+    :param bool in_place: See :py:func:`compose`
+    :param int flush_size: The amount of characters to collect before writing
+    :param str encoding: The encoding to write bytes in, or None to write str
+    :param int max_memory: See :py:func:`sort_and_reindex`
+    :param str temp_dir: See :py:func:`sort_and_reindex`
+    :param diagnostics: See :py:func:`compose`
+    """
+    if diagnostics is not None:
+        with diagnostics:
+            compose_to(
+                subtitles,
+                stream,
+                reindex,
+                start_index,
+                strict,
+                eol,
+                in_place,
+                flush_size,
+                encoding,
+                max_memory,
+                temp_dir,
+            )
+        return
+
+    if reindex:
+        subtitles = sort_and_reindex(
+            subtitles,
+            start_index=start_index,
+            in_place=in_place,
+            max_memory=max_memory,
+            temp_dir=temp_dir,
+        )
+
+    translate_eol = eol is not None and eol != "\n"
+    encode = None
+    if encoding is not None:
+        encode = _batch_encoder(encoding)
+
+    for batch in _batched_blocks(subtitles, strict, flush_size):
+        if translate_eol:
+            batch = batch.replace("\n", eol)
+        if encode is not None:
+            batch = encode(batch)
+        stream.write(batch)
+
+
+def _batched_blocks(subtitles, strict, flush_size):
+    """
+    Format subtitles as SRT blocks with "\n" line endings, and join them into
+    batches of at least ``flush_size`` characters. The last batch may be
+    shorter.
+
+    :rtype: :term:`generator` of str
+    """
+    batch = []
+    batch_size = 0
+
+    for subtitle in subtitles:
+        block = subtitle.to_srt(strict=strict)
+        batch.append(block)
+        batch_size += len(block)
+        if batch_size >= flush_size:
+            yield "".join(batch)
+            batch = []
+            batch_size = 0
+
+    if batch:
+        yield "".join(batch)
+
+
+def _batch_encoder(encoding):
+    """
+    Get a function to encode output one batch at a time.
+
+    An incremental encoder is used so that a byte order mark is only written
+    once. Every batch ends with a line break, so stateful encodings are always
+    back in their initial state afterwards, and don't need a final flush. UTF-8
+    has no state, so it skips all that and uses :py:meth:`str.encode` directly.
+
+    :param str encoding: The encoding to use
+    :rtype: function taking str and returning bytes
+    """
+    if codecs.lookup(encoding).name == "utf-8":
+        return str.encode
+    return codecs.getincrementalencoder(encoding)().encode
+
+
+class Diagnostics:
+    r"""
+    Collects what was legalised or skipped while parsing and composing, instead
+    of logging each occurrence. Only how many times each kind of thing
+    happened, and the first few examples of it, are kept, so this stays cheap
+    on very messy input.
+
+    Use it as a context manager to collect everything in the current thread,
+    or pass it to :py:func:`parse`,
+    :py:func:`compose` or :py:func:`compose_to`.
+
+    The categories are "legalised", with the content before and after as
+    examples, "skipped: <reason>", with the indexes of the skipped subtitles,
+    and "unparseable", with the data skipped by ``ignore_errors``.
+
+    .. doctest::
+
+        >>> with Diagnostics() as diagnostics:
+        ...     make_legal_content('\nfoo\n\nbar\n')
+        'foo\nbar'
+        >>> diagnostics.summary()
+        {'legalised': {'count': 1, 'examples': [('\nfoo\n\nbar\n', 'foo\nbar')]}}
+
+    :param int max_examples: How many examples to keep of each category
+    :param bool log_each: Whether to log each occurrence as well, as happens
+                          when nothing is collecting them
+    """
+
+    def __init__(self, max_examples=10, log_each=False):
+        self.max_examples = max_examples
+        self.log_each = log_each
+        self.counts = collections.Counter()
+        self.examples = {}
+        self._previous = []
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, dict(self.counts))
+
+    def __enter__(self):
+        self._previous.append(getattr(_ACTIVE_DIAGNOSTICS, "current", None))
+        _ACTIVE_DIAGNOSTICS.current = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _ACTIVE_DIAGNOSTICS.current = self._previous.pop()
+        return False
+
+    def record(self, category, example):
+        """
+        Count one occurrence of ``category``, keeping ``example`` if there
+        aren't ``max_examples`` of it already.
+
+        :param str category: What happened
+        :param example: Something to show what it happened to
+        """
+        self.counts[category] += 1
+        examples = self.examples.setdefault(category, [])
+        if len(examples) < self.max_examples:
+            examples.append(example)
+
+    def summary(self):
+        """
+        Get how many times each category happened, and its examples.
+
+        :returns: ``{category: {"count": int, "examples": list}}``
+        :rtype: dict
+        """
+        return {
+            category: {"count": count, "examples": list(self.examples[category])}
+            for category, count in self.counts.items()
+        }
+
+    def wrap(self, iterator):
+        """
+        Collect into this while each item of ``iterator`` is produced, without
+        collecting anything the consumer does in between.
+
+        :param iterator: The iterator to wrap, usually a generator
+        :rtype: :term:`generator`
+        """
+        iterator = iter(iterator)
+        while True:
+            with self:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+def _report(level, category, example, message, *args):
+    """
+    Record an occurrence of ``category`` in the active :py:class:`Diagnostics`,
+    or log it if there isn't one.
+
+    :param int level: The logging level to log ``message`` at
+    :param str category: See :py:meth:`Diagnostics.record`
+    :param example: See :py:meth:`Diagnostics.record`
+    :param str message: The log message, formatted with ``args``
+    """
+    diagnostics = getattr(_ACTIVE_DIAGNOSTICS, "current", None)
+    if diagnostics is not None:
+        diagnostics.record(category, example)
+        if not diagnostics.log_each:
+            return
+    LOG.log(level, message, *args)
+
+
+def _report_skipped(index, reason):
+    """
+    Report a subtitle skipped by :py:func:`sort_and_reindex`.
+
+    :param int index: The subtitle's index
+    :param str reason: Why it was skipped
+    """
+    _report(
+        logging.INFO,
+        "skipped: " + reason,
+        index,
+        "Skipped subtitle at index %d: %s",
+        index,
+        reason,
+    )
+
+
 class SRTParseError(Exception):
     """
     Raised when part of an SRT block could not be parsed.
@@ -461,14 +1847,16 @@ class SRTParseError(Exception):
         self.actual_start = actual_start
         self.unmatched_content = unmatched_content
 
+    def __reduce__(self):
+        # The default only passes the message to __init__, which breaks
+        # unpickling, for example when raised in another process
+        return (
+            type(self),
+            (self.expected_start, self.actual_start, self.unmatched_content),
+        )
+
 
 class TimestampParseError(ValueError):
     """
     Raised when an SRT timestamp could not be parsed.
     """
-
-
-class _ShouldSkipException(Exception):
-    """
-    Raised when a subtitle should be skipped.
-    """
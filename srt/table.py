@@ -0,0 +1,334 @@
+#!/usr/bin/python3
+
+"""Column-oriented storage for working with many subtitles at once."""
+
+from array import array
+from datetime import timedelta
+
+from .srt import (
+    BYTES_TYPES,
+    FILE_TYPES,
+    Subtitle,
+    _format_block,
+    _parse_blocks,
+    _report_skipped,
+    _skip_reason,
+    milliseconds_to_srt_timestamps,
+    srt_timestamps_to_milliseconds,
+    timedelta_to_milliseconds,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Each column operation has a NumPy version and a pure Python version using
+# array("q"), which is used when NumPy isn't installed. Both take and return
+# whole columns, and round the same way (half to even).
+if numpy is not None:
+
+    def _int_column(values):
+        return numpy.fromiter(values, dtype=numpy.int64)
+
+    def _add(column, amount):
+        return column + amount
+
+    def _scale(column, factor, offset):
+        return numpy.rint(column * factor + offset).astype(numpy.int64)
+
+    def _clip(column, lower, upper):
+        return numpy.clip(column, lower, upper)
+
+    def _sort_order(starts, ends):
+        return numpy.lexsort((ends, starts)).tolist()
+
+    def _take(column, order):
+        return column[order]
+
+else:
+
+    def _int_column(values):
+        return array("q", values)
+
+    def _add(column, amount):
+        return array("q", [value + amount for value in column])
+
+    def _scale(column, factor, offset):
+        return array("q", [round(value * factor + offset) for value in column])
+
+    def _clip(column, lower, upper):
+        if lower is not None:
+            column = array("q", [max(value, lower) for value in column])
+        if upper is not None:
+            column = array("q", [min(value, upper) for value in column])
+        return column
+
+    def _sort_order(starts, ends):
+        return sorted(range(len(starts)), key=list(zip(starts, ends)).__getitem__)
+
+    def _take(column, order):
+        return array("q", [column[i] for i in order])
+
+
+class SubtitleTable:
+    r"""
+    Subtitles stored as columns instead of as :py:class:`~srt.Subtitle`
+    objects. Start and end times are contiguous arrays of int milliseconds, so
+    retiming many subtitles at once doesn't need to touch each one in Python
+    when NumPy is installed.
+
+    The time columns are :py:class:`numpy.ndarray` objects of int64 if NumPy
+    is available, or :py:class:`array.array` objects of type "q" otherwise.
+    The other columns are lists.
+
+    .. doctest::
+
+        >>> table = SubtitleTable([1], [1000], [2000], ['x'])
+        >>> table.shift(500)
+        >>> table.compose()
+        '1\n00:00:01,500 --> 00:00:02,500\nx\n\n'
+
+    :param indexes: The SRT index of each subtitle
+    :param starts: The start time of each subtitle, in milliseconds
+    :param ends: The end time of each subtitle, in milliseconds
+    :param contents: The content of each subtitle
+    :param proprietaries: The proprietary metadata of each subtitle, or None
+                          if there isn't any
+    :raises ValueError: If the columns are not all the same length
+    """
+
+    # pylint: disable=R0913
+    def __init__(self, indexes, starts, ends, contents, proprietaries=None):
+        self.indexes = list(indexes)
+        self.starts = _int_column(starts)
+        self.ends = _int_column(ends)
+        self.contents = list(contents)
+        if proprietaries is None:
+            proprietaries = [""] * len(self.contents)
+        self.proprietaries = list(proprietaries)
+
+        lengths = {
+            len(column)
+            for column in (
+                self.indexes,
+                self.starts,
+                self.ends,
+                self.contents,
+                self.proprietaries,
+            )
+        }
+        if len(lengths) != 1:
+            raise ValueError("Columns have different lengths: {}".format(lengths))
+
+    def __len__(self):
+        return len(self.contents)
+
+    def __repr__(self):
+        return "%s(<%d subtitles>)" % (type(self).__name__, len(self))
+
+    @classmethod
+    def from_subtitles(cls, subtitles):
+        """
+        Build a table from :py:class:`~srt.Subtitle` objects. Their times may
+        be :py:class:`~datetime.timedelta` objects or milliseconds, but any
+        precision finer than a millisecond is discarded.
+
+        :param subtitles: The subtitles to store
+        :type subtitles: iterable of :py:class:`~srt.Subtitle` objects
+        :rtype: :py:class:`SubtitleTable`
+        """
+        indexes, starts, ends, contents, proprietaries = [], [], [], [], []
+        for subtitle in subtitles:
+            start, end = subtitle.start, subtitle.end
+            if isinstance(start, timedelta):
+                start = timedelta_to_milliseconds(start)
+                end = timedelta_to_milliseconds(end)
+            indexes.append(subtitle.index)
+            starts.append(start)
+            ends.append(end)
+            contents.append(subtitle.content)
+            proprietaries.append(subtitle.proprietary)
+        return cls(indexes, starts, ends, contents, proprietaries)
+
+    @classmethod
+    def from_srt(cls, srt, ignore_errors=False, encoding="utf-8-sig"):
+        """
+        Parse SRT data straight into a table, without creating a
+        :py:class:`~srt.Subtitle` for each block. This accepts the same input
+        as :py:func:`srt.parse` and gives the same subtitles, although bytes
+        are decoded in full first, so the offsets in any
+        :py:class:`~srt.SRTParseError` always count characters.
+
+        :param srt: Subtitles in SRT format
+        :type srt: str, a bytes-like object, or a file-like object
+        :param bool ignore_errors: See :py:func:`srt.parse`
+        :param str encoding: See :py:func:`srt.parse`
+        :rtype: :py:class:`SubtitleTable`
+        :raises SRTParseError: See :py:func:`srt.parse`
+        """
+        if isinstance(srt, FILE_TYPES):
+            srt = srt.read()
+        if isinstance(srt, BYTES_TYPES):
+            srt = str(srt, encoding)
+
+        blocks = list(_parse_blocks(srt, ignore_errors))
+        # Each block is (start, end, index, raw_start, raw_end, proprietary,
+        # content)
+        columns = list(zip(*blocks)) or [()] * 7
+        return cls(
+            columns[2],
+            srt_timestamps_to_milliseconds(columns[3]),
+            srt_timestamps_to_milliseconds(columns[4]),
+            columns[6],
+            columns[5],
+        )
+
+    def to_subtitles(self, milliseconds=False):
+        """
+        Convert the table back to :py:class:`~srt.Subtitle` objects.
+
+        :param bool milliseconds: If True, the subtitles' times are ints
+                                  counting milliseconds, otherwise they are
+                                  :py:class:`~datetime.timedelta` objects
+        :rtype: :term:`generator` of :py:class:`~srt.Subtitle` objects
+        """
+        starts = self.starts.tolist()
+        ends = self.ends.tolist()
+        if not milliseconds:
+            starts = [timedelta(milliseconds=start) for start in starts]
+            ends = [timedelta(milliseconds=end) for end in ends]
+
+        for row in zip(self.indexes, starts, ends, self.contents, self.proprietaries):
+            yield Subtitle(*row)
+
+    def copy(self):
+        """
+        Make a copy of this table.
+
+        :rtype: :py:class:`SubtitleTable`
+        """
+        return type(self)(
+            self.indexes, self.starts, self.ends, self.contents, self.proprietaries
+        )
+
+    def shift(self, msecs):
+        """
+        Move every subtitle by the same amount of time.
+
+        :param int msecs: The amount of milliseconds to move by, which may be
+                          negative
+        """
+        self.starts = _add(self.starts, msecs)
+        self.ends = _add(self.ends, msecs)
+
+    def scale(self, factor, offset=0):
+        """
+        Perform a linear time correction, mapping every time ``t`` to
+        ``round(t * factor + offset)``, like :py:mod:`srt.tools.linear_timeshift`.
+
+        :param float factor: The amount to multiply each time by
+        :param float offset: The amount of milliseconds to add after
+                             multiplying
+        """
+        self.starts = _scale(self.starts, factor, offset)
+        self.ends = _scale(self.ends, factor, offset)
+
+    def clip(self, lower=None, upper=None):
+        """
+        Limit every start and end time to be within a range.
+
+        :param int lower: The earliest allowed time in milliseconds, or None
+                          for no limit
+        :param int upper: The latest allowed time in milliseconds, or None for
+                          no limit
+        """
+        if lower is None and upper is None:
+            return
+        self.starts = _clip(self.starts, lower, upper)
+        self.ends = _clip(self.ends, lower, upper)
+
+    def sort(self):
+        """
+        Sort the subtitles in place by start time, and then end time, in the
+        same order as :py:func:`srt.sort_and_reindex`.
+        """
+        self._take(_sort_order(self.starts, self.ends))
+
+    def reindex(self, start_index=1):
+        """
+        Rewrite the indexes to count up from ``start_index`` in the current
+        order.
+
+        :param int start_index: The index to start from
+        """
+        self.indexes = list(range(start_index, start_index + len(self)))
+
+    def compose(self, reindex=True, start_index=1, strict=True, eol=None):
+        r"""
+        Convert the table to SRT blocks, formatting the timestamps straight from
+        the columns. This gives the same result as :py:func:`srt.compose` on
+        the equivalent subtitles. The table itself is not modified.
+
+        :param bool reindex: Whether to sort, skip subtitles which aren't
+                             useful, and reindex, like
+                             :py:func:`srt.sort_and_reindex`
+        :param int start_index: If reindexing, the index to start reindexing
+                                from
+        :param bool strict: See :py:func:`srt.compose`
+        :param str eol: The end of line string to use (default "\\n")
+        :rtype: str
+        """
+        table = self
+        if reindex:
+            table = self.copy()
+            table.sort()
+            table._drop_skipped()
+            table.reindex(start_index)
+
+        starts = milliseconds_to_srt_timestamps(table.starts.tolist())
+        ends = milliseconds_to_srt_timestamps(table.ends.tolist())
+        return "".join(
+            _format_block(index, start, end, content, proprietary, strict, eol)
+            for index, start, end, content, proprietary in zip(
+                table.indexes,
+                starts,
+                ends,
+                table.contents,
+                table.proprietaries,
+            )
+        )
+
+    def _take(self, order):
+        """
+        Rearrange every column in place to the given order of rows.
+
+        :param list order: The row numbers to keep, in their new order
+        """
+        self.indexes = [self.indexes[i] for i in order]
+        self.starts = _take(self.starts, order)
+        self.ends = _take(self.ends, order)
+        self.contents = [self.contents[i] for i in order]
+        self.proprietaries = [self.proprietaries[i] for i in order]
+
+    def _drop_skipped(self):
+        """
+        Remove the subtitles which :py:func:`srt.sort_and_reindex` would skip.
+        """
+        keep = []
+        rows = zip(
+            self.indexes,
+            self.starts.tolist(),
+            self.ends.tolist(),
+            self.contents,
+        )
+        for row_num, row in enumerate(rows):
+            reason = _skip_reason(Subtitle(*row))
+            if reason is None:
+                keep.append(row_num)
+            else:
+                _report_skipped(row[0], reason)
+
+        if len(keep) != len(self):
+            self._take(keep)
@@ -1,10 +1,42 @@
 """srt3 tools perform tasks using the srt module."""
-import os
+
 import importlib
+import sys
+
+# Every tool, so that finding one doesn't need to list this directory. A tool
+# is only imported the first time it's used, as an attribute of this package
+# or as a command.
+COMMANDS = (
+    "add",
+    "deduplicate",
+    "find",
+    "fixed_timeshift",
+    "linear_timeshift",
+    "match",
+    "mux",
+    "normalize",
+    "paste",
+    "pipe",
+    "serve",
+    "split",
+)
+
+__all__ = list(COMMANDS)
+
+
+def __getattr__(name):
+    if name in COMMANDS:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(COMMANDS))
+
 
-folder_path = os.path.normpath(os.path.join(__file__, os.pardir))
-for file in os.listdir(folder_path):
-    if not file.startswith("_") and file.endswith(".py"):
-        importlib.import_module(f"srt.tools.{file[:-3]}")
-del folder_path
-del file
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Modules can only have __getattr__ (PEP 562) from Python 3.7, so import
+    # them all up front instead
+    for _name in COMMANDS:
+        globals()[_name] = __getattr__(_name)
+    del _name
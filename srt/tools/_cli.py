@@ -3,13 +3,17 @@
 import argparse
 import codecs
 import sys
+import glob
+import importlib
 import itertools
-import collections
+import collections.abc
+import mmap
 import os
 import logging
+import shutil
+import tempfile
 import srt
 
-
 PROG_NAME = os.path.basename(sys.argv[0]).replace("-", " ", 1)
 
 STDIN_BYTESTREAM = getattr(sys.stdin, "buffer", sys.stdin)
@@ -17,6 +21,11 @@ STDOUT_BYTESTREAM = getattr(sys.stdout, "buffer", sys.stdout)
 
 DASH_STREAM_MAP = {"input": STDIN_BYTESTREAM, "output": STDOUT_BYTESTREAM}
 
+# Streams are parsed as they're read, this many characters at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+# How many examples of each kind of problem to show in the summary
+DIAGNOSTIC_EXAMPLES = 3
+
 log = logging.getLogger(__name__)
 
 
@@ -34,13 +43,7 @@ def dash_to_stream(arg, arg_type):
     return arg
 
 
-def basic_parser(
-    description=None,
-    multi_input=False,
-    no_output=False,
-    examples=None,
-    hide_no_strict=False,
-):
+def examples_epilog(examples):
     example_lines = []
 
     if examples is not None:
@@ -50,10 +53,37 @@ def basic_parser(
             example_lines.append("  {}".format(desc))
             example_lines.append("    $ {}\n".format(code))
 
-    parser = argparse.ArgumentParser(
+    return "\n".join(example_lines)
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    """
+    An :py:class:`argparse.ArgumentParser` which also checks the batch mode
+    arguments once they've been parsed, so that conflicts between them are
+    reported as usage errors like any others.
+    """
+
+    def parse_known_args(self, args=None, namespace=None):
+        parsed, extras = super().parse_known_args(args, namespace)
+        if getattr(parsed, "recursive", None):
+            try:
+                batch_output_dir(parsed)
+            except ValueError as thrown_exc:
+                self.error(str(thrown_exc))
+        return parsed, extras
+
+
+def basic_parser(
+    description=None,
+    multi_input=False,
+    no_output=False,
+    examples=None,
+    hide_no_strict=False,
+):
+    parser = ArgumentParser(
         prog=PROG_NAME,
         description=description,
-        epilog="\n".join(example_lines),
+        epilog=examples_epilog(examples),
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
@@ -95,6 +125,7 @@ def basic_parser(
                 action="store_true",
                 help="Modify the file in place.",
             )
+            add_batch_args(parser)
 
     parser.add_argument(
         "--encoding", help="The encoding to read/write files in (default: utf8)."
@@ -126,6 +157,79 @@ def basic_parser(
     return parser
 
 
+def add_batch_args(parser):
+    batch = parser.add_argument_group(
+        "batch mode",
+        "Run on many files at once, writing each to the same place in the "
+        "directory given by --output, or modifying it in place with --inplace.",
+    )
+    batch.add_argument(
+        "--recursive",
+        "-r",
+        metavar="DIR",
+        help="Process every file matching --glob in DIR and its subdirectories.",
+    )
+    batch.add_argument(
+        "--glob",
+        metavar="PATTERN",
+        default="*.srt",
+        help="The files to process with --recursive (default: *.srt).",
+    )
+    batch.add_argument(
+        "--jobs",
+        "-j",
+        metavar="N",
+        type=int,
+        help="How many files to process at once (default: the amount of CPUs).",
+    )
+
+
+def parse(data, args, chunk_size=None):
+    # The tools all work with times as milliseconds, which saves creating
+    # timedelta objects for every subtitle.
+    #
+    # We don't use system default encoding, because usually one runs this
+    # on files they got from elsewhere. As such, be opinionated that these
+    # files are probably UTF-8. Looking for the BOM on reading allows us to
+    # be more liberal with what we accept, without adding BOMs on write.
+    return srt.parse(
+        data,
+        ignore_errors=args.ignore_parsing_errors,
+        chunk_size=chunk_size,
+        milliseconds=True,
+        encoding=args.encoding or "utf-8-sig",
+    )
+
+
+def parse_file(path, args):
+    # Parse straight from a memory map, so the file isn't read or decoded in
+    # full first. The map stays open until the subtitles have all been parsed.
+    with open(path, "rb") as srt_file:
+        if _is_output(path, args):
+            # Opening the output truncates the file before it's parsed, which
+            # would pull the data out from under a map, so read it all now
+            return parse(srt_file.read(), args)
+
+        try:
+            data = mmap.mmap(srt_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and things like pipes can't be mapped
+            data = srt_file.read()
+
+    return parse(data, args)
+
+
+def _is_output(path, args):
+    output = getattr(args, "output", None)
+    if output is None or output in DASH_STREAM_MAP.values():
+        return False
+    try:
+        return os.path.samefile(path, output)
+    except (OSError, TypeError):
+        # The output doesn't exist yet, or is already a stream
+        return False
+
+
 def set_basic_args(args):
     # TODO: dedupe some of this
     if getattr(args, "inplace", None):
@@ -146,14 +250,8 @@ def set_basic_args(args):
             # For example, in the case of no_output
             continue
 
-        # We don't use system default encoding, because usually one runs this
-        # on files they got from elsewhere. As such, be opinionated that these
-        # files are probably UTF-8. Looking for the BOM on reading allows us to
-        # be more liberal with what we accept, without adding BOMs on write.
-        read_encoding = args.encoding or "utf-8-sig"
+        # See parse for why we don't use the system default encoding.
         write_encoding = args.encoding or "utf-8"
-
-        r_enc = codecs.getreader(read_encoding)
         w_enc = codecs.getwriter(write_encoding)
 
         log.debug("Got %r as stream", stream)
@@ -162,9 +260,7 @@ def set_basic_args(args):
         if stream in DASH_STREAM_MAP.values():
             log.debug("%s in DASH_STREAM_MAP", stream_name)
             if stream is args.input:
-                args.input = srt.parse(
-                    r_enc(args.input).read(), ignore_errors=args.ignore_parsing_errors
-                )
+                args.input = parse(args.input, args, STREAM_CHUNK_SIZE)
             elif stream is args.output:
                 # Since args.output is not in text mode (since we didn't
                 # earlier know the encoding), we have no universal newline
@@ -173,33 +269,177 @@ def set_basic_args(args):
         else:
             log.debug("%s not in DASH_STREAM_MAP", stream_name)
             if stream is args.input:
-                if isinstance(args.input, collections.MutableSequence):
+                if isinstance(args.input, collections.abc.MutableSequence):
                     for i, input_fn in enumerate(args.input):
                         if input_fn in DASH_STREAM_MAP.values():
                             if stream is args.input:
-                                args.input[i] = srt.parse(
-                                    r_enc(input_fn).read(),
-                                    ignore_errors=args.ignore_parsing_errors,
-                                )
+                                args.input[i] = parse(input_fn, args, STREAM_CHUNK_SIZE)
                         else:
-                            f = r_enc(open(input_fn, "rb"))
-                            with f:
-                                args.input[i] = srt.parse(
-                                    f.read(), ignore_errors=args.ignore_parsing_errors
-                                )
+                            args.input[i] = parse_file(input_fn, args)
                 else:
-                    f = r_enc(open(stream, "rb"))
-                    with f:
-                        args.input = srt.parse(
-                            f.read(), ignore_errors=args.ignore_parsing_errors
-                        )
+                    args.input = parse_file(stream, args)
             else:
                 args.output = w_enc(open(args.output, "wb"))
 
 
-def compose_suggest_on_fail(subs, strict=True):
+def batch(tool, args, argv=None, executor=None):
+    """
+    Run a tool on every file found by --recursive and --glob, in a pool of
+    --jobs processes. Files are found as they're needed, and the next ones
+    are queued up while the workers are busy.
+
+    Each worker parses the tool's arguments from ``argv`` again, since not
+    every tool's parsed arguments can be sent to another process.
+
+    :param str tool: The name of the tool's module
+    :param args: The tool's parsed arguments
+    :param list argv: The tool's arguments (default: from sys.argv)
+    :param executor: A :py:class:`concurrent.futures.Executor` to use instead
+                     of starting a new process pool
+    :returns: ``(path, error)`` for each file, where ``error`` is the
+              exception which stopped the file from being processed, or None
+    :rtype: :term:`generator` of tuples
+    :raises ValueError: See :py:func:`batch_output_dir`
+    """
+    from srt import parallel
+
+    output_dir = batch_output_dir(args)
+    if argv is None:
+        argv = sys.argv[1:]
+    workers = args.jobs or os.cpu_count() or 1
+    jobs = (
+        (tool, argv, path, output_path)
+        for path, output_path in find_batch_files(args.recursive, args.glob, output_dir)
+    )
+
+    with parallel._executor_or_pool(executor, workers) as pool:
+        for job, future in parallel._submit_bounded(
+            pool,
+            _process_batch_file,
+            jobs,
+            workers * parallel.FILES_IN_FLIGHT_PER_WORKER,
+            ordered=False,
+        ):
+            yield job[2], future.exception()
+
+
+def batch_output_dir(args):
+    """
+    Check the arguments for batch mode, and find where it writes to.
+
+    :param args: The tool's parsed arguments
+    :returns: The directory given by --output, or None for --inplace
+    :rtype: str or None
+    :raises ValueError: If the arguments can't be used together
+    """
+    if args.input is not DASH_STREAM_MAP["input"]:
+        raise ValueError("Cannot use --input and --recursive together")
+    if args.inplace:
+        if args.output is not DASH_STREAM_MAP["output"]:
+            raise ValueError("Cannot use -o and -q together")
+        return None
+    if args.output is DASH_STREAM_MAP["output"]:
+        raise ValueError("Cannot use --recursive without -o or -q")
+    return args.output
+
+
+def find_batch_files(directory, pattern, output_dir=None):
+    """
+    Find the files for batch mode, and where to write each of them.
+
+    :returns: ``(path, output_path)`` for each file, where ``output_path`` is
+              the same place under ``output_dir``, or None to modify the file
+              in place
+    :rtype: :term:`generator` of tuples
+    """
+    if output_dir is not None:
+        output_dir = os.path.abspath(output_dir)
+
+    matches = glob.iglob(
+        os.path.join(glob.escape(directory), "**", pattern), recursive=True
+    )
+    for path in matches:
+        if not os.path.isfile(path):
+            continue
+        if output_dir is None:
+            yield path, None
+            continue
+        if os.path.commonpath([output_dir, os.path.abspath(path)]) == output_dir:
+            # Our own output, from when it's inside the input directory
+            continue
+        yield path, os.path.join(output_dir, os.path.relpath(path, directory))
+
+
+def _process_batch_file(tool, argv, path, output_path):
+    """
+    Run a tool on one file for :py:func:`batch`, in the same way as on the
+    command line.
+    """
+    module = importlib.import_module(tool)
+    args = module.set_args(argv)
+    args.input = path
+    if output_path is None:
+        # Write next to the file and only replace it once the tool has
+        # succeeded, so a file which can't be parsed is left as it was
+        fd, args.output = tempfile.mkstemp(
+            prefix="." + os.path.basename(path) + ".",
+            suffix=".tmp",
+            dir=os.path.dirname(path),
+        )
+        os.close(fd)
+        shutil.copymode(path, args.output)
+        args.inplace = False
+    else:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        args.output = output_path
+    written_path = args.output
+
     try:
-        return srt.compose(subs, strict=strict, eol=os.linesep, in_place=True)
+        set_basic_args(args)
+        with args.output:
+            subs = module.process(args.input, args)
+            compose_suggest_on_fail(subs, strict=args.strict, output=args.output)
+    except BaseException:
+        # Don't leave half of the output behind to be mistaken for all of it
+        if os.path.exists(written_path):
+            os.remove(written_path)
+        raise
+
+    if output_path is None:
+        os.replace(written_path, path)
+
+
+def run_batch(tool, args):
+    # Print a summary of every file, and fail if any of them did
+    results = sorted(batch(tool, args), key=lambda result: result[0])
+    failed = 0
+    for path, error in results:
+        if error is None:
+            print("OK      {}".format(path))
+        else:
+            failed += 1
+            print("FAILED  {}: {}: {}".format(path, type(error).__name__, error))
+
+    print("{} file(s) processed, {} failed".format(len(results), failed))
+    if failed:
+        sys.exit(1)
+
+
+def compose_suggest_on_fail(subs, strict=True, output=None):
+    # If output is given, blocks are written to it as they're composed,
+    # instead of being returned as one string.
+    #
+    # Anything legalised or skipped (including while parsing, since `subs` is
+    # usually a generator) is summarised at the end, unless debug logging is
+    # on, when each one is logged as well.
+    diagnostics = srt.Diagnostics(
+        max_examples=DIAGNOSTIC_EXAMPLES, log_each=log.isEnabledFor(logging.DEBUG)
+    )
+    try:
+        with diagnostics:
+            if output is None:
+                return srt.compose(subs, strict=strict, eol=os.linesep, in_place=True)
+            srt.compose_to(subs, output, strict=strict, eol=os.linesep, in_place=True)
     except srt.SRTParseError as thrown_exc:
         # Since `subs` is actually a generator
         log.critical(
@@ -207,6 +447,20 @@ def compose_suggest_on_fail(subs, strict=True):
             "with --encoding?"
         )
         raise
+    finally:
+        log_diagnostics(diagnostics)
+
+
+def log_diagnostics(diagnostics):
+    for category, details in diagnostics.summary().items():
+        level = logging.WARNING if category == "unparseable" else logging.INFO
+        log.log(
+            level,
+            "%s: %d time(s), for example: %s",
+            category,
+            details["count"],
+            ", ".join(repr(example) for example in details["examples"]),
+        )
 
 
 def sliding_window(seq, width=2, inclusive=True):
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+
+"""The protocol spoken by srt serve, and a client for it."""
+
+import json
+import logging
+import os
+import socket
+import struct
+import sys
+
+# Every message is its length as this header, followed by that many bytes. A
+# request is:
+#
+#   client: {"command": "find", "argv": [...], "cwd": "..."} as JSON
+#   server: {"stdin": true} as JSON, if the command reads stdin
+#   client: all of stdin, if the server asked for it
+#   server: {"status": 0} as JSON, then stdout, and then stderr
+MESSAGE_HEADER = struct.Struct(">I")
+
+log = logging.getLogger(__name__)
+
+
+def send_message(sock, data):
+    sock.sendall(MESSAGE_HEADER.pack(len(data)) + data)
+
+
+def send_json(sock, obj):
+    send_message(sock, json.dumps(obj).encode("utf-8"))
+
+
+def receive_message(sock):
+    (length,) = MESSAGE_HEADER.unpack(_receive_exactly(sock, MESSAGE_HEADER.size))
+    return _receive_exactly(sock, length)
+
+
+def receive_json(sock):
+    return json.loads(receive_message(sock).decode("utf-8"))
+
+
+def _receive_exactly(sock, length):
+    data = bytearray()
+    while len(data) < length:
+        chunk = sock.recv(min(length - len(data), 1024 * 1024))
+        if not chunk:
+            raise ConnectionError("Connection closed in the middle of a message")
+        data += chunk
+    return bytes(data)
+
+
+def request(socket_path, command, argv, cwd=None, stdin=None):
+    """
+    Run a command line through srt serve.
+
+    :param str socket_path: The socket srt serve is listening on
+    :param str command: The tool to run
+    :param list argv: The arguments to the tool
+    :param str cwd: The directory relative paths in ``argv`` are relative to
+                    (default: the current directory)
+    :param stdin: The binary file-like object to send as stdin, if the command
+                  reads it (default: stdin)
+    :returns: The command's exit status, stdout and stderr
+    :rtype: tuple
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        send_json(
+            sock,
+            {"command": command, "argv": list(argv), "cwd": cwd or os.getcwd()},
+        )
+
+        response = receive_json(sock)
+        if response.get("stdin"):
+            if stdin is None:
+                stdin = getattr(sys.stdin, "buffer", sys.stdin)
+            send_message(sock, stdin.read())
+            response = receive_json(sock)
+
+        return response["status"], receive_message(sock), receive_message(sock)
+
+
+def connect(socket_path, argv):
+    # srt --connect: run a command line through srt serve as if it were run
+    # here, and give back the exit status
+    if not argv:
+        log.error("No command given to run")
+        return 1
+
+    status, stdout, stderr = request(socket_path, argv[0], argv[1:])
+    getattr(sys.stdout, "buffer", sys.stdout).write(stdout)
+    getattr(sys.stderr, "buffer", sys.stderr).write(stderr)
+    return status
@@ -3,15 +3,14 @@
 import os
 import sys
 import importlib
+from srt.tools import COMMANDS
+
+# Where srt serve is listening, to run commands through it without --connect
+CONNECT_ENV_VAR = "SRT_CONNECT"
 
 
 def commands():
-    commands = set()
-    folder_path = os.path.normpath(os.path.join(__file__, os.pardir))
-    for script in os.listdir(folder_path):
-        if not script.startswith("_") and script.endswith(".py"):
-            commands.add(script[:-3])
-    return sorted(commands)
+    return list(COMMANDS)
 
 
 def show_help():
@@ -21,9 +20,24 @@ def show_help():
     )
     for command in commands():
         print(f"- {command}")
+    print(
+        "\nTo run a command through srt serve, pass --connect SOCKET before it, "
+        f"or set {CONNECT_ENV_VAR}=SOCKET."
+    )
 
 
 def main():
+    socket_path = os.environ.get(CONNECT_ENV_VAR)
+    if sys.argv[1:2] == ["--connect"] and len(sys.argv) > 2:
+        socket_path = sys.argv[2]
+        sys.argv[1:3] = []
+    # Anything else, like --help or an unknown command, is handled here
+    forwarded = [command for command in commands() if command != "serve"]
+    if socket_path and sys.argv[1:2] and sys.argv[1] in forwarded:
+        from srt.tools import _connect
+
+        sys.exit(_connect.connect(socket_path, sys.argv[1:]))
+
     if len(sys.argv) < 2 or sys.argv[1].startswith("-"):
         show_help()
         sys.exit(0)
@@ -1,5 +1,9 @@
 #!/usr/bin/python3
 
+import datetime
+
+import srt
+
 
 def tryNext(subs):
     """Finds the next subtitle in an iterator otherwise returns None."""
@@ -7,3 +11,17 @@ def tryNext(subs):
         return next(subs)
     except StopIteration:
         return None
+
+
+def timestamp_like(timestamp, example):
+    """
+    Converts a timestamp to the same representation as another one, either a
+    datetime.timedelta or an int counting milliseconds.
+    """
+    if isinstance(example, datetime.timedelta):
+        if isinstance(timestamp, datetime.timedelta):
+            return timestamp
+        return datetime.timedelta(milliseconds=timestamp)
+    if isinstance(timestamp, datetime.timedelta):
+        return srt.timedelta_to_milliseconds(timestamp)
+    return timestamp
@@ -35,6 +35,11 @@ def add(subs, start, end, content="", adjust=False):
     idx = 1
     adjust_time = datetime.timedelta(0)
     subtitle = _utils.tryNext(subs)
+    if subtitle is not None:
+        # Use the same time representation as the subtitles.
+        start = _utils.timestamp_like(start, subtitle.start)
+        end = _utils.timestamp_like(end, subtitle.start)
+        adjust_time = _utils.timestamp_like(adjust_time, subtitle.start)
     while subtitle is not None:
         subtitle_start = subtitle.start
 
@@ -70,7 +75,7 @@ def add(subs, start, end, content="", adjust=False):
 
 
 # Command Line Interface
-def set_args():
+def set_args(argv=None):
     examples = {
         "Add a subtitle": 'srt add -i example.srt -s 00:00:5,00 -e 00:00:5,00 -c "srt3 is awesome."',
         "Add a subtitle and adjust subsequent ones": 'srt add -i example.srt -s 00:00:5,00 -e 00:00:5,00 --c "srt3 is awesome." -a',
@@ -103,16 +108,22 @@ def set_args():
         action="store_true",
         help="Adjust the timestamps of subsequent subtitles.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def process(subs, args):
+    return add(subs, args.start, args.end, args.content, args.adjust)
 
 
 def main():
     args = set_args()
     logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
-    add_subs = add(args.input, args.start, args.end, args.content, args.adjust)
-    output = _cli.compose_suggest_on_fail(add_subs, strict=args.strict)
-    args.output.write(output)
+    add_subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(add_subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -2,62 +2,247 @@
 
 """Merge multiple subtitles together into one."""
 
+import argparse
+import collections
 import datetime
+import functools
+import hashlib
+import itertools
 import logging
+import operator
+import re
+import struct
 from . import _cli
+from . import _utils
 
 
 log = logging.getLogger(__name__)
 
+# Content is compared in lower case, without tags like <i> or {\an8}, and with
+# anything which isn't a letter or number as a single space
+TAG_REGEX = re.compile(r"<[^>]*>|\{[^}]*\}")
+NON_WORD_REGEX = re.compile(r"[\W_]+")
+# The length of the pieces of normalised content which are compared
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 64
+# How likely a pair which is exactly as similar as needed should be to get
+# compared, when choosing how to band the MinHash signatures
+LSH_RECALL = 0.98
+# Each shingle is hashed once, and every 4 bytes of the hash are used as its
+# hash for a different permutation
+_SHINGLE_HASHES = struct.Struct("<%dI" % MINHASH_PERMUTATIONS)
+# Most shingles come up again and again, so their hashes are kept
+SHINGLE_CACHE_SIZE = 65536
+SIGNATURE_CACHE_SIZE = 1024
 
-def deduplicate(orig_subs, acceptable_diff):
+
+def deduplicate(subs, acceptable_diff, similarity=None):
     r"""
-    Removes subtitles with duplicated content.
+    Removes subtitles with duplicated content. A subtitle is a duplicate if
+    another with the same content started at most ``acceptable_diff`` before
+    it, even if that one was a duplicate too.
+
+    This works on a stream, so ``subs`` must be in order of start time. Only
+    the content of subtitles which started within ``acceptable_diff`` is kept,
+    unless ``acceptable_diff`` is zero, when every subtitle with content seen
+    before is removed, regardless of proximity.
+
+    If ``similarity`` is given, content only needs to be that similar to be a
+    duplicate, ignoring case, punctuation and tags (content with nothing else,
+    like "...", still has to be exactly the same). Similarity is the Jaccard
+    index of the sets of :py:data:`SHINGLE_SIZE` character pieces of each
+    content. Only pairs found to be likely enough by MinHash signatures are
+    compared, and each pair merged is logged.
 
-    :param orig_subs: :py:class:`Subtitle` objects
+    :param subs: :py:class:`Subtitle` objects, in order of start time
     :param datetime.timedelta acceptable_diff: The amount of milliseconds
                                     a subtitle start time must be to shift.
+    :param float similarity: How similar content must be to be a duplicate,
+                             from 0 to 1 (default: exactly the same)
     :rtype: :term:`generator` of :py:class:`Subtitle` objects
     """
-    indices_to_remove = set()
-
-    # If we only store the subtitle itself and compare that, it's possible that
-    # we'll not only remove the duplicate, but also the _original_ subtitle if
-    # they have the same sub index/times/etc.
-    #
-    # As such, we need to also store the index in the original subs list that
-    # this entry belongs to for each subtitle prior to sorting.
-    sorted_subs = sorted(
-        enumerate(orig_subs), key=lambda sub: (sub[1].content, sub[1].start)
-    )
+    subs = iter(subs)
+    first_sub = _utils.tryNext(subs)
+    if first_sub is None:
+        return
+    subs = itertools.chain([first_sub], subs)
+    acceptable_diff = _utils.timestamp_like(acceptable_diff, first_sub.start)
 
-    for subs in _cli.sliding_window(sorted_subs, width=2, inclusive=False):
-        cur_idx, cur_sub = subs[0]
-        next_idx, next_sub = subs[1]
+    if similarity is not None:
+        yield from _deduplicate_similar(subs, acceptable_diff, similarity)
+        return
 
-        if cur_sub.content == next_sub.content and (
-            not acceptable_diff or cur_sub.start + acceptable_diff >= next_sub.start
-        ):
+    if not acceptable_diff:
+        seen = set()
+        for sub in subs:
+            if sub.content in seen:
+                log.debug("Removing s%d, duplicate content", sub.index)
+                continue
+            seen.add(sub.content)
+            yield sub
+        return
+
+    # The latest start of each content, and the same in order of start, to
+    # find the ones which are too old to matter any more
+    latest_starts = {}
+    window = collections.deque()
+    for sub in subs:
+        while window and window[0][0] + acceptable_diff < sub.start:
+            start, content = window.popleft()
+            if latest_starts.get(content) == start:
+                del latest_starts[content]
+
+        latest_start = latest_starts.get(sub.content)
+        latest_starts[sub.content] = sub.start
+        window.append((sub.start, sub.content))
+
+        if latest_start is not None:
             log.debug(
-                "Marking l%d/s%d for removal, duplicate of l%d/s%d",
-                next_idx,
-                next_sub.index,
-                cur_idx,
-                cur_sub.index,
+                "Removing s%d, duplicate of a subtitle starting at %s",
+                sub.index,
+                latest_start,
+            )
+            continue
+        yield sub
+
+
+def _deduplicate_similar(subs, acceptable_diff, similarity):
+    """
+    Removes subtitles with similar content for :py:func:`deduplicate`.
+
+    Subtitles within the window are put in buckets by each band of their
+    MinHash signature, and are only compared with those sharing a bucket, so
+    this doesn't compare every pair.
+    """
+    bands, rows = _lsh_bands(similarity)
+    buckets = collections.defaultdict(collections.deque)
+    window = collections.deque()
+    merged = 0
+
+    for sub in subs:
+        while window and window[0][0].start + acceptable_diff < sub.start:
+            # Everything is added in order of start, so the oldest subtitle in
+            # the window is also the oldest in each of its buckets
+            _, _, old_keys = window.popleft()
+            for key in old_keys:
+                buckets[key].popleft()
+                if not buckets[key]:
+                    del buckets[key]
+
+        shingles = _shingles(sub.content)
+        signature = _minhash(shingles)
+        keys = [
+            (band, signature[band * rows : (band + 1) * rows]) for band in range(bands)
+        ]
+
+        # Of the most similar, prefer the earliest
+        best, best_similarity = None, similarity
+        candidates = {id(entry): entry for key in keys for entry in buckets[key]}
+        for other, other_shingles, _ in sorted(
+            candidates.values(), key=lambda entry: entry[0].start
+        ):
+            pair_similarity = _jaccard(shingles, other_shingles)
+            if pair_similarity > best_similarity or (
+                best is None and pair_similarity == similarity
+            ):
+                best, best_similarity = other, pair_similarity
+
+        # Without a window, content the same as what it was merged into can't
+        # match anything that wouldn't match already
+        if acceptable_diff or best is None or best_similarity < 1:
+            entry = (sub, shingles, keys)
+            if acceptable_diff:
+                window.append(entry)
+            for key in keys:
+                buckets[key].append(entry)
+
+        if best is not None:
+            merged += 1
+            log.info(
+                "Merged s%d into s%d (%.2f similar): %r ~ %r",
+                sub.index,
+                best.index,
+                best_similarity,
+                sub.content,
+                best.content,
             )
-            indices_to_remove.add(next_idx)
+            continue
+        yield sub
+
+    log.info("Merged %d subtitle(s) into similar ones", merged)
+
 
-    offset = 0
-    for idx in indices_to_remove:
-        del orig_subs[idx - offset]
-        offset += 1
+def _normalise(content):
+    content = TAG_REGEX.sub("", content)
+    return NON_WORD_REGEX.sub(" ", content).strip().casefold()
 
 
-def set_args():
+def _shingles(content):
+    """The set of :py:data:`SHINGLE_SIZE` character pieces of ``content``."""
+    normalised = _normalise(content)
+    if not normalised:
+        # Content like "♪" or "<i></i>" has nothing left to compare, so only
+        # content exactly the same is similar. Normalised content is never all
+        # punctuation, so this can't be one of its pieces.
+        return frozenset([content])
+    if len(normalised) <= SHINGLE_SIZE:
+        return frozenset([normalised])
+    return frozenset(
+        normalised[i : i + SHINGLE_SIZE]
+        for i in range(len(normalised) - SHINGLE_SIZE + 1)
+    )
+
+
+@functools.lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def _minhash(shingles):
+    # Duplicates are usually close together, so recent signatures are kept
+    return tuple(min(column) for column in zip(*map(_shingle_hashes, shingles)))
+
+
+@functools.lru_cache(maxsize=SHINGLE_CACHE_SIZE)
+def _shingle_hashes(shingle):
+    digest = hashlib.shake_128(shingle.encode("utf-8")).digest(_SHINGLE_HASHES.size)
+    return _SHINGLE_HASHES.unpack(digest)
+
+
+def _jaccard(first, second):
+    common = len(first & second)
+    return common / (len(first) + len(second) - common)
+
+
+def _lsh_bands(similarity):
+    """
+    Choose how to split MinHash signatures into bands. More rows in each band
+    means fewer pairs to compare, but also more similar pairs missed, so use
+    the most rows that still find pairs at ``similarity`` with a probability
+    of at least :py:data:`LSH_RECALL`.
+
+    :returns: The amount of bands and rows in each band
+    :rtype: tuple
+    """
+    best = (MINHASH_PERMUTATIONS, 1)
+    for rows in range(1, MINHASH_PERMUTATIONS + 1):
+        if MINHASH_PERMUTATIONS % rows:
+            continue
+        bands = MINHASH_PERMUTATIONS // rows
+        if 1 - (1 - similarity**rows) ** bands >= LSH_RECALL:
+            best = (bands, rows)
+    return best
+
+
+def _similarity(arg):
+    similarity = float(arg)
+    if not 0 < similarity <= 1:
+        raise argparse.ArgumentTypeError("must be more than 0 and at most 1")
+    return similarity
+
+
+def set_args(argv=None):
     examples = {
         "Remove duplicated subtitles within 5 seconds of each other": "srt deduplicate -i duplicated.srt",
         "Remove duplicated subtitles within 500 milliseconds of each other": "srt deduplicate -t 500 -i duplicated.srt",
         "Remove duplicated subtitles regardless of temporal proximity": "srt deduplicate -t 0 -i duplicated.srt",
+        "Remove subtitles which are 90% similar, like OCR duplicates": "srt deduplicate --similarity 0.9 -i duplicated.srt",
     }
     parser = _cli.basic_parser(
         description=__doc__,
@@ -73,19 +258,36 @@ def set_args():
         "within of another to be considered a duplicate "
         "(default: 5000ms)",
     )
+    parser.add_argument(
+        "--similarity",
+        metavar="FRACTION",
+        type=_similarity,
+        help="remove subtitles whose content is at least this similar, from 0 "
+        "to 1, ignoring case, punctuation and tags (default: only exact "
+        "duplicates)",
+    )
+
+    return parser.parse_args(argv)
 
-    return parser.parse_args()
+
+def process(subs, args):
+    # Sorting is stable, so the first of duplicates starting at the same time
+    # is kept
+    return deduplicate(
+        sorted(subs, key=operator.attrgetter("start")), args.ms, args.similarity
+    )
 
 
 def main():
     args = set_args()
     logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
 
-    subs = list(args.input)
-    deduplicate(subs, args.ms)
-    output = _cli.compose_suggest_on_fail(subs, strict=args.strict)
-    args.output.write(output)
+    subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -8,6 +8,8 @@ import srt
 from types import GeneratorType
 from . import _cli
 from . import _utils
+from . import split
+from ..index import SubtitleIndex
 
 
 log = logging.getLogger(__name__)
@@ -24,21 +26,33 @@ def find_by_timestamp(
     When timestamp one > timestamp two, subtitles up to timestamp two and
     subtitles after timestamp one will be found.
 
-    :param subs: :py:class:`Subtitle` objects
+    To find subtitles in the same file many times, pass a
+    :py:class:`srt.SubtitleIndex` of them instead, and only the subtitles
+    near the timestamps are looked at when timestamp one < timestamp two. The
+    result is the same as for the indexed subtitles in order.
+
+    :param subs: :py:class:`Subtitle` objects, or a
+                 :py:class:`srt.SubtitleIndex` of them
     :param datetime.timedelta timestamp_one: The timestamp to find from.
     :param datetime.timedelta timestamp_two: The timestamp to find to.
     :param boolean adjust: Whether to adjust the timestamps of found subtitles.
     :rtype: :term:`generator` of :py:class:`Subtitle` objects
     """
+    if isinstance(subs, SubtitleIndex):
+        subs = _indexed_candidates(subs, timestamp_one, timestamp_two)
+
     # ensure subs is iterable
     subs = (x for x in subs) if not isinstance(subs, GeneratorType) else subs
 
     # Split the subtitle at the start and end of the block(s).
-    subs = srt.tools.split.split(subs, timestamp_one)
-    subs = srt.tools.split.split(subs, timestamp_two)
+    subs = split.split(subs, timestamp_one)
+    subs = split.split(subs, timestamp_two)
 
     # edge cases
     subtitle = _utils.tryNext(subs)
+    if subtitle is not None:
+        timestamp_one = _utils.timestamp_like(timestamp_one, subtitle.start)
+        timestamp_two = _utils.timestamp_like(timestamp_two, subtitle.start)
     sequential = timestamp_one < timestamp_two
     if subtitle is None or (sequential and timestamp_two <= subtitle.start):
         return
@@ -46,6 +60,7 @@ def find_by_timestamp(
     # Find the subtitles using a generator.
     idx = 1
     adjust_time = timestamp_one if adjust else datetime.timedelta(0)
+    adjust_time = _utils.timestamp_like(adjust_time, subtitle.start)
     while subtitle is not None:
         start = subtitle.start
 
@@ -65,8 +80,26 @@ def find_by_timestamp(
         subtitle = _utils.tryNext(subs)
 
 
+def _indexed_candidates(index, timestamp_one, timestamp_two):
+    """
+    The subtitles from a :py:class:`srt.SubtitleIndex` which
+    :py:func:`find_by_timestamp` could find anything in. Those it couldn't
+    don't change the order of what it finds in the rest, so leaving them out
+    gives the same result.
+    """
+    if not index:
+        return []
+    example = index.subtitles[0].start
+    timestamp_one = _utils.timestamp_like(timestamp_one, example)
+    timestamp_two = _utils.timestamp_like(timestamp_two, example)
+    if timestamp_one < timestamp_two:
+        return index.overlapping(timestamp_one, timestamp_two)
+    # Otherwise most subtitles are found anyway
+    return index.subtitles
+
+
 # Command Line Interface
-def set_args():
+def set_args(argv=None):
     examples = {
         "Find subtitles from :05 - :08": "srt find -i example.srt -s 00:00:5,00 -e 00:00:8,00",
         "Find subtitles from :00 - :05 and :08 onwards": "srt find -i example.srt -s 00:00:8,00 -e 00:00:5,00",
@@ -99,16 +132,22 @@ def set_args():
         action="store_true",
         help="Adjust the timestamps of subtitles by placing the first found subtitle at 00:00.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def process(subs, args):
+    return find_by_timestamp(subs, args.start, args.end, args.adjust)
 
 
 def main():
     args = set_args()
     logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
-    found_subs = find_by_timestamp(args.input, args.start, args.end, args.adjust)
-    output = _cli.compose_suggest_on_fail(found_subs, strict=args.strict)
-    args.output.write(output)
+    found_subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(found_subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
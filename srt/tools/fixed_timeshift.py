@@ -4,6 +4,7 @@
 
 import datetime
 import logging
+import srt
 from . import _cli
 
 log = logging.getLogger(__name__)
@@ -18,13 +19,18 @@ def timeshift(subtitles, seconds_to_shift):
     :rtype: :term:`generator` of :py:class:`Subtitle` objects
     """
     td_to_shift = datetime.timedelta(seconds=seconds_to_shift)
+    ms_to_shift = srt.timedelta_to_milliseconds(td_to_shift)
     for subtitle in subtitles:
-        subtitle.start += td_to_shift
-        subtitle.end += td_to_shift
+        if isinstance(subtitle.start, datetime.timedelta):
+            to_shift = td_to_shift
+        else:
+            to_shift = ms_to_shift
+        subtitle.start += to_shift
+        subtitle.end += to_shift
         yield subtitle
 
 
-def set_args():
+def set_args(argv=None):
     examples = {
         "Make all subtitles 5 seconds later": "srt fixed_timeshift -s 5",
         "Make all subtitles 5 seconds earlier": "srt fixed_timeshift --seconds -5",
@@ -38,16 +44,22 @@ def set_args():
         required=True,
         help="The amount of seconds to shift subtitiles by.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def process(subs, args):
+    return timeshift(subs, args.seconds)
 
 
 def main():
     args = set_args()
     logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
-    corrected_subs = timeshift(args.input, args.seconds)
-    output = _cli.compose_suggest_on_fail(corrected_subs, strict=args.strict)
-    args.output.write(output)
+    corrected_subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(corrected_subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
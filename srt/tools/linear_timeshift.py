@@ -22,11 +22,15 @@ def _calc_correction(to_start, to_end, from_start, from_end):
 
 def _correct_timedelta(bad_delta, angular, linear):
     bad_msecs = _timedelta_to_milliseconds(bad_delta)
-    good_msecs = round(bad_msecs * angular + linear)
+    good_msecs = _correct_milliseconds(bad_msecs, angular, linear)
     good_delta = datetime.timedelta(milliseconds=good_msecs)
     return good_delta
 
 
+def _correct_milliseconds(bad_msecs, angular, linear):
+    return round(bad_msecs * angular + linear)
+
+
 def timeshift(subtitles, angular, linear):
     """
     Performs a linear timeshift on given subtitles.
@@ -37,19 +41,21 @@ def timeshift(subtitles, angular, linear):
     :rtype: :term:`generator` of :py:class:`Subtitle` objects
     """
     for subtitle in subtitles:
-        subtitle.start = _correct_timedelta(subtitle.start, angular, linear)
-        subtitle.end = _correct_timedelta(subtitle.end, angular, linear)
+        if isinstance(subtitle.start, datetime.timedelta):
+            correct = _correct_timedelta
+        else:
+            correct = _correct_milliseconds
+        subtitle.start = correct(subtitle.start, angular, linear)
+        subtitle.end = correct(subtitle.end, angular, linear)
         yield subtitle
 
 
-def set_args():
+def set_args(argv=None):
     def _srt_timestamp_to_milliseconds(parser, arg):
         try:
-            delta = srt.srt_timestamp_to_timedelta(arg)
+            return srt.srt_timestamp_to_milliseconds(arg)
         except ValueError:
             parser.error("not a valid SRT timestamp: %s" % arg)
-        else:
-            return _timedelta_to_milliseconds(delta)
 
     examples = {
         "Stretch out a subtitle so that second 1 is 2, 2 is 4, etc": "srt linear_timeshift --f1 00:00:01,000 --t1 00:00:01,000 --f2 00:00:02,000 --t2 00:00:03,000"
@@ -84,19 +90,25 @@ def set_args():
         required=True,
         help="The second synchronised timestamp.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main():
-    args = set_args()
-    logging.basicConfig(level=args.log_level)
+def process(subs, args):
     angular, linear = _calc_correction(
         args.to_start, args.to_end, args.from_start, args.from_end
     )
+    return timeshift(subs, angular, linear)
+
+
+def main():
+    args = set_args()
+    logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
-    corrected_subs = timeshift(args.input, angular, linear)
-    output = _cli.compose_suggest_on_fail(corrected_subs, strict=args.strict)
-    args.output.write(output)
+    corrected_subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(corrected_subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -2,12 +2,17 @@
 
 """Filter and/or process subtitles' content that match a particular pattern."""
 
+import functools
 import importlib
 import logging
 from . import _cli
 
 log = logging.getLogger(__name__)
 
+# How many match and process functions to keep compiled, for processes like srt
+# serve which run many commands
+COMPILED_FUNCTION_CACHE_SIZE = 128
+
 
 def _true(param):
     """Always returns true for matching functionality."""
@@ -36,11 +41,9 @@ def match(subtitles, imports, func_match, func_process, lines):
         real_import = importlib.import_module(import_name)
         globals()[import_name] = real_import
 
-    # fmt: off
     # Evaluate the each function
-    match_func = eval(func_match) if func_match else _true # nosec pylint: disable-msg=eval-used
-    process_func = eval(func_process) if func_process else _pass # nosec pylint: disable-msg=eval-used
-    # fmt: on
+    match_func = _compile(func_match) if func_match else _true
+    process_func = _compile(func_process) if func_process else _pass
 
     # Match and process each subtitle (or subtitle-line).
     for subtitle in subtitles:
@@ -59,7 +62,15 @@ def match(subtitles, imports, func_match, func_process, lines):
         yield subtitle
 
 
-def set_args():
+@functools.lru_cache(maxsize=COMPILED_FUNCTION_CACHE_SIZE)
+def _compile(func_source):
+    """Evaluates a function's source, once for each distinct source."""
+    # Names are looked up in this module's globals when the function is
+    # called, so imports added later are still seen
+    return eval(func_source)  # nosec pylint: disable-msg=eval-used
+
+
+def set_args(argv=None):
     examples = {
         "Only include Chinese lines": "srt match -m hanzidentifier -fm hanzidentifier.has_chinese",
         "Exclude all lines which only contain numbers": "srt match -fm 'lambda x: not x.isdigit()'",
@@ -81,16 +92,22 @@ def set_args():
         help="Match the content of each subtitle-line, not each subtitle-content.",
         action="store_true",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def process(subs, args):
+    return match(subs, args.module, args.match, args.process, args.lines)
 
 
 def main():
     args = set_args()
     logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
-    matched_subs = match(args.input, args.module, args.match, args.process, args.lines)
-    output = _cli.compose_suggest_on_fail(matched_subs, strict=args.strict)
-    args.output.write(output)
+    matched_subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(matched_subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -2,10 +2,14 @@
 
 """Merge multiple subtitles with similar start/end times into one."""
 
+import collections
 import datetime
+import heapq
+import itertools
 import operator
 import logging
 from . import _cli
+from . import _utils
 
 log = logging.getLogger(__name__)
 
@@ -13,39 +17,135 @@ TOP = r"{\an8}"
 BOTTOM = r"{\an2}"
 
 
-def mux(subs, acceptable_diff, attr, width):
+class _TimeMatcher:
+    """
+    Sweeps over one of the times of subtitles in order, grouping each time
+    with the earliest one before it that's less than ``acceptable_diff``
+    away, and moving it to that time.
+    """
+
+    def __init__(self, attr, acceptable_diff):
+        self.attr = attr
+        self.acceptable_diff = acceptable_diff
+        self.leader_index = None
+        self.leader_time = None
+
+    def add(self, sub):
+        comp = getattr(sub, self.attr)
+        if (
+            self.leader_time is not None
+            and self.leader_time + self.acceptable_diff > comp
+        ):
+            log.debug(
+                "Merging %d's %s time into %d", sub.index, self.attr, self.leader_index
+            )
+            setattr(sub, self.attr, self.leader_time)
+        else:
+            self.leader_index = sub.index
+            self.leader_time = comp
+
+
+def mux(subs, acceptable_diff, attr, width=None):
     """
     Merges subs with similar start/end times together (in-place).
     This prevents subtitles from jumping around the screen.
 
+    Times are grouped in one pass in order: each group starts at the earliest
+    time not in a group yet, and takes every later time within
+    ``acceptable_diff`` of it, however many subtitles overlap.
+
     :param subs: :py:class:`Subtitle` objects
     :param datetime.timedelta acceptable_diff: The amount of milliseconds
                                     a subtitle start time must be to shift.
-    :param str attr:
-    :param int width: The amount of subtitles to consider for time matching at once.
-    :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    :param str attr: The time to merge, "start" or "end"
+    :param int width: Unused, since every subtitle is considered
     """
     sorted_subs = sorted(subs, key=operator.attrgetter(attr))
+    if sorted_subs:
+        acceptable_diff = _utils.timestamp_like(
+            acceptable_diff, getattr(sorted_subs[0], attr)
+        )
+
+    matcher = _TimeMatcher(attr, acceptable_diff)
+    for sub in sorted_subs:
+        matcher.add(sub)
+
+
+def match_times(subs, acceptable_diff):
+    """
+    Merges both the start and end times of subs which are close together, in
+    the same way as :py:func:`mux`, but in a single pass over a stream.
 
-    for subs in _cli.sliding_window(sorted_subs, width=width):
-        current_sub = subs[0]
-        future_subs = subs[1:]
-        current_comp = getattr(current_sub, attr)
-
-        for future_sub in future_subs:
-            future_comp = getattr(future_sub, attr)
-            if current_comp + acceptable_diff > future_comp:
-                log.debug(
-                    "Merging %d's %s time into %d",
-                    future_sub.index,
-                    attr,
-                    current_sub.index,
-                )
-                setattr(future_sub, attr, current_comp)
-            else:
-                # Since these are sorted, and this one didn't match, we can be
-                # sure future ones won't match either.
-                break
+    ``subs`` must be in order of start time. Ends are matched in order as
+    well, once no subtitle still to come could end earlier, so only the
+    subtitles which overlap are held on to at once. That relies on every
+    subtitle ending at or after its start, so use :py:func:`mux` for
+    subtitles which might not.
+
+    :param subs: :py:class:`Subtitle` objects, in order of start time
+    :param datetime.timedelta acceptable_diff: The amount of milliseconds
+                                    a subtitle time must be to shift.
+    :rtype: :term:`generator` of the same :py:class:`Subtitle` objects, in
+            the same order
+    :raises ValueError: If a subtitle ends before a time which has already
+                        been matched, which can only happen when it ends
+                        before it starts
+    """
+    subs = iter(subs)
+    first_sub = _utils.tryNext(subs)
+    if first_sub is None:
+        return
+    acceptable_diff = _utils.timestamp_like(acceptable_diff, first_sub.start)
+
+    start_matcher = _TimeMatcher("start", acceptable_diff)
+    end_matcher = _TimeMatcher("end", acceptable_diff)
+    # Subtitles which have been seen, in order, and a heap of the ends they're
+    # still waiting on
+    pending = collections.deque()
+    ends = []
+    ended = set()
+    last_end = None
+
+    for order, sub in enumerate(itertools.chain([first_sub], subs)):
+        # Everything from here on starts at or after this, and so ends after
+        # anything ending before it, unless it ends before it starts
+        while ends and ends[0][0] < sub.start:
+            last_end, ended_order, ended_sub = heapq.heappop(ends)
+            end_matcher.add(ended_sub)
+            ended.add(ended_order)
+
+        if last_end is not None and sub.end < last_end:
+            raise ValueError(
+                "Subtitle {} ends before it starts, and before a time which "
+                "has already been matched".format(sub.index)
+            )
+
+        start_matcher.add(sub)
+        heapq.heappush(ends, (sub.end, order, sub))
+        pending.append((order, sub))
+
+        while pending and pending[0][0] in ended:
+            ended_order, ended_sub = pending.popleft()
+            ended.remove(ended_order)
+            yield ended_sub
+
+    while ends:
+        _, _, ended_sub = heapq.heappop(ends)
+        end_matcher.add(ended_sub)
+    for _, ended_sub in pending:
+        yield ended_sub
+
+
+def _match_all_times(subs, acceptable_diff):
+    """
+    Merge the start and end times of a list of subs in order of start time,
+    in place, in a single pass unless some of them end before they start.
+    """
+    if any(sub.end < sub.start for sub in subs):
+        mux(subs, acceptable_diff, "start")
+        mux(subs, acceptable_diff, "end")
+    else:
+        collections.deque(match_times(subs, acceptable_diff), maxlen=0)
 
 
 def set_args():
@@ -64,9 +164,10 @@ def set_args():
     parser.add_argument(
         "--width",
         "-w",
-        default=5,
         type=int,
-        help="The amount of subs to consider time matching at once (default: %(default)s)",
+        help="Has no effect, and is only accepted so that existing command "
+        "lines still work. Every overlapping sub is considered when time "
+        "matching.",
     )
     parser.add_argument(
         "--top-and-bottom",
@@ -88,6 +189,8 @@ def main():
     logging.basicConfig(level=args.log_level)
 
     _cli.set_basic_args(args)
+    if args.width is not None:
+        log.warning("--width has no effect, and will be removed")
 
     muxed_subs = []
     for idx, subs in enumerate(args.input):
@@ -100,11 +203,15 @@ def main():
             muxed_subs.append(sub)
 
     if args.no_time_matching or not args.top_and_bottom:
-        mux(muxed_subs, args.ms, "start", args.width)
-        mux(muxed_subs, args.ms, "end", args.width)
-
-    output = _cli.compose_suggest_on_fail(muxed_subs, strict=args.strict)
-    args.output.write(output)
+        # Matched in place, so subs which end up with the same times are still
+        # composed in the order of their files. Each file is usually in order
+        # already, and sorted() merges runs which are in order, so this is a
+        # k-way merge of the files (faster than heapq.merge, see
+        # benchmarks/bench_mux.py)
+        by_start = sorted(muxed_subs, key=operator.attrgetter("start"))
+        _match_all_times(by_start, args.ms)
+
+    _cli.compose_suggest_on_fail(muxed_subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -23,16 +23,27 @@ def normalize(subs, strict):
     return _cli.compose_suggest_on_fail(subs, strict)
 
 
-def main():
+def set_args(argv=None):
     examples = {"Normalise a subtitle": "srt normalize -i bad.srt -o good.srt"}
 
-    args = _cli.basic_parser(
+    return _cli.basic_parser(
         description=__doc__, examples=examples, hide_no_strict=True
-    ).parse_args()
+    ).parse_args(argv)
+
+
+def process(subs, args):
+    # Composing is all that normalising takes
+    return subs
+
+
+def main():
+    args = set_args()
     logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
-    output = normalize(args.input, strict=args.strict)
-    args.output.write(output)
+    _cli.compose_suggest_on_fail(args.input, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
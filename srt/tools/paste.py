@@ -8,6 +8,7 @@ import srt
 from types import GeneratorType
 from . import _cli
 from . import _utils
+from . import find
 
 
 log = logging.getLogger(__name__)
@@ -24,24 +25,35 @@ def paste(subs, copy, timestamp, space=datetime.timedelta(0), block=False):
                           and adjust the timestamps of subsequent subtitles.
     :rtype: :term:`generator` of :py:class:`Subtitle` objects
     """
-    # In the case of a block paste, determine the block time(span).
+    # Ensure each block is iterable
+    subs = (x for x in subs) if not isinstance(subs, GeneratorType) else subs
+    copy = (x for x in copy) if not isinstance(copy, GeneratorType) else copy
+
+    subtitle = _utils.tryNext(subs)
+    copied_subtitle = _utils.tryNext(copy)
+
+    # Use the same time representation as the subtitles.
     block_time = datetime.timedelta(0)
+    first = subtitle if subtitle is not None else copied_subtitle
+    if first is not None:
+        timestamp = _utils.timestamp_like(timestamp, first.start)
+        space = _utils.timestamp_like(space, first.start)
+        block_time = _utils.timestamp_like(block_time, first.start)
+
+    # In the case of a block paste, determine the block time(span).
     if block:
         block_copy = list(copy)
-        for subtitle in block_copy:
-            if subtitle.end > block_time:
-                block_time = subtitle.end
+        if copied_subtitle is not None:
+            block_copy.insert(0, copied_subtitle)
+        for block_subtitle in block_copy:
+            if block_subtitle.end > block_time:
+                block_time = block_subtitle.end
         block_time += space
         copy = (x for x in block_copy)  # regenerate copy
-
-    # Ensure each block is iterable
-    subs = (x for x in subs) if not isinstance(subs, GeneratorType) else subs
-    copy = (x for x in copy) if not isinstance(copy, GeneratorType) else copy
+        copied_subtitle = _utils.tryNext(copy)
 
     # Perform the paste operation.
     idx = 1
-    subtitle = _utils.tryNext(subs)
-    copied_subtitle = _utils.tryNext(copy)
     copied_time = timestamp + space
     while subtitle is not None or copied_subtitle is not None:
         if subtitle is None:
@@ -98,7 +110,7 @@ def paste(subs, copy, timestamp, space=datetime.timedelta(0), block=False):
 
 
 # Command Line Interface
-def set_args():
+def set_args(argv=None):
     examples = {
         "Paste subtitles from :05 - :08 at :10": "srt paste -i example.srt --t1 00:00:5,00 --t2 00:00:8,00 -p 00:00:10,00",
         "Paste subtitles from :05 - :08 at :10 with :01 space beforehand": "srt paste -i example.srt --t1 00:00:5,00 --t2 00:00:8,00 -p 00:00:10,00 -s 00:00:01,00",
@@ -150,20 +162,24 @@ def set_args():
         action="store_true",
         help="Start the copied subtitle block from 00:00.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def process(subs, args):
+    origin_subs = list(subs)
+    copy_subs = find.find_by_timestamp(origin_subs, args.t1, args.t2, args.zero)
+    return paste(origin_subs, copy_subs, args.paste, args.space, args.block)
 
 
 def main():
     args = set_args()
     logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
-    origin_subs = list(args.input)
-    copy_subs = srt.tools.find.find_by_timestamp(
-        origin_subs, args.t1, args.t2, args.zero
-    )
-    paste_subs = paste(origin_subs, copy_subs, args.paste, args.space, args.block)
-    output = _cli.compose_suggest_on_fail(paste_subs, strict=args.strict)
-    args.output.write(output)
+    paste_subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(paste_subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
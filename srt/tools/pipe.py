@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+
+"""Run several tools one after another, only parsing and composing once."""
+
+import importlib
+import logging
+import shlex
+import srt
+from . import _cli, _srt
+
+log = logging.getLogger(__name__)
+
+
+def pipe(subs, stages, strict=True):
+    """
+    Runs subtitles through several tools, as if each tool's output was piped
+    into the next one's input on the command line. Between stages, the
+    subtitles are sorted, reindexed and the ones which aren't useful are
+    skipped, and in strict mode their content is made legal, like when they're
+    composed, but they are only composed once, by the caller, at the end.
+
+    Each stage is a tool name followed by its arguments, either as a string
+    like ``"fixed_timeshift -s 5"`` or as a list. Options for input, output
+    and parsing can only be given to the pipe itself.
+
+    :param subs: :py:class:`Subtitle` objects
+    :param stages: The tools to run, in order
+    :type stages: iterable of str or list
+    :param bool strict: Whether to make content legal between stages, see
+                        :py:func:`srt.compose`
+    :rtype: :term:`iterator` of :py:class:`Subtitle` objects
+    :raises ValueError: If a stage names a tool which doesn't exist, which
+                        can't be used in a pipe, or which is given an input or
+                        output of its own
+    :raises SystemExit: If a stage's arguments are invalid, as on the command
+                        line
+    """
+    return _run_stages(subs, [_load_stage(stage) for stage in stages], strict)
+
+
+def _run_stages(subs, stages, strict):
+    """
+    Chain loaded stages of :py:func:`pipe` onto ``subs``.
+
+    :param subs: :py:class:`Subtitle` objects
+    :param list stages: The tool module and parsed arguments of each stage
+    :param bool strict: Whether to make content legal between stages
+    :rtype: :term:`iterator` of :py:class:`Subtitle` objects
+    """
+    for stage_num, (module, args) in enumerate(stages):
+        if stage_num:
+            subs = srt.sort_and_reindex(subs, in_place=True)
+            if strict:
+                subs = _make_legal(subs)
+        subs = module.process(subs, args)
+    return subs
+
+
+def _make_legal(subs):
+    """
+    Make each subtitle's content legal, as composing it in strict mode would.
+
+    :param subs: :py:class:`Subtitle` objects
+    :rtype: :term:`generator` of :py:class:`Subtitle` objects
+    """
+    for sub in subs:
+        sub.content = srt.make_legal_content(sub.content)
+        yield sub
+
+
+def _load_stage(stage):
+    """
+    Find the tool for a stage of :py:func:`pipe`, and parse its arguments.
+
+    :returns: The tool's module and its parsed arguments
+    :rtype: tuple
+    """
+    if isinstance(stage, str):
+        stage = shlex.split(stage)
+    command, *argv = stage
+
+    if command not in _srt.commands():
+        raise ValueError("Unknown command: {!r}".format(command))
+    module = importlib.import_module("srt.tools." + command)
+    if not hasattr(module, "process"):
+        raise ValueError("{} can't be used in a pipe".format(command))
+
+    args = module.set_args(argv)
+    if (
+        args.input is not _cli.DASH_STREAM_MAP["input"]
+        or args.output is not _cli.DASH_STREAM_MAP["output"]
+        or args.inplace
+        or args.recursive
+    ):
+        raise ValueError(
+            "{} can't have its own input or output in a pipe".format(command)
+        )
+    return module, args
+
+
+def set_args(argv=None):
+    examples = {
+        "Shift subtitles 5 seconds later and keep the first minute": 'srt pipe -i example.srt "fixed_timeshift -s 5" "find -e 00:01:00,000"',
+        "Drop lines of only numbers and split at :05": """srt pipe -i example.srt "match --fm 'lambda x: not x.isdigit()'" "split -t 00:00:05,000\"""",
+    }
+    parser = _cli.basic_parser(description=__doc__, examples=examples)
+    parser.add_argument(
+        "stages",
+        metavar="STAGE",
+        nargs="+",
+        help='A tool and its arguments, like "fixed_timeshift -s 5".',
+    )
+    args = parser.parse_args(argv)
+    try:
+        args.stages = [_load_stage(stage) for stage in args.stages]
+    except ValueError as thrown_exc:
+        parser.error(str(thrown_exc))
+    return args
+
+
+def process(subs, args):
+    return _run_stages(subs, args.stages, args.strict)
+
+
+def main():
+    args = set_args()
+    logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
+    _cli.set_basic_args(args)
+    piped_subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(piped_subs, strict=args.strict, output=args.output)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
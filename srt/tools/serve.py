@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+
+"""Keep the tools loaded in a pool of processes, to run command lines sent by
+srt --connect without starting Python for each one."""
+
+import argparse
+import concurrent.futures
+import contextlib
+import importlib
+import io
+import logging
+import multiprocessing
+import os
+import socket
+import socketserver
+import struct
+import sys
+import traceback
+from . import _cli, _connect, _srt
+
+log = logging.getLogger(__name__)
+
+
+# ThreadingUnixStreamServer only exists where there are Unix sockets
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        """
+        A server for the protocol in :py:mod:`srt.tools._connect`. Each
+        connection is handled in its own thread, but the commands are run in
+        a pool of ``jobs`` processes, which keep the tools imported between
+        requests. This is only available where there are Unix sockets.
+
+        :param str socket_path: The path of the Unix socket to listen on
+        :param int jobs: How many commands to run at once (default: the amount
+                         of CPUs)
+        """
+
+        daemon_threads = True
+
+        def __init__(self, socket_path, jobs=None):
+            _remove_stale_socket(socket_path)
+            super().__init__(socket_path, _RequestHandler)
+            jobs = jobs or os.cpu_count() or 1
+            if sys.version_info >= (3, 7):
+                # Spawned rather than forked, since forking copies whatever the
+                # connection threads are in the middle of
+                self.pool = concurrent.futures.ProcessPoolExecutor(
+                    jobs,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_up,
+                )
+            else:
+                # Neither can be chosen before Python 3.7, so start the workers
+                # now, before there are any connection threads for forking to
+                # copy. The first job starts all of them.
+                self.pool = concurrent.futures.ProcessPoolExecutor(jobs)
+                for _ in range(jobs):
+                    self.pool.submit(_warm_up)
+
+        def server_bind(self):
+            super().server_bind()
+            # Commands run as this user, so only let this user connect. This
+            # is done before listening, so nobody can connect before it.
+            os.chmod(self.server_address, 0o600)
+
+        def server_close(self):
+            super().server_close()
+            self.pool.shutdown()
+            os.remove(self.server_address)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        if not _is_same_user(self.request):
+            log.warning("Refused a connection from another user")
+            return
+
+        pool = self.server.pool
+        request = _connect.receive_json(self.request)
+        command, argv, cwd = request["command"], request["argv"], request["cwd"]
+
+        if command not in _srt.commands() or command == "serve":
+            message = 'Unknown command: "{}"\n'.format(command)
+            self._respond(1, b"", message.encode("utf-8"))
+            return
+
+        stdin = None
+        if pool.submit(_reads_stdin, command, argv, cwd).result():
+            _connect.send_json(self.request, {"stdin": True})
+            stdin = _connect.receive_message(self.request)
+
+        self._respond(*pool.submit(_run, command, argv, cwd, stdin).result())
+
+    def _respond(self, status, stdout, stderr):
+        _connect.send_json(self.request, {"status": status})
+        _connect.send_message(self.request, stdout)
+        _connect.send_message(self.request, stderr)
+
+
+def _remove_stale_socket(socket_path):
+    """
+    Remove a socket left behind by a server which is no longer running.
+
+    :raises OSError: If a server is still listening on it
+    """
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except ConnectionRefusedError:
+            os.remove(socket_path)
+            return
+    raise OSError("Already serving on {}".format(socket_path))
+
+
+def _is_same_user(sock):
+    """
+    Check that the peer of a connected Unix socket runs as this user. Where
+    this can't be found out, the socket's permissions are relied on alone.
+
+    :rtype: bool
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    credentials = struct.Struct("3i")
+    _, uid, _ = credentials.unpack(
+        sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, credentials.size)
+    )
+    return uid == os.getuid()
+
+
+def _warm_up():
+    # Import every tool up front, so the first requests don't have to
+    for command in _srt.commands():
+        importlib.import_module("srt.tools." + command)
+
+
+@contextlib.contextmanager
+def _as_command(command, argv, cwd, stdin, stdout, stderr):
+    """
+    Make the tools behave as if ``command`` was run from the command line in
+    ``cwd``, with these binary streams as stdin and stdout, and this text
+    stream as stderr. This changes state for the whole process, which only
+    runs one command at a time.
+    """
+    saved = (
+        os.getcwd(),
+        sys.argv,
+        _cli.PROG_NAME,
+        _cli.STDIN_BYTESTREAM,
+        _cli.STDOUT_BYTESTREAM,
+        dict(_cli.DASH_STREAM_MAP),
+    )
+    # The tools configure logging themselves, so drop what the last command
+    # set up, which would log to the last command's stderr
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
+
+    os.chdir(cwd)
+    sys.argv = [command] + argv
+    _cli.PROG_NAME = command
+    _cli.STDIN_BYTESTREAM = _cli.DASH_STREAM_MAP["input"] = stdin
+    _cli.STDOUT_BYTESTREAM = _cli.DASH_STREAM_MAP["output"] = stdout
+    try:
+        with contextlib.redirect_stderr(stderr):
+            yield
+    finally:
+        (
+            saved_cwd,
+            sys.argv,
+            _cli.PROG_NAME,
+            _cli.STDIN_BYTESTREAM,
+            _cli.STDOUT_BYTESTREAM,
+            saved_dash_stream_map,
+        ) = saved
+        _cli.DASH_STREAM_MAP.update(saved_dash_stream_map)
+        os.chdir(saved_cwd)
+
+
+def _reads_stdin(command, argv, cwd):
+    """
+    Find out whether a command line reads stdin, so the client can be asked
+    for it before the command is run.
+
+    :rtype: bool
+    """
+    stdin = io.BytesIO()
+    module = importlib.import_module("srt.tools." + command)
+    with _as_command(command, argv, cwd, stdin, io.BytesIO(), io.StringIO()):
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                args = module.set_args(argv)
+            except SystemExit:
+                # Running the command will report the problem
+                return False
+
+    if getattr(args, "recursive", None):
+        return False
+    inputs = args.input if isinstance(args.input, list) else [args.input]
+    return any(stream is stdin for stream in inputs)
+
+
+def _run(command, argv, cwd, stdin):
+    """
+    Run a command line in this process.
+
+    :returns: The exit status, stdout and stderr
+    :rtype: tuple
+    """
+    stdout = io.BytesIO()
+    text_stdout = io.StringIO()
+    stderr = io.StringIO()
+    status = 0
+    module = importlib.import_module("srt.tools." + command)
+
+    with _as_command(command, argv, cwd, io.BytesIO(stdin or b""), stdout, stderr):
+        with contextlib.redirect_stdout(text_stdout):
+            try:
+                module.main()
+            except SystemExit as thrown_exc:
+                status = _exit_status(thrown_exc.code, stderr)
+            except Exception:  # pylint: disable=broad-except
+                traceback.print_exc()
+                status = 1
+
+    return (
+        status,
+        text_stdout.getvalue().encode("utf-8") + stdout.getvalue(),
+        stderr.getvalue().encode("utf-8"),
+    )
+
+
+def _exit_status(code, stderr):
+    # The same exit status as sys.exit(code) would give
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+def set_args(argv=None):
+    examples = {
+        "Serve on a socket": "srt serve /tmp/srt.sock",
+        "Run a command through it": "srt --connect /tmp/srt.sock fixed_timeshift -s 5 -i example.srt",
+    }
+    parser = argparse.ArgumentParser(
+        prog=_cli.PROG_NAME,
+        description=__doc__,
+        epilog=_cli.examples_epilog(examples),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("socket", help="The path of the Unix socket to listen on.")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        metavar="N",
+        type=int,
+        help="How many commands to run at once (default: the amount of CPUs).",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_const",
+        dest="log_level",
+        const=logging.DEBUG,
+        default=logging.INFO,
+        help="Enable debug logging.",
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    args = set_args()
+    logging.basicConfig(level=args.log_level)
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        log.critical("srt serve requires Unix sockets, which aren't available here")
+        sys.exit(1)
+    with Server(args.socket, args.jobs) as server:
+        log.info("Serving on %s", args.socket)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -27,6 +27,8 @@ def split(subs, timestamp):
     added_split_subs = False
     idx = 1
     subtitle = _utils.tryNext(subs)
+    if subtitle is not None:
+        timestamp = _utils.timestamp_like(timestamp, subtitle.start)
     split_subs = []
     while subtitle is not None:
         start = subtitle.start
@@ -58,7 +60,7 @@ def split(subs, timestamp):
 
 
 # Command Line Interface
-def set_args():
+def set_args(argv=None):
     examples = {
         "Split subtitles at :05": "srt split -i example.srt -t 00:00:5,00",
     }
@@ -72,16 +74,22 @@ def set_args():
         nargs="?",
         help="The timestamp to split subtitles at.",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def process(subs, args):
+    return split(subs, args.timestamp)
 
 
 def main():
     args = set_args()
     logging.basicConfig(level=args.log_level)
+    if args.recursive:
+        _cli.run_batch(__spec__.name, args)
+        return
     _cli.set_basic_args(args)
-    split_subs = split(args.input, args.timestamp)
-    output = _cli.compose_suggest_on_fail(split_subs, strict=args.strict)
-    args.output.write(output)
+    split_subs = process(args.input, args)
+    _cli.compose_suggest_on_fail(split_subs, strict=args.strict, output=args.output)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+
+from datetime import timedelta
+
+from hypothesis import given
+import hypothesis.strategies as st
+
+import srt
+
+# Short times, so that subtitles overlap each other and the queries often
+TIMES = st.integers(min_value=-100, max_value=1000)
+
+
+def _ms_subtitles():
+    return st.lists(
+        st.builds(
+            lambda index, start, duration: srt.Subtitle(
+                index, start, start + duration, "x"
+            ),
+            index=st.integers(min_value=0),
+            start=TIMES,
+            duration=st.integers(min_value=-10, max_value=500),
+        )
+    )
+
+
+def _in_order(input_subs):
+    return sorted(input_subs, key=lambda sub: (sub.start, sub.end))
+
+
+@given(_ms_subtitles(), TIMES)
+def test_index_at(input_subs, time):
+    index = srt.SubtitleIndex(input_subs)
+    expected = [sub for sub in _in_order(input_subs) if sub.start <= time < sub.end]
+    assert index.at(time) == expected
+
+
+@given(_ms_subtitles(), TIMES, TIMES)
+def test_index_overlapping(input_subs, start, end):
+    index = srt.SubtitleIndex(input_subs)
+    expected = [
+        sub
+        for sub in _in_order(input_subs)
+        if sub.start < end and (sub.start >= start or sub.end > start)
+    ]
+    assert index.overlapping(start, end) == expected
+
+
+@given(_ms_subtitles(), TIMES, TIMES)
+def test_index_starting(input_subs, start, end):
+    index = srt.SubtitleIndex(input_subs)
+    expected = [sub for sub in _in_order(input_subs) if start <= sub.start < end]
+    assert index.starting(start, end) == expected
+
+
+@given(_ms_subtitles())
+def test_index_keeps_subtitles_in_order(input_subs):
+    index = srt.SubtitleIndex(input_subs)
+    assert len(index) == len(input_subs)
+    assert list(index) == _in_order(input_subs)
+
+
+def test_index_timedeltas():
+    subs = [
+        srt.Subtitle(1, timedelta(seconds=1), timedelta(seconds=4), "a"),
+        srt.Subtitle(2, timedelta(seconds=2), timedelta(seconds=3), "b"),
+        srt.Subtitle(3, timedelta(seconds=5), timedelta(seconds=6), "c"),
+    ]
+    index = srt.SubtitleIndex(reversed(subs))
+    assert index.at(timedelta(seconds=2)) == subs[:2]
+    assert index.overlapping(timedelta(seconds=3), timedelta(seconds=6)) == [
+        subs[0],
+        subs[2],
+    ]
+    assert index.starting(timedelta(0), timedelta(seconds=2)) == subs[:1]
+
+
+def test_index_empty():
+    index = srt.SubtitleIndex([])
+    assert index.at(0) == []
+    assert index.overlapping(0, 10) == []
+    assert index.starting(0, 10) == []
+    assert repr(index) == "SubtitleIndex(<0 subtitles>)"
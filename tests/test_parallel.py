@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from hypothesis import given
+import hypothesis.strategies as st
+
+import srt
+from srt.parallel import compose_parallel, parse_parallel
+from test_srt import messy_srt, subs_eq, subtitles, _parse_outcome
+
+# Running every example in a fresh process pool would be far too slow, so most
+# tests run the shards in threads instead
+EXECUTOR = ThreadPoolExecutor(4)
+
+
+def _parallel_outcome(srt_input, **kwargs):
+    got = []
+    try:
+        for sub in parse_parallel(srt_input, executor=EXECUTOR, **kwargs):
+            got.append(sub)
+    except srt.SRTParseError as thrown_exc:
+        return got, thrown_exc.args
+    return got, None
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.integers(min_value=1, max_value=16),
+    st.booleans(),
+)
+def test_parse_parallel_matches_parse(input_subs, shards, milliseconds):
+    composed = srt.compose(input_subs, reindex=False, strict=False)
+    got, error = _parallel_outcome(
+        StringIO(composed), shards=shards, milliseconds=milliseconds
+    )
+    assert error is None
+    subs_eq(got, srt.parse(composed, milliseconds=milliseconds))
+
+
+@given(
+    st.lists(messy_srt(), min_size=1, max_size=4),
+    st.integers(min_value=1, max_value=16),
+    st.booleans(),
+)
+def test_parse_parallel_errors_match_parse(srt_inputs, shards, ignore_errors):
+    # Several messy inputs together make for many possible shard boundaries,
+    # with garbage and whitespace around them
+    srt_input = "\n\n".join(srt_inputs)
+    expected_subs, expected_error = _parse_outcome(
+        srt_input, ignore_errors=ignore_errors
+    )
+    got_subs, got_error = _parallel_outcome(
+        srt_input, shards=shards, ignore_errors=ignore_errors
+    )
+    assert got_error == expected_error
+    subs_eq(got_subs, expected_subs)
+
+
+def test_parse_parallel_error_offset_in_later_shard():
+    block = "1\n00:00:01,000 --> 00:00:02,000\nline\n\n"
+    garbage = "2\n00:00:03,000 garbage\n\n"
+    srt_input = block * 50 + garbage + block * 50
+    expected_start = len(block) * 50
+
+    with pytest.raises(srt.SRTParseError) as thrown_exc:
+        list(parse_parallel(srt_input, shards=8, executor=EXECUTOR))
+
+    assert thrown_exc.value.expected_start == expected_start
+    # The blank line is part of the next block, as in srt.parse
+    assert thrown_exc.value.actual_start == expected_start + len(garbage) - 2
+    assert thrown_exc.value.unmatched_content == garbage[:-2]
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.integers(min_value=-(10**9), max_value=10**9),
+    st.booleans(),
+    st.integers(min_value=0),
+    st.booleans(),
+    st.integers(min_value=1, max_value=16),
+)
+def test_compose_parallel_matches_compose(
+    input_subs, shift, reindex, start_index, strict, shards
+):
+    # Shift some subtitles before zero, so they're skipped when reindexing
+    for sub in input_subs[::2]:
+        sub.start += timedelta(milliseconds=shift)
+    originals = [sub.copy() for sub in input_subs]
+
+    got = compose_parallel(
+        input_subs,
+        reindex=reindex,
+        start_index=start_index,
+        strict=strict,
+        shards=shards,
+        executor=EXECUTOR,
+    )
+    expected = srt.compose(
+        originals, reindex=reindex, start_index=start_index, strict=strict
+    )
+    assert got == expected
+    subs_eq(input_subs, originals)
+
+
+def test_parallel_process_pool():
+    input_subs = [
+        srt.Subtitle(index, timedelta(seconds=index), timedelta(seconds=index + 1), "x")
+        for index in range(1000, 0, -1)
+    ]
+    composed = compose_parallel(input_subs, workers=2)
+    assert composed == srt.compose(input_subs)
+
+    got = parse_parallel(composed, milliseconds=True, workers=2, shards=5)
+    subs_eq(got, srt.parse(composed, milliseconds=True))
+
+
+def _write_files(directory, contents):
+    paths = []
+    for file_num, content in enumerate(contents):
+        path = directory / "{}.srt".format(file_num)
+        path.write_bytes(content)
+        paths.append(str(path))
+    return paths
+
+
+GOOD_SRT = "1\r\n00:00:01,000 --> 00:00:02,000\r\nline\r\n\r\n"
+BAD_SRT = "1\n00:00:01,000 --> 00:00:02,000\nline\n\n2\n00:00:03,000 x\n\n"
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+@pytest.mark.parametrize("queue_depth", [None, 1, 3])
+def test_parse_many(tmp_path, ordered, queue_depth):
+    contents = [
+        GOOD_SRT.encode("utf-8"),
+        GOOD_SRT.encode("utf-8-sig"),
+        BAD_SRT.encode("utf-8"),
+        b"\xff\xfe",
+    ] * 3
+    paths = _write_files(tmp_path, contents)
+    paths.append(str(tmp_path / "missing.srt"))
+
+    results = list(
+        srt.parse_many(
+            paths,
+            milliseconds=True,
+            ordered=ordered,
+            queue_depth=queue_depth,
+            executor=EXECUTOR,
+        )
+    )
+    if ordered:
+        assert [path for path, _ in results] == paths
+    else:
+        assert sorted(path for path, _ in results) == sorted(paths)
+
+    results = dict(results)
+    for path, content in zip(paths, contents):
+        if content == b"\xff\xfe":
+            assert isinstance(results[path], UnicodeDecodeError)
+        elif content.startswith(BAD_SRT.encode("utf-8")):
+            assert isinstance(results[path], srt.SRTParseError)
+        else:
+            subs_eq(results[path], srt.parse(GOOD_SRT, milliseconds=True))
+    assert isinstance(results[paths[-1]], OSError)
+
+
+def test_parse_many_ignore_errors_and_encoding(tmp_path):
+    paths = _write_files(
+        tmp_path, [GOOD_SRT.encode("utf-16"), BAD_SRT.encode("utf-16")]
+    )
+    results = srt.parse_many(
+        paths, ignore_errors=True, encoding="utf-16", executor=EXECUTOR
+    )
+    for (_, got), expected in zip(results, [GOOD_SRT, BAD_SRT]):
+        subs_eq(got, srt.parse(expected, ignore_errors=True))
+
+
+def test_parse_many_process_pool(tmp_path):
+    paths = _write_files(tmp_path, [GOOD_SRT.encode("utf-8"), BAD_SRT.encode()])
+    (_, good), (_, bad) = srt.parse_many(paths, workers=2)
+    subs_eq(good, srt.parse(GOOD_SRT))
+    assert isinstance(bad, srt.SRTParseError)
+    assert bad.args == _parse_outcome(BAD_SRT)[1]
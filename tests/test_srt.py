@@ -1,11 +1,15 @@
 #!/usr/bin/python3
 
 from datetime import timedelta
-from io import StringIO
+from io import BytesIO, StringIO
 import collections
 import functools
+import logging
+import mmap
 import os
+import pickle
 import string
+import threading
 
 import pytest
 from hypothesis import given, settings, HealthCheck, assume
@@ -48,13 +52,17 @@ def is_strictly_legal_content(content):
         return True
 
 
+def _sub_vars(sub):
+    return frozenset((name, getattr(sub, name)) for name in sub.__slots__)
+
+
 def subs_eq(got, expected, any_order=False):
     """
-    Compare Subtitle objects using vars() so that differences are easy to
-    identify.
+    Compare Subtitle objects attribute by attribute so that differences are
+    easy to identify.
     """
-    got_vars = [frozenset(vars(sub).items()) for sub in got]
-    expected_vars = [frozenset(vars(sub).items()) for sub in expected]
+    got_vars = [_sub_vars(sub) for sub in got]
+    expected_vars = [_sub_vars(sub) for sub in expected]
     if any_order:
         assert collections.Counter(got_vars) == collections.Counter(expected_vars)
     else:
@@ -169,6 +177,312 @@ def test_compose_and_parse_from_file_bom(input_subs):
     subs_eq(reparsed_subs, input_subs)
 
 
+def _parse_outcome(srt_input, **kwargs):
+    """
+    Parse to completion, returning the parsed subtitles along with the details
+    of any SRTParseError that stopped parsing.
+    """
+    got = []
+    try:
+        for sub in srt.parse(srt_input, **kwargs):
+            got.append(sub)
+    except srt.SRTParseError as thrown_exc:
+        return got, thrown_exc.args
+    return got, None
+
+
+@given(st.lists(subtitles()), st.integers(min_value=1, max_value=64))
+def test_compose_and_parse_from_file_chunked(input_subs, chunk_size):
+    srt_file = StringIO(srt.compose(input_subs, reindex=False))
+    reparsed_subs = srt.parse(srt_file, chunk_size=chunk_size)
+    subs_eq(reparsed_subs, input_subs)
+
+
+@given(st.lists(subtitles()), st.integers(min_value=1, max_value=64))
+def test_compose_and_parse_from_file_bom_chunked(input_subs, chunk_size):
+    srt_file = StringIO("\ufeff" + srt.compose(input_subs, reindex=False))
+    reparsed_subs = srt.parse(srt_file, chunk_size=chunk_size)
+    subs_eq(reparsed_subs, input_subs)
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.text(alphabet="0123456789:,-> \r\nab"),
+    st.integers(min_value=0),
+    st.integers(min_value=1, max_value=64),
+    st.booleans(),
+)
+def test_parse_chunked_matches_parse(
+    input_subs, garbage, garbage_pos, chunk_size, ignore_errors
+):
+    srt_blocks = [sub.to_srt(strict=False) for sub in input_subs]
+    srt_blocks.insert(garbage_pos % (len(srt_blocks) + 1), garbage)
+    composed = "".join(srt_blocks)
+
+    expected = _parse_outcome(composed, ignore_errors=ignore_errors)
+    got = _parse_outcome(
+        StringIO(composed), ignore_errors=ignore_errors, chunk_size=chunk_size
+    )
+
+    subs_eq(got[0], expected[0])
+    assert got[1] == expected[1]
+
+
+def test_parse_chunked_is_linear(monkeypatch):
+    # A long run without two blocks in it is not parsed again for every chunk
+    tokenized = []
+    tokenize = srt.srt._tokenize
+
+    def counting_tokenize(data):
+        tokenized.append(len(data))
+        return tokenize(data)
+
+    monkeypatch.setattr(srt.srt, "_tokenize", counting_tokenize)
+    garbage = "garbage\n" * 10000
+    composed = garbage + srt.compose([CONTENTLESS_SUB(content="x")])
+    subs = srt.parse(StringIO(composed), ignore_errors=True, chunk_size=16)
+    assert len(list(subs)) == 1
+    assert sum(tokenized) < 4 * len(composed)
+
+
+@st.composite
+def messy_srt(draw):
+    """
+    A Hypothesis strategy to generate SRT-ish text which mostly looks like
+    well-formed blocks, but with the kind of damage seen in the wild.
+    """
+    eols = st.sampled_from(["\n", "\r\n", "\r"])
+    eol = draw(st.sampled_from(["\n", "\r\n"]))
+    digit = "[0-9]"
+    canonical_ts = "{0}{{2}}:{0}{{2}}:{0}{{2}},{0}{{3}}".format(digit)
+    messy_ts = "{0}{{1,3}}[:：]{0}{{2}}[:：]{0}{{2}}[,.：]{0}{{1,3}}".format(digit)
+    index_line = st.one_of(
+        st.from_regex("[0-9]{1,4}", fullmatch=True),
+        st.sampled_from(["", "-5", "1.2", "12 ", "007", "\ufeff1", "a"]),
+    )
+    ts_line = st.one_of(
+        st.from_regex("{0} --> {0}( [a-z0-9:]*)?".format(canonical_ts), fullmatch=True),
+        st.from_regex("{0} *-->? *{0}( .*)?".format(messy_ts), fullmatch=True),
+    )
+    content_line = st.one_of(st.text(alphabet="ab0-: "), index_line, ts_line)
+
+    text = draw(st.sampled_from(["", "\ufeff", " ", "\r\n", "\n\n"]))
+    for _ in range(draw(st.integers(min_value=0, max_value=5))):
+        lines = [draw(index_line), draw(ts_line)]
+        lines.extend(draw(st.lists(content_line, max_size=3)))
+        line_eols = st.one_of(st.just(eol), eols)
+        text += "".join(line + draw(line_eols) for line in lines)
+        text += draw(st.sampled_from(["", eol, eol + eol, "garbage" + eol]))
+
+    if draw(st.booleans()):
+        text = text.rstrip("\r\n")
+    return text
+
+
+def _regex_parse_outcome(srt_input, ignore_errors=False):
+    """
+    Like _parse_outcome, but tokenizing with SRT_REGEX alone, as the parser
+    did before it had a fast path.
+    """
+    got = []
+    expected_start = 0
+    try:
+        for match in srt.SRT_REGEX.finditer(srt_input):
+            srt.srt._check_contiguity(
+                srt_input, expected_start, match.start(), ignore_errors
+            )
+            got.append(srt.srt._block_to_subtitle(srt.srt._match_to_block(match)))
+            expected_start = match.end()
+        srt.srt._check_contiguity(
+            srt_input, expected_start, len(srt_input), ignore_errors
+        )
+    except srt.SRTParseError as thrown_exc:
+        return got, thrown_exc.args
+    return got, None
+
+
+@given(messy_srt(), st.booleans())
+def test_parse_matches_regex_tokenizer(srt_input, ignore_errors):
+    expected = _regex_parse_outcome(srt_input, ignore_errors=ignore_errors)
+    got = _parse_outcome(srt_input, ignore_errors=ignore_errors)
+
+    subs_eq(got[0], expected[0])
+    assert got[1] == expected[1]
+
+
+def test_parse_matches_regex_tokenizer_unmatched_tail():
+    # SRT_REGEX's lookahead only checks the index and start timestamp, so the
+    # block after the first one is never matched.
+    srt_input = "1\n00:00:01,000 --> 00:00:02,000\na\n2\n00:00:03,000 x\n\ny"
+    expected = _regex_parse_outcome(srt_input)
+    got = _parse_outcome(srt_input)
+
+    assert len(got[0]) == 1
+    subs_eq(got[0], expected[0])
+    assert got[1] == expected[1]
+
+
+@given(st.lists(subtitles(strict=False)), st.sampled_from(["\n", "\r\n"]))
+def test_parse_matches_regex_tokenizer_composed(input_subs, eol):
+    composed = srt.compose(input_subs, reindex=False, strict=False, eol=eol)
+    expected = _regex_parse_outcome(composed)
+    got = _parse_outcome(composed)
+
+    subs_eq(got[0], expected[0])
+    assert got[1] == expected[1]
+
+
+def _error_outcome(subs_iter):
+    """
+    Consume subtitles (or views, which are converted to subtitles), returning
+    them with the position and content of any SRTParseError that stopped
+    parsing.
+    """
+    got = []
+    try:
+        for sub in subs_iter:
+            got.append(sub.to_subtitle() if hasattr(sub, "to_subtitle") else sub)
+    except srt.SRTParseError as thrown_exc:
+        return got, (
+            thrown_exc.expected_start,
+            thrown_exc.actual_start,
+            thrown_exc.unmatched_content,
+        )
+    return got, None
+
+
+def _utf8_error(srt_input, error):
+    """
+    Convert the outcome of a parse error in srt_input to what it would be from
+    parsing the same data encoded as UTF-8, where offsets count bytes.
+    """
+    if error is None:
+        return None
+    expected_start, actual_start, unmatched_content = error
+    return (
+        len(srt_input[:expected_start].encode("utf-8")),
+        len(srt_input[:actual_start].encode("utf-8")),
+        unmatched_content,
+    )
+
+
+@st.composite
+def messy_unicode_srt(draw):
+    """
+    messy_srt, with its spaces and colons swapped for other characters that
+    SRT_REGEX treats the same, which are mostly not ASCII.
+    """
+    text = draw(messy_srt())
+    space = draw(st.sampled_from(" \x1c" + srt.srt.UNICODE_WHITESPACE))
+    delim = draw(st.sampled_from(":，．。："))
+    return text.replace(" ", space).replace(":", delim)
+
+
+@given(st.one_of(messy_srt(), messy_unicode_srt()), st.booleans(), st.booleans())
+def test_parse_lazy_matches_parse(srt_input, ignore_errors, milliseconds):
+    kwargs = {"ignore_errors": ignore_errors, "milliseconds": milliseconds}
+    expected_subs, expected_error = _error_outcome(srt.parse(srt_input, **kwargs))
+
+    got_subs, got_error = _error_outcome(srt.parse_lazy(srt_input, **kwargs))
+    subs_eq(got_subs, expected_subs)
+    assert got_error == expected_error
+
+    expected_error = _utf8_error(srt_input, expected_error)
+    encoded = srt_input.encode("utf-8")
+    for encoded_input in (encoded, bytearray(encoded), memoryview(encoded)):
+        got_subs, got_error = _error_outcome(srt.parse_lazy(encoded_input, **kwargs))
+        subs_eq(got_subs, expected_subs)
+        assert got_error == expected_error
+
+
+@given(
+    st.one_of(messy_srt(), messy_unicode_srt()),
+    st.booleans(),
+    st.sampled_from([bytes, bytearray, memoryview]),
+)
+def test_parse_bytes_matches_parse(srt_input, bom, bytes_type):
+    expected_subs, expected_error = _error_outcome(srt.parse(srt_input))
+    expected_error = _utf8_error(srt_input, expected_error)
+
+    # With utf-8-sig, a BOM is added, and offsets start after it as they would
+    # once it's decoded
+    encoding = "utf-8-sig" if bom else "utf-8"
+    encoded = srt_input.encode(encoding)
+
+    for source in (bytes_type(encoded), BytesIO(encoded)):
+        got_subs, got_error = _error_outcome(srt.parse(source, encoding=encoding))
+        subs_eq(got_subs, expected_subs)
+        assert got_error == expected_error
+
+
+@given(
+    st.one_of(messy_srt(), messy_unicode_srt()),
+    st.integers(min_value=1, max_value=64),
+)
+def test_parse_bytes_other_encoding(srt_input, chunk_size):
+    # Offsets still count characters, since the whole input is decoded first
+    expected = _error_outcome(srt.parse(srt_input))
+    encoded = srt_input.encode("utf-16")
+
+    got = _error_outcome(srt.parse(encoded, encoding="utf-16"))
+    subs_eq(got[0], expected[0])
+    assert got[1] == expected[1]
+
+    got = _error_outcome(
+        srt.parse(BytesIO(encoded), encoding="utf-16", chunk_size=chunk_size)
+    )
+    subs_eq(got[0], expected[0])
+    assert got[1] == expected[1]
+
+
+def test_parse_bytes_keeps_bom_without_utf_8_sig():
+    srt_input = "\ufeff1\n00:00:01,000 --> 00:00:02,000\nline\n"
+    got = srt.parse(srt_input.encode("utf-8"), encoding="utf-8")
+    subs_eq(got, srt.parse(srt_input))
+
+
+def test_parse_lazy_reads_content_on_access(tmp_path):
+    srt_path = tmp_path / "lazy.srt"
+    srt_path.write_bytes(
+        "1\r\n00:00:01,000 --> 00:00:02,000 prop\r\nlíne\r\n2\r\n\r\n".encode("utf-8")
+    )
+
+    with open(str(srt_path), "rb") as srt_file:
+        with mmap.mmap(srt_file.fileno(), 0, access=mmap.ACCESS_READ) as srt_map:
+            (view,) = srt.parse_lazy(srt_map, milliseconds=True)
+            assert repr(view) == "SubtitleView(index=1, start=1000, end=2000)"
+            assert view._content is None
+            assert view._proprietary is None
+
+            assert view.content == "líne\n2"
+            assert view.proprietary == "prop"
+            # Cached after the first access
+            assert view.content is view.content
+            sub = view.to_subtitle()
+
+    assert sub == srt.Subtitle(1, 1000, 2000, "líne\n2", "prop")
+
+
+def test_parse_lazy_file_object():
+    srt_input = "1\n00:00:01,000 --> 00:00:02,000\nline\n\n"
+    (view,) = srt.parse_lazy(StringIO(srt_input))
+    subs_eq([view.to_subtitle()], srt.parse(srt_input))
+
+
+@given(
+    st.text(min_size=1)
+    .filter(lambda x: "\r" not in x)
+    .filter(is_strictly_legal_content),
+    st.sampled_from(["\n", "\r\n"]),
+)
+def test_parse_final_block_single_newline(content, eol):
+    # Short enough timestamps for the tokenizer's fast path
+    sub = CONTENTLESS_SUB(content=content)
+    composed = sub.to_srt(eol=eol)[: -len(eol)]
+    reparsed_subs = srt.parse(composed)
+    subs_eq(reparsed_subs, [sub])
+
+
 @given(st.lists(subtitles()))
 def test_compose_and_parse_strict(input_subs):
     composed = srt.compose(input_subs, reindex=False)
@@ -176,6 +490,162 @@ def test_compose_and_parse_strict(input_subs):
     subs_eq(reparsed_subs, input_subs)
 
 
+class _RecordingStream:
+    """A text stream which remembers each write separately."""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.booleans(),
+    st.booleans(),
+    st.sampled_from([None, "\n", "\r\n"]),
+    st.integers(min_value=1, max_value=512),
+)
+def test_compose_to_matches_compose(input_subs, reindex, strict, eol, flush_size):
+    expected = srt.compose(input_subs, reindex=reindex, strict=strict, eol=eol)
+
+    stream = _RecordingStream()
+    srt.compose_to(
+        input_subs,
+        stream,
+        reindex=reindex,
+        strict=strict,
+        eol=eol,
+        flush_size=flush_size,
+    )
+    assert "".join(stream.writes) == expected
+    assert all(len(batch) >= flush_size for batch in stream.writes[:-1])
+    assert all(stream.writes)
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.sampled_from([None, "\n", "\r\n"]),
+    st.sampled_from(["utf-8", "UTF8", "utf-8-sig", "utf-16"]),
+    st.integers(min_value=1, max_value=512),
+)
+def test_compose_to_encoding_matches_compose(input_subs, eol, encoding, flush_size):
+    composed = srt.compose(input_subs, eol=eol)
+    # Nothing is written at all for no subtitles, not even a byte order mark
+    expected = composed.encode(encoding) if composed else b""
+
+    stream = _RecordingStream()
+    srt.compose_to(
+        input_subs, stream, eol=eol, encoding=encoding, flush_size=flush_size
+    )
+    assert b"".join(stream.writes) == expected
+    assert all(isinstance(batch, bytes) for batch in stream.writes)
+
+
+def test_compose_to_external_sort(tmp_path):
+    subs = [
+        srt.Subtitle(index, timedelta(seconds=index), timedelta(seconds=99), "x")
+        for index in range(50, 0, -1)
+    ]
+    output = StringIO()
+    srt.compose_to(subs, output, max_memory=2000, temp_dir=str(tmp_path))
+    assert output.getvalue() == srt.compose(subs)
+
+
+def test_compose_to_stateful_encoding():
+    # ISO-2022-JP switches back to ASCII before each line break
+    sub = CONTENTLESS_SUB(index=1, content="\u65e5\u672c")
+    output = BytesIO()
+    srt.compose_to([sub], output, encoding="iso2022_jp", flush_size=1)
+    assert output.getvalue() == srt.compose([sub]).encode("iso2022_jp")
+
+
+DIRTY_SUBS = [
+    CONTENTLESS_SUB(index=1, content="\nfirst\n\n"),
+    CONTENTLESS_SUB(index=2, content=" "),
+    CONTENTLESS_SUB(index=3, content="\nsecond"),
+    CONTENTLESS_SUB(index=4, content="  "),
+]
+
+
+@pytest.mark.parametrize("use_compose_to", [False, True])
+def test_compose_diagnostics(caplog, use_compose_to):
+    caplog.set_level(logging.INFO)
+    diagnostics = srt.Diagnostics(max_examples=1)
+    if use_compose_to:
+        srt.compose_to(DIRTY_SUBS, StringIO(), diagnostics=diagnostics)
+    else:
+        srt.compose(DIRTY_SUBS, diagnostics=diagnostics)
+
+    assert diagnostics.summary() == {
+        "skipped: No content": {"count": 2, "examples": [2]},
+        "legalised": {"count": 2, "examples": [("\nfirst\n\n", "first")]},
+    }
+    assert not caplog.records
+
+
+def test_parse_diagnostics(caplog):
+    caplog.set_level(logging.INFO)
+    srt_input = "garbage\n\n1\n00:00:01,000 --> 00:00:02,000\nx\n\n2\n00:00:03,000 x"
+    diagnostics = srt.Diagnostics(log_each=True)
+    subs = srt.parse(srt_input, ignore_errors=True, diagnostics=diagnostics)
+
+    next(subs)
+    # Anything the consumer does between subtitles isn't collected
+    srt.make_legal_content("\nx")
+    assert list(subs) == []
+
+    assert diagnostics.summary() == {
+        "unparseable": {"count": 2, "examples": ["garbage", "2\n00:00:03,000 x"]}
+    }
+    assert [record.levelno for record in caplog.records] == [
+        logging.WARNING,
+        logging.INFO,
+        logging.WARNING,
+    ]
+
+
+def test_diagnostics_context_manager(caplog):
+    caplog.set_level(logging.INFO)
+    with srt.Diagnostics() as outer:
+        with srt.Diagnostics() as inner:
+            srt.make_legal_content("\nx")
+        list(srt.sort_and_reindex(DIRTY_SUBS))
+    srt.make_legal_content("\ny")
+
+    assert inner.counts == {"legalised": 1}
+    assert outer.counts == {"skipped: No content": 2}
+    assert repr(outer) == "Diagnostics({'skipped: No content': 2})"
+    # Only the last one was outside of any collector
+    assert len(caplog.records) == 1
+
+
+def test_diagnostics_only_collect_their_own_thread(caplog):
+    caplog.set_level(logging.INFO)
+    with srt.Diagnostics() as diagnostics:
+        other_thread = threading.Thread(target=srt.make_legal_content, args=["\nx"])
+        other_thread.start()
+        other_thread.join()
+
+    assert diagnostics.counts == {}
+    assert len(caplog.records) == 1
+
+
+def test_compose_to_writes_before_input_is_finished():
+    stream = _RecordingStream()
+    progress = []
+
+    def generate_subs():
+        for index in range(1, 4):
+            progress.append(len(stream.writes))
+            yield CONTENTLESS_SUB(index=index, content="x")
+
+    srt.compose_to(generate_subs(), stream, reindex=False, flush_size=1)
+    assert progress == [0, 1, 2]
+    assert len(stream.writes) == 3
+
+
 @given(st.lists(subtitles()))
 def test_can_compose_without_ending_blank_line(input_subs):
     """
@@ -227,17 +697,52 @@ def test_timedelta_to_srt_timestamp_can_go_over_24_hours(days):
 
 @given(subtitles())
 def test_subtitle_equality(sub_1):
-    sub_2 = srt.Subtitle(**vars(sub_1))
+    sub_2 = sub_1.copy()
     assert sub_1 == sub_2
 
 
 @given(subtitles())
 def test_subtitle_inequality(sub_1):
-    sub_2 = srt.Subtitle(**vars(sub_1))
+    sub_2 = sub_1.copy()
     sub_2.index += 1
     assert sub_1 != sub_2
 
 
+@given(subtitles())
+def test_subtitle_copy_is_independent(sub_1):
+    sub_2 = sub_1.copy()
+    assert sub_2 is not sub_1
+    assert sub_2 == sub_1
+    assert hash(sub_2) == hash(sub_1)
+
+    sub_2.content += "x"
+    assert sub_1 != sub_2
+
+
+@given(subtitles(), st.integers(min_value=0), st.text())
+def test_subtitle_replace(sub, index, content):
+    replaced = sub._replace(index=index, content=content)
+    assert (replaced.index, replaced.content) == (index, content)
+    assert (replaced.start, replaced.end) == (sub.start, sub.end)
+    assert replaced.proprietary == sub.proprietary
+
+    with pytest.raises(AttributeError):
+        sub._replace(nonexistent=1)
+
+
+@given(subtitles())
+def test_subtitle_pickle_roundtrip(sub):
+    unpickled = pickle.loads(pickle.dumps(sub))
+    assert type(unpickled) is srt.Subtitle
+    subs_eq([unpickled], [sub])
+
+
+def test_subtitle_not_equal_to_other_types():
+    sub = CONTENTLESS_SUB(content="a")
+    assert sub != (1, sub.start, sub.end, "a", "")
+    assert not hasattr(sub, "__dict__")
+
+
 @given(subtitles())
 def test_subtitle_from_scratch_equality(subtitle):
     srt_block = subtitle.to_srt()
@@ -403,8 +908,8 @@ def test_sort_and_reindex_same_start_time_uses_end(input_subs):
 def test_sort_and_reindex_not_in_place_matches(input_subs, start_index):
     # Make copies for both sort_and_reindex calls so that they can't affect
     # each other
-    not_in_place_subs = [srt.Subtitle(**vars(sub)) for sub in input_subs]
-    in_place_subs = [srt.Subtitle(**vars(sub)) for sub in input_subs]
+    not_in_place_subs = [sub.copy() for sub in input_subs]
+    in_place_subs = [sub.copy() for sub in input_subs]
 
     nip_ids = [id(sub) for sub in not_in_place_subs]
     ip_ids = [id(sub) for sub in in_place_subs]
@@ -426,6 +931,91 @@ def test_sort_and_reindex_not_in_place_matches(input_subs, start_index):
     assert all(id(sub) in ip_ids for sub in in_place_output)
 
 
+@given(
+    st.lists(subtitles(strict=False)),
+    st.integers(min_value=0, max_value=8),
+    st.booleans(),
+    st.data(),
+)
+def test_sort_and_reindex_window_matches_sort(input_subs, window, skip, data):
+    # Shuffling within runs of window + 1 moves each subtitle at most window
+    # places from where it belongs
+    input_subs.sort()
+    shuffled = []
+    for start in range(0, len(input_subs), window + 1):
+        run = input_subs[start : start + window + 1]
+        shuffled.extend(data.draw(st.permutations(run)))
+
+    expected = list(srt.sort_and_reindex(shuffled, skip=skip))
+    got = list(srt.sort_and_reindex(iter(shuffled), skip=skip, window=window))
+    subs_eq(got, expected)
+
+
+def test_sort_and_reindex_skips_useless_subtitles():
+    good = CONTENTLESS_SUB(content="x")
+    subs = [
+        good,
+        CONTENTLESS_SUB(content=" \n"),
+        CONTENTLESS_SUB(start=timedelta(seconds=-1), content="x"),
+        CONTENTLESS_SUB(end=timedelta(seconds=1), content="x"),
+    ]
+    subs_eq(srt.sort_and_reindex(subs), [good])
+    assert len(list(srt.sort_and_reindex(subs, skip=False))) == len(subs)
+
+    reasons = [
+        [reason for reason, skips in srt.SUBTITLE_SKIP_CONDITIONS if skips(sub)]
+        for sub in subs
+    ]
+    assert reasons == [
+        [],
+        ["No content"],
+        ["Start time < 0 seconds"],
+        ["Subtitle start time >= end time"],
+    ]
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.integers(min_value=1, max_value=2000),
+    st.booleans(),
+    st.integers(min_value=0),
+)
+def test_sort_and_reindex_external_matches_sort(
+    tmp_path_factory, input_subs, max_memory, in_place, start_index
+):
+    # Some subtitles have the same times, to check ties stay in input order
+    for sub, prev in zip(input_subs[::3], input_subs[1::3]):
+        sub.start, sub.end = prev.start, prev.end
+    temp_dir = tmp_path_factory.mktemp("runs")
+
+    expected = list(srt.sort_and_reindex(input_subs, start_index=start_index))
+    got = srt.sort_and_reindex(
+        iter(input_subs),
+        start_index=start_index,
+        in_place=in_place,
+        max_memory=max_memory,
+        temp_dir=str(temp_dir),
+    )
+    subs_eq(got, expected)
+    # The temporary files are removed once everything is merged
+    assert not list(temp_dir.iterdir())
+
+
+def test_sort_and_reindex_window_and_max_memory():
+    with pytest.raises(ValueError):
+        list(srt.sort_and_reindex([], window=1, max_memory=1))
+
+
+def test_sort_and_reindex_window_too_small():
+    subs = [
+        srt.Subtitle(index, timedelta(seconds=index), timedelta(seconds=10), "x")
+        for index in range(3)
+    ]
+    with pytest.raises(ValueError):
+        list(srt.sort_and_reindex(subs[1:] + subs[:1], window=1))
+    assert len(list(srt.sort_and_reindex(subs[1:] + subs[:1], window=2))) == 3
+
+
 @given(
     st.lists(subtitles(), min_size=1),
     st.integers(min_value=0),
@@ -448,6 +1038,17 @@ def test_parser_noncontiguous(subs, fake_idx, garbage, fake_timedelta):
         list(srt.parse(composed))
 
 
+@given(st.integers(min_value=0), st.integers(min_value=0), st.text())
+def test_parse_error_pickle_roundtrip(expected_start, actual_start, unmatched):
+    exc = srt.SRTParseError(expected_start, actual_start, unmatched)
+    unpickled = pickle.loads(pickle.dumps(exc))
+    assert type(unpickled) is srt.SRTParseError
+    assert unpickled.args == exc.args
+    assert unpickled.expected_start == expected_start
+    assert unpickled.actual_start == actual_start
+    assert unpickled.unmatched_content == unmatched
+
+
 @given(
     st.lists(subtitles(), min_size=1),
     st.integers(min_value=0),
@@ -607,6 +1208,89 @@ def test_compose_and_parse_strict_crlf(input_subs):
     subs_eq(reparsed_subs, input_subs)
 
 
+def _with_milliseconds(subs):
+    """Copy subtitles, storing their times as milliseconds."""
+    return [
+        srt.Subtitle(
+            sub.index,
+            srt.timedelta_to_milliseconds(sub.start),
+            srt.timedelta_to_milliseconds(sub.end),
+            sub.content,
+            sub.proprietary,
+        )
+        for sub in subs
+    ]
+
+
+@given(st.lists(subtitles()), st.integers(min_value=0, max_value=64))
+def test_compose_and_parse_milliseconds(input_subs, chunk_size):
+    ms_subs = _with_milliseconds(input_subs)
+    composed = srt.compose(ms_subs, reindex=False)
+    assert composed == srt.compose(input_subs, reindex=False)
+
+    reparsed_subs = srt.parse(
+        StringIO(composed), chunk_size=chunk_size, milliseconds=True
+    )
+    subs_eq(reparsed_subs, ms_subs)
+
+
+@given(st.lists(subtitles()))
+def test_milliseconds_timedelta_accessors(input_subs):
+    for sub, ms_sub in zip(input_subs, _with_milliseconds(input_subs)):
+        assert isinstance(ms_sub.start, int)
+        assert ms_sub.start_timedelta == sub.start_timedelta == sub.start
+        assert ms_sub.end_timedelta == sub.end_timedelta == sub.end
+
+
+@given(st.lists(subtitles(), min_size=1), st.integers(min_value=0))
+def test_sort_and_reindex_milliseconds(input_subs, start_index):
+    for sub in input_subs[::2]:
+        sub.start = -sub.start
+    expected = _with_milliseconds(
+        srt.sort_and_reindex(input_subs, start_index=start_index)
+    )
+    got = srt.sort_and_reindex(_with_milliseconds(input_subs), start_index=start_index)
+    subs_eq(got, expected)
+
+
+@given(timedeltas(min_value=-999999, max_value=999999))
+def test_milliseconds_to_srt_timestamp_matches_timedelta(delta):
+    msecs = srt.timedelta_to_milliseconds(delta)
+    assert timedelta(milliseconds=msecs) == delta
+    assert srt.milliseconds_to_srt_timestamp(msecs) == srt.timedelta_to_srt_timestamp(
+        delta
+    )
+
+
+TABLE_END_MSECS = srt.TIMESTAMP_TABLE_HOURS * 3600 * 1000
+
+
+@given(
+    st.lists(
+        st.one_of(
+            st.integers(min_value=-(10**12), max_value=10**12),
+            # Around the start and the end of the prefix table
+            st.integers(min_value=-2000, max_value=2000),
+            st.integers(
+                min_value=TABLE_END_MSECS - 2000, max_value=TABLE_END_MSECS + 2000
+            ),
+        )
+    )
+)
+def test_milliseconds_to_srt_timestamps_formatting(msecs_list):
+    expected = []
+    for msecs in msecs_list:
+        secs, msecs = divmod(msecs, 1000)
+        mins, secs = divmod(secs, 60)
+        hrs, mins = divmod(mins, 60)
+        expected.append("%02d:%02d:%02d,%03d" % (hrs, mins, secs, msecs))
+
+    assert [srt.milliseconds_to_srt_timestamp(ms) for ms in msecs_list] == expected
+    assert srt.milliseconds_to_srt_timestamps(iter(msecs_list)) == expected
+    deltas = [timedelta(milliseconds=ms, microseconds=999) for ms in msecs_list]
+    assert [srt.timedelta_to_srt_timestamp(delta) for delta in deltas] == expected
+
+
 @given(st.lists(subtitles()), st.one_of(st.just("\n"), st.just("\r\n")))
 def test_compose_and_parse_strict_custom_eol(input_subs, eol):
     composed = srt.compose(input_subs, reindex=False, eol=eol)
@@ -628,6 +1312,35 @@ def test_bad_timestamp_format_raises(ts):
         srt.srt_timestamp_to_timedelta(ts)
 
 
+@given(equivalent_timestamps())
+def test_timestamp_to_milliseconds_matches_timedelta(timestamps):
+    for ts in timestamps:
+        msecs = srt.srt_timestamp_to_milliseconds(ts)
+        assert timedelta(milliseconds=msecs) == srt.srt_timestamp_to_timedelta(ts)
+
+
+@given(
+    st.lists(
+        st.one_of(
+            st.builds(srt.timedelta_to_srt_timestamp, timedeltas(max_value=50)),
+            st.builds(lambda pair: pair[0], equivalent_timestamps()),
+        )
+    ),
+    st.booleans(),
+)
+def test_timestamps_to_milliseconds_batch(timestamps, dot_delimiter):
+    if dot_delimiter:
+        timestamps = [ts.replace(",", ".") for ts in timestamps]
+    expected = [srt.srt_timestamp_to_milliseconds(ts) for ts in timestamps]
+    assert srt.srt_timestamps_to_milliseconds(iter(timestamps)) == expected
+
+
+@given(st.lists(st.builds(srt.timedelta_to_srt_timestamp, timedeltas(max_value=50))))
+def test_bad_timestamp_format_raises_batch(timestamps):
+    with pytest.raises(srt.TimestampParseError):
+        srt.srt_timestamps_to_milliseconds(timestamps + ["00t00:01,000"])
+
+
 @given(st.lists(subtitles()), st.lists(st.sampled_from(string.whitespace)))
 def test_can_parse_index_trailing_ws(input_subs, whitespace):
     out = ""
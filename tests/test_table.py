@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+import pytest
+from hypothesis import given
+import hypothesis.strategies as st
+
+import srt
+from test_srt import messy_srt, subs_eq, subtitles, _parse_outcome
+
+
+def _table_outcome(srt_input, **kwargs):
+    try:
+        table = srt.SubtitleTable.from_srt(srt_input, **kwargs)
+    except srt.SRTParseError as thrown_exc:
+        return None, thrown_exc.args
+    return list(table.to_subtitles()), None
+
+
+def _ms_subs(subs):
+    return [
+        srt.Subtitle(
+            sub.index,
+            srt.timedelta_to_milliseconds(sub.start),
+            srt.timedelta_to_milliseconds(sub.end),
+            sub.content,
+            sub.proprietary,
+        )
+        for sub in subs
+    ]
+
+
+@given(st.lists(subtitles(strict=False)))
+def test_table_roundtrip(input_subs):
+    table = srt.SubtitleTable.from_subtitles(input_subs)
+    assert len(table) == len(input_subs)
+    subs_eq(table.to_subtitles(), input_subs)
+    subs_eq(table.to_subtitles(milliseconds=True), _ms_subs(input_subs))
+
+    ms_table = srt.SubtitleTable.from_subtitles(_ms_subs(input_subs))
+    subs_eq(ms_table.to_subtitles(), input_subs)
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.sampled_from([str, StringIO, str.encode, lambda data: BytesIO(data.encode())]),
+)
+def test_table_from_srt_matches_parse(input_subs, make_input):
+    composed = srt.compose(input_subs, reindex=False, strict=False)
+    table = srt.SubtitleTable.from_srt(make_input(composed))
+    subs_eq(table.to_subtitles(), input_subs)
+
+
+@given(messy_srt(), st.booleans())
+def test_table_from_srt_errors_match_parse(srt_input, ignore_errors):
+    expected_subs, expected_error = _parse_outcome(
+        srt_input, ignore_errors=ignore_errors
+    )
+    got_subs, got_error = _table_outcome(srt_input, ignore_errors=ignore_errors)
+    assert got_error == expected_error
+    if expected_error is None:
+        subs_eq(got_subs, expected_subs)
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.integers(min_value=-(10**9), max_value=10**9),
+    st.booleans(),
+    st.integers(min_value=0),
+    st.sampled_from([None, "\n", "\r\n"]),
+    st.booleans(),
+)
+def test_table_compose_matches_compose(
+    input_subs, shift, reindex, start_index, eol, strict
+):
+    # Some of the subtitles are shifted before zero, so they're skipped when
+    # reindexing
+    for sub in input_subs[::2]:
+        sub.start += timedelta(milliseconds=shift)
+    table = srt.SubtitleTable.from_subtitles(input_subs)
+
+    expected = srt.compose(
+        input_subs, reindex=reindex, start_index=start_index, strict=strict, eol=eol
+    )
+    got = table.compose(
+        reindex=reindex, start_index=start_index, strict=strict, eol=eol
+    )
+    assert got == expected
+    # The table itself must not be changed by composing
+    subs_eq(table.to_subtitles(), input_subs)
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.integers(min_value=-(10**9), max_value=10**9),
+    st.floats(min_value=0.01, max_value=100),
+    st.floats(min_value=-(10**6), max_value=10**6),
+)
+def test_table_shift_and_scale(input_subs, shift, factor, offset):
+    table = srt.SubtitleTable.from_subtitles(input_subs)
+    table.shift(shift)
+    table.scale(factor, offset)
+
+    expected = _ms_subs(input_subs)
+    for sub in expected:
+        sub.start = round((sub.start + shift) * factor + offset)
+        sub.end = round((sub.end + shift) * factor + offset)
+    subs_eq(table.to_subtitles(milliseconds=True), expected)
+
+
+@given(
+    st.lists(subtitles(strict=False)),
+    st.one_of(st.none(), st.integers(min_value=0, max_value=10**9)),
+    st.one_of(st.none(), st.integers(min_value=10**9, max_value=10**10)),
+)
+def test_table_clip(input_subs, lower, upper):
+    table = srt.SubtitleTable.from_subtitles(input_subs)
+    table.clip(lower, upper)
+
+    expected = _ms_subs(input_subs)
+    for sub in expected:
+        for attr in ("start", "end"):
+            value = getattr(sub, attr)
+            if lower is not None:
+                value = max(value, lower)
+            if upper is not None:
+                value = min(value, upper)
+            setattr(sub, attr, value)
+    subs_eq(table.to_subtitles(milliseconds=True), expected)
+
+
+@given(st.lists(subtitles(strict=False)), st.integers(min_value=0))
+def test_table_sort_and_reindex(input_subs, start_index):
+    table = srt.SubtitleTable.from_subtitles(input_subs)
+    table.sort()
+    subs_eq(table.to_subtitles(), sorted(input_subs))
+
+    table.reindex(start_index)
+    expected = list(
+        srt.sort_and_reindex(input_subs, start_index=start_index, skip=False)
+    )
+    subs_eq(table.to_subtitles(), expected)
+
+
+def test_table_columns_must_match():
+    with pytest.raises(ValueError):
+        srt.SubtitleTable([1, 2], [0, 1000], [500, 1500], ["a"])
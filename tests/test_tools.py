@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
@@ -106,7 +107,25 @@ def test_tools_support():
         (["mux", "-t"], False, True),
         (["normalize"], False),
         (["paste"], False),
+        (["pipe", "fixed_timeshift -s 5", "normalize"], False),
     ]
 
     for args in matrix:
         assert_supports_all_io_methods(*args)
+
+
+def test_tools_output_to_input():
+    in_file = os.path.join(sample_dir, "ascii.srt")
+    fd, same_file = tempfile.mkstemp()
+    os.close(fd)
+
+    try:
+        for args in (["fixed_timeshift", "--seconds", "5"], ["mux"]):
+            cmd = [sys.executable, "srt/tools/_srt.py"] + args
+            expected = run_srt_util(cmd + ["-i", in_file])
+            shutil.copyfile(in_file, same_file)
+            run_srt_util(cmd + ["-i", same_file, "-o", same_file])
+            with open(same_file, encoding="utf-8-sig", newline="") as srt_file:
+                assert srt_file.read() == expected
+    finally:
+        os.remove(same_file)
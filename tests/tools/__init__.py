@@ -23,5 +23,17 @@ def create_blocks(setting=0):
         yield subtitle
 
 
+def milliseconds(subs):
+    """Copies subtitles, storing their times as milliseconds"""
+    for subtitle in subs:
+        yield srt.Subtitle(
+            subtitle.index,
+            srt.timedelta_to_milliseconds(subtitle.start),
+            srt.timedelta_to_milliseconds(subtitle.end),
+            subtitle.content,
+            subtitle.proprietary,
+        )
+
+
 def sort(subs):
     return list(srt.sort_and_reindex(subs))
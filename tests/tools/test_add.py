@@ -50,6 +50,16 @@ class TestToolAdd(unittest.TestCase):
         a.append(srt.Subtitle(0, t("00:00:25,000"), t("00:00:30,000"), "ADD"))
         self.assertEqual(list(result), sort(a))  # after
 
+    def test_add_caption_milliseconds(self):
+        for start, end, adjust in (
+            ("00:00:00,000", "00:00:01,000", True),
+            ("00:00:15,000", "00:00:18,000", False),
+            ("00:00:15,000", "00:00:16,000", True),
+        ):
+            expected = add(self.subs(), t(start), t(end), "ADD", adjust)
+            result = add(milliseconds(self.subs()), t(start), t(end), "ADD", adjust)
+            self.assertEqual(list(result), list(milliseconds(expected)))
+
 
 if __name__ == "__main__":
     unittest.main()
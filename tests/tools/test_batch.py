@@ -0,0 +1,119 @@
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from . import *
+from srt.tools import _cli, fixed_timeshift
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nA\n\n"
+SHIFTED_SRT = "1\n00:00:06,000 --> 00:00:07,000\nA\n\n"
+FILES = {
+    "a.srt": SRT,
+    os.path.join("sub", "b.srt"): SRT,
+    os.path.join("sub", "bad.srt"): "garbage\n",
+    "notes.txt": SRT,
+}
+
+
+def _umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.dir, "in")
+        for name, content in FILES.items():
+            path = os.path.join(self.input_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", newline="") as srt_file:
+                srt_file.write(content)
+        self.executor = ThreadPoolExecutor(2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        shutil.rmtree(self.dir)
+
+    def read(self, *parts):
+        with open(os.path.join(self.dir, *parts), newline="") as srt_file:
+            return srt_file.read().replace(os.linesep, "\n")
+
+    def batch(self, argv):
+        args = fixed_timeshift.set_args(argv)
+        results = _cli.batch(
+            "srt.tools.fixed_timeshift", args, argv, executor=self.executor
+        )
+        return {os.path.relpath(path, self.input_dir): error for path, error in results}
+
+    def test_batch_output_dir(self):
+        output_dir = os.path.join(self.dir, "out")
+        results = self.batch(["-s", "5", "-r", self.input_dir, "-o", output_dir])
+
+        bad = os.path.join("sub", "bad.srt")
+        self.assertEqual(sorted(results), sorted(set(FILES) - {"notes.txt"}))
+        self.assertIsInstance(results.pop(bad), srt.SRTParseError)
+        self.assertEqual(list(results.values()), [None, None])
+
+        self.assertEqual(self.read("out", "a.srt"), SHIFTED_SRT)
+        self.assertEqual(self.read("out", "sub", "b.srt"), SHIFTED_SRT)
+        self.assertFalse(os.path.exists(os.path.join(output_dir, bad)))
+        self.assertEqual(self.read("in", "a.srt"), SRT)
+
+    def test_batch_inplace(self):
+        results = self.batch(["-s", "5", "-r", self.input_dir, "-q", "--glob", "a*"])
+        self.assertEqual(results, {"a.srt": None})
+        self.assertEqual(self.read("in", "a.srt"), SHIFTED_SRT)
+        self.assertEqual(self.read("in", "sub", "b.srt"), SRT)
+
+    def test_batch_inplace_keeps_bad_file(self):
+        bad_path = os.path.join(self.input_dir, "sub", "bad.srt")
+        with open(bad_path, "rb") as bad_file:
+            bad_bytes = bad_file.read()
+        os.chmod(bad_path, 0o640)
+
+        results = self.batch(["-s", "5", "-r", self.input_dir, "-q"])
+
+        self.assertIsInstance(
+            results[os.path.join("sub", "bad.srt")], srt.SRTParseError
+        )
+        with open(bad_path, "rb") as bad_file:
+            self.assertEqual(bad_file.read(), bad_bytes)
+        self.assertEqual(self.read("in", "sub", "b.srt"), SHIFTED_SRT)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.input_dir, "sub"))),
+            ["b.srt", "bad.srt"],
+        )
+        if os.name == "posix":
+            self.assertEqual(os.stat(bad_path).st_mode & 0o777, 0o640)
+            b_path = os.path.join(self.input_dir, "sub", "b.srt")
+            self.assertEqual(os.stat(b_path).st_mode & 0o777, 0o666 & ~_umask())
+
+    def test_batch_output_inside_input(self):
+        output_dir = os.path.join(self.input_dir, "out")
+        self.batch(["-s", "5", "-r", self.input_dir, "-o", output_dir])
+        results = self.batch(["-s", "5", "-r", self.input_dir, "-o", output_dir])
+        self.assertNotIn(os.path.join("out", "a.srt"), results)
+        self.assertEqual(self.read("in", "out", "a.srt"), SHIFTED_SRT)
+
+    def test_batch_invalid_args(self):
+        for argv in [
+            ["-s", "5", "-r", self.input_dir],
+            ["-s", "5", "-r", self.input_dir, "-i", "x.srt", "-q"],
+            ["-s", "5", "-r", self.input_dir, "-o", "out", "-q"],
+        ]:
+            stderr = io.StringIO()
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(stderr):
+                fixed_timeshift.set_args(argv)
+            self.assertIn("Cannot use", stderr.getvalue())
+
+        args = argparse.Namespace(
+            input="x.srt", output=_cli.DASH_STREAM_MAP["output"], inplace=True
+        )
+        with self.assertRaises(ValueError):
+            _cli.batch_output_dir(args)
@@ -0,0 +1,105 @@
+import datetime
+import unittest
+from . import *
+from srt.tools.deduplicate import *
+from srt.tools.deduplicate import _lsh_bands
+
+
+def sub(index, start, content):
+    return srt.Subtitle(
+        index, t(start), t(start) + datetime.timedelta(seconds=1), content
+    )
+
+
+class TestToolDeduplicate(unittest.TestCase):
+    def setUp(self):
+        self.subs = [
+            sub(1, "00:00:01,000", "A"),
+            sub(2, "00:00:01,000", "A"),
+            sub(3, "00:00:02,000", "B"),
+            sub(4, "00:00:04,000", "A"),
+            sub(5, "00:00:07,000", "A"),
+            sub(6, "00:00:20,000", "A"),
+            sub(7, "00:00:21,000", "B"),
+        ]
+
+    def tearDown(self):
+        pass
+
+    def test_deduplicate(self):
+        result = deduplicate(self.subs, datetime.timedelta(seconds=5))
+        self.assertEqual([s.index for s in result], [1, 3, 6, 7])
+
+        result = deduplicate(self.subs, datetime.timedelta(seconds=2))
+        self.assertEqual([s.index for s in result], [1, 3, 4, 5, 6, 7])
+
+        result = deduplicate(iter(self.subs), datetime.timedelta(0))
+        self.assertEqual([s.index for s in result], [1, 3])
+
+        self.assertEqual(list(deduplicate([], datetime.timedelta(0))), [])
+
+    def test_deduplicate_milliseconds(self):
+        result = deduplicate(milliseconds(self.subs), datetime.timedelta(seconds=5))
+        self.assertEqual([s.index for s in result], [1, 3, 6, 7])
+
+    def test_deduplicate_similar(self):
+        subs = [
+            sub(1, "00:00:01,000", "<i>Hello there, friend!</i>"),
+            sub(2, "00:00:02,000", "hello there friend"),
+            sub(3, "00:00:02,500", "Hel1o there, friend"),
+            sub(4, "00:00:03,000", "Something else entirely"),
+            sub(5, "00:00:20,000", "Hello there, friend"),
+        ]
+
+        result = deduplicate(subs, datetime.timedelta(seconds=5), similarity=0.9)
+        self.assertEqual([s.index for s in result], [1, 3, 4, 5])
+
+        result = deduplicate(subs, datetime.timedelta(seconds=5), similarity=0.6)
+        self.assertEqual([s.index for s in result], [1, 4, 5])
+
+        result = deduplicate(subs, datetime.timedelta(0), similarity=0.9)
+        self.assertEqual([s.index for s in result], [1, 3, 4])
+
+        result = deduplicate(subs, datetime.timedelta(0), similarity=1)
+        self.assertEqual([s.index for s in result], [1, 3, 4])
+
+    def test_deduplicate_similar_without_words(self):
+        # Nothing is left of these to compare, so they have to be the same
+        subs = [
+            sub(1, "00:00:01,000", "\u266a"),
+            sub(2, "00:00:01,500", "..."),
+            sub(3, "00:00:02,000", "<i></i>"),
+            sub(4, "00:00:02,500", "\u266a"),
+            sub(5, "00:00:03,000", "Hello"),
+        ]
+        result = deduplicate(subs, datetime.timedelta(seconds=5), similarity=0.5)
+        self.assertEqual([s.index for s in result], [1, 2, 3, 5])
+
+    def test_deduplicate_similar_exact_duplicates(self):
+        # The same as without similarity, since the content is all different
+        result = deduplicate(self.subs, datetime.timedelta(seconds=5), similarity=1)
+        self.assertEqual([s.index for s in result], [1, 3, 6, 7])
+
+        result = deduplicate(self.subs, datetime.timedelta(seconds=2), similarity=1)
+        self.assertEqual([s.index for s in result], [1, 3, 4, 5, 6, 7])
+
+    def test_deduplicate_similar_logs_merges(self):
+        subs = [sub(1, "00:00:01,000", "Hello!"), sub(2, "00:00:02,000", "hello")]
+        with self.assertLogs("srt.tools.deduplicate", level="INFO") as logs:
+            list(deduplicate(subs, datetime.timedelta(seconds=5), similarity=0.9))
+        self.assertIn("Merged s2 into s1 (1.00 similar)", logs.output[0])
+        self.assertIn("Merged 1 subtitle(s)", logs.output[-1])
+
+    def test_similarity_arg(self):
+        self.assertEqual(set_args(["--similarity", "0.8"]).similarity, 0.8)
+        self.assertIsNone(set_args([]).similarity)
+        for bad in ("0", "1.5", "x"):
+            with self.assertRaises(SystemExit):
+                set_args(["--similarity", bad])
+
+    def test_lsh_bands(self):
+        for similarity in (0.5, 0.7, 0.9, 1):
+            bands, rows = _lsh_bands(similarity)
+            self.assertEqual(bands * rows, MINHASH_PERMUTATIONS)
+            self.assertGreaterEqual(1 - (1 - similarity**rows) ** bands, LSH_RECALL)
+        self.assertGreater(_lsh_bands(0.9)[1], _lsh_bands(0.5)[1])
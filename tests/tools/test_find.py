@@ -100,6 +100,48 @@ class TestToolFind(unittest.TestCase):
         ]
         self.assertEqual(list(result), a)  # split
 
+    def test_find_milliseconds(self):
+        for timestamp_one, timestamp_two, adjust in (
+            ("00:00:00,000", "00:00:17,500", False),
+            ("00:00:17,500", "00:00:12,000", False),
+            ("00:00:12,000", "00:00:17,500", True),
+        ):
+            expected = find_by_timestamp(
+                self.subs(), t(timestamp_one), t(timestamp_two), adjust
+            )
+            result = find_by_timestamp(
+                milliseconds(self.subs()), t(timestamp_one), t(timestamp_two), adjust
+            )
+            self.assertEqual(list(result), list(milliseconds(expected)))
+
+    def test_find_index(self):
+        index = srt.SubtitleIndex(self.subs())
+        for timestamp_one, timestamp_two in (
+            ("00:00:00,000", "00:00:30,000"),
+            ("00:00:12,000", "00:00:17,500"),
+            ("00:00:16,538", "00:00:14,203"),
+            ("00:00:14,500", "00:00:14,500"),
+            ("00:00:30,000", "00:00:40,000"),
+        ):
+            for adjust in (False, True):
+                expected = find_by_timestamp(
+                    self.subs(), t(timestamp_one), t(timestamp_two), adjust
+                )
+                result = find_by_timestamp(
+                    index, t(timestamp_one), t(timestamp_two), adjust
+                )
+                self.assertEqual(list(result), list(expected))
+
+        index = srt.SubtitleIndex(milliseconds(self.subs()))
+        result = find_by_timestamp(index, t("00:00:12,000"), t("00:00:17,500"))
+        expected = find_by_timestamp(
+            milliseconds(self.subs()), t("00:00:12,000"), t("00:00:17,500")
+        )
+        self.assertEqual(list(result), list(expected))
+
+        result = find_by_timestamp(srt.SubtitleIndex([]), t("00:00:12,000"))
+        self.assertEqual(list(result), [])
+
 
 if __name__ == "__main__":
     unittest.main()
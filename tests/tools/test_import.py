@@ -1,5 +1,11 @@
+import importlib
+import os
+import subprocess
+import sys
 import unittest
 
+import srt
+
 
 class TestImportSRT(unittest.TestCase):
     def test_import(self):
@@ -48,3 +54,83 @@ class TestImportSRT(unittest.TestCase):
 
         except AttributeError:
             self.fail("AttributeError raised during module import.")
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+NO_LAZY_IMPORTS = "Everything is imported up front before Python 3.7"
+
+
+# Runs a command line, and prints every module it imported, including those
+# from importlib.import_module which -X importtime doesn't report
+LIST_MODULES = """
+import sys
+sys.argv = {argv!r}
+try:
+    {code}
+except SystemExit:
+    pass
+print("\\n".join(sys.modules), file=sys.stderr)
+"""
+
+
+def imported_modules(code, argv=()):
+    """Runs code in a new interpreter, and returns the modules it imported"""
+    result = subprocess.run(
+        [sys.executable, "-c", LIST_MODULES.format(code=code, argv=list(argv))],
+        cwd=ROOT_DIR,
+        env=dict(os.environ, PYTHONPATH=ROOT_DIR),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return set(result.stderr.splitlines())
+
+
+class TestImportTime(unittest.TestCase):
+    def test_commands_are_registered(self):
+        folder_path = os.path.join(ROOT_DIR, "srt", "tools")
+        scripts = [
+            script[:-3]
+            for script in os.listdir(folder_path)
+            if not script.startswith("_") and script.endswith(".py")
+        ]
+        self.assertEqual(sorted(scripts), list(srt.tools.COMMANDS))
+
+    @unittest.skipIf(sys.version_info < (3, 7), NO_LAZY_IMPORTS)
+    def test_import_srt_is_lazy(self):
+        modules = imported_modules("import srt")
+        self.assertIn("srt.srt", modules)
+        for module in [
+            "argparse",
+            "pickle",
+            "tempfile",
+            "srt.parallel",
+            "srt.table",
+            "srt.tools._cli",
+        ]:
+            self.assertNotIn(module, modules)
+        for command in srt.tools.COMMANDS:
+            self.assertNotIn("srt.tools." + command, modules)
+
+    @unittest.skipIf(sys.version_info < (3, 7), NO_LAZY_IMPORTS)
+    def test_command_imports_only_itself(self):
+        modules = imported_modules(
+            "from srt.tools import _srt; _srt.main()", ["srt", "find", "--help"]
+        )
+        self.assertIn("srt.tools.find", modules)
+        # find splits subtitles with split, but needs nothing else
+        for command in srt.tools.COMMANDS:
+            if command not in ("find", "split"):
+                self.assertNotIn("srt.tools." + command, modules)
+
+    def test_lazy_attributes(self):
+        self.assertIs(srt.tools.find, importlib.import_module("srt.tools.find"))
+        self.assertIs(srt.SubtitleTable, srt.table.SubtitleTable)
+        self.assertIs(srt.parse_parallel, srt.parallel.parse_parallel)
+        self.assertIn("find", dir(srt.tools))
+        self.assertIn("SubtitleTable", dir(srt))
+        with self.assertRaises(AttributeError):
+            srt.tools.not_a_tool
+        with self.assertRaises(AttributeError):
+            srt.not_an_attribute
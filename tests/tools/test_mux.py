@@ -0,0 +1,126 @@
+import copy
+import datetime
+import operator
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from . import *
+from srt.tools.mux import *
+from srt.tools.mux import _match_all_times
+
+
+def sub(index, start, end):
+    return srt.Subtitle(index, t(start), t(end), str(index))
+
+
+def times(subs):
+    return sorted((s.index, s.start, s.end) for s in subs)
+
+
+def run_main(out_file, *argv):
+    # Mux a sample file with itself from the command line
+    in_file = os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "files", "ascii.srt"
+    )
+    argv = ["mux", "-i", in_file, "-i", in_file, "-o", out_file] + list(argv)
+    with mock.patch.object(sys, "argv", argv):
+        main()
+    with open(out_file, "rb") as srt_file:
+        return srt_file.read()
+
+
+class TestToolMux(unittest.TestCase):
+    def setUp(self):
+        # Several tracks, mostly saying the same thing at slightly different times
+        self.subs = [
+            sub(1, "00:00:01,000", "00:00:03,000"),
+            sub(2, "00:00:01,200", "00:00:03,300"),
+            sub(3, "00:00:01,500", "00:00:02,500"),
+            sub(4, "00:00:01,700", "00:00:05,000"),
+            sub(5, "00:00:10,000", "00:00:12,000"),
+        ]
+        self.expected = [
+            (1, t("00:00:01,000"), t("00:00:02,500")),
+            (2, t("00:00:01,000"), t("00:00:03,300")),
+            (3, t("00:00:01,000"), t("00:00:02,500")),
+            (4, t("00:00:01,700"), t("00:00:05,000")),
+            (5, t("00:00:10,000"), t("00:00:12,000")),
+        ]
+
+    def tearDown(self):
+        pass
+
+    def test_mux(self):
+        mux(self.subs, datetime.timedelta(milliseconds=600), "start")
+        mux(self.subs, datetime.timedelta(milliseconds=600), "end")
+        self.assertEqual(times(self.subs), self.expected)
+
+    def test_mux_any_amount_of_tracks(self):
+        # More overlapping subtitles than the old default window of 5
+        subs = [sub(i, "00:00:01,000", "00:00:02,000") for i in range(1, 21)]
+        for i, subtitle in enumerate(subs):
+            subtitle.start += datetime.timedelta(milliseconds=10 * i)
+        mux(subs, datetime.timedelta(milliseconds=600), "start", width=2)
+        self.assertEqual({s.start for s in subs}, {t("00:00:01,000")})
+
+    def test_width_has_no_effect(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            without_width = run_main(os.path.join(out_dir, "a.srt"))
+            with self.assertLogs("srt.tools.mux", "WARNING") as logs:
+                with_width = run_main(os.path.join(out_dir, "b.srt"), "-w", "2")
+
+        self.assertTrue(without_width)
+        self.assertEqual(with_width, without_width)
+        self.assertIn("--width has no effect", logs.output[0])
+
+    def test_match_times(self):
+        result = list(
+            match_times(iter(self.subs), datetime.timedelta(milliseconds=600))
+        )
+        self.assertEqual([s.index for s in result], [1, 2, 3, 4, 5])
+        self.assertEqual(times(result), self.expected)
+
+        self.assertEqual(list(match_times([], datetime.timedelta(0))), [])
+
+    def test_match_times_same_as_mux(self):
+        for acceptable_diff in (0, 500, 1000, 3000):
+            acceptable_diff = datetime.timedelta(milliseconds=acceptable_diff)
+            expected = list(create_blocks(1))
+            mux(expected, acceptable_diff, "start")
+            mux(expected, acceptable_diff, "end")
+            result = match_times(create_blocks(1), acceptable_diff)
+            self.assertEqual(times(result), times(expected))
+
+    def test_match_times_inverted(self):
+        acceptable_diff = datetime.timedelta(0)
+        subs = [
+            sub(1, "00:00:00,523", "00:00:00,666"),
+            sub(2, "00:00:00,752", "00:00:02,394"),
+            sub(3, "00:00:01,579", "00:00:03,493"),
+            sub(4, "00:00:02,832", "00:00:02,339"),
+        ]
+        expected = copy.deepcopy(subs)
+        mux(expected, acceptable_diff, "start")
+        mux(expected, acceptable_diff, "end")
+
+        with self.assertRaises(ValueError):
+            list(match_times(copy.deepcopy(subs), acceptable_diff))
+        _match_all_times(subs, acceptable_diff)
+        self.assertEqual(times(subs), times(expected))
+
+        # Ending before it starts is fine when nothing has ended after it yet
+        subs = [sub(0, "00:00:00,900", "00:00:00,100")] + self.subs
+        expected = copy.deepcopy(subs)
+        mux(expected, acceptable_diff, "start")
+        mux(expected, acceptable_diff, "end")
+        self.assertEqual(times(match_times(subs, acceptable_diff)), times(expected))
+
+    def test_match_times_milliseconds(self):
+        result = match_times(milliseconds(self.subs), 600)
+        self.assertEqual(times(result), times(milliseconds(self.expected_subs())))
+
+    def expected_subs(self):
+        for index, start, end in self.expected:
+            yield srt.Subtitle(index, start, end, str(index))
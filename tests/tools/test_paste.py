@@ -172,6 +172,21 @@ class TestToolPaste(unittest.TestCase):
         ]
         self.assertEqual(list(result), a)  # middle
 
+    def test_paste_milliseconds(self):
+        for timestamp, space, block in (
+            ("00:00:05,000", "00:00:00,000", False),
+            ("00:00:12,000", "00:00:01,000", True),
+        ):
+            expected = paste(self.subs(), self.copied, t(timestamp), t(space), block)
+            result = paste(
+                milliseconds(self.subs()),
+                milliseconds(self.copied),
+                t(timestamp),
+                t(space),
+                block,
+            )
+            self.assertEqual(list(result), list(milliseconds(expected)))
+
 
 if __name__ == "__main__":
     unittest.main()
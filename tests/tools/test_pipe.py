@@ -0,0 +1,46 @@
+import unittest
+from . import *
+from srt.tools.fixed_timeshift import timeshift
+from srt.tools.find import find_by_timestamp
+from srt.tools.pipe import *
+
+
+class TestToolPipe(unittest.TestCase):
+    def setUp(self):
+        self.subs = create_blocks
+
+    def tearDown(self):
+        pass
+
+    def test_pipe(self):
+        result = pipe(
+            self.subs(),
+            ["fixed_timeshift -s 1", ["find", "-s", "00:00:14,000"]],
+        )
+        shifted = sort(timeshift(self.subs(), 1))
+        expected = find_by_timestamp(shifted, t("00:00:14,000"))
+        self.assertEqual(list(result), list(expected))
+
+    def test_pipe_single_stage(self):
+        result = pipe(self.subs(), ["normalize"])
+        self.assertEqual(list(result), list(self.subs()))
+
+    def test_pipe_matches_chained_commands(self):
+        subs = [srt.Subtitle(1, t("00:00:01,000"), t("00:00:02,000"), "A\n\nB")]
+        stages = ["normalize", "match --fp 'lambda content: str(len(content))'"]
+        chained = subs
+        for stage in stages:
+            chained = srt.parse(srt.compose(pipe(chained, [stage])))
+        self.assertEqual(srt.compose(pipe(subs, stages)), srt.compose(chained))
+
+        subs = [srt.Subtitle(1, t("00:00:01,000"), t("00:00:02,000"), "A\n\nB")]
+        not_strict = pipe(subs, stages, strict=False)
+        self.assertEqual([sub.content for sub in not_strict], ["4"])
+
+    def test_pipe_invalid_stage(self):
+        with self.assertRaises(ValueError):
+            pipe(self.subs(), ["mux"])
+        with self.assertRaises(ValueError):
+            pipe(self.subs(), ["not_a_tool"])
+        with self.assertRaises(ValueError):
+            pipe(self.subs(), ["fixed_timeshift -s 1 -i example.srt"])
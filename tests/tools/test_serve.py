@@ -0,0 +1,143 @@
+import contextlib
+import io
+import os
+import shutil
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from . import *
+from srt.tools import _connect, _srt
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\nA\n\n"
+SHIFTED_SRT = "1\n00:00:06,000 --> 00:00:07,000\nA\n\n"
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are needed")
+class TestServe(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from srt.tools.serve import Server
+
+        cls.dir = tempfile.mkdtemp()
+        cls.socket_path = os.path.join(cls.dir, "srt.sock")
+        cls.server = Server(cls.socket_path, jobs=1)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.thread.join()
+        cls.server.server_close()
+        shutil.rmtree(cls.dir)
+
+    def request(self, command, argv, stdin=b""):
+        return _connect.request(
+            self.socket_path, command, argv, cwd=self.dir, stdin=io.BytesIO(stdin)
+        )
+
+    def test_serve_stdin(self):
+        status, stdout, stderr = self.request(
+            "fixed_timeshift", ["-s", "5"], SRT.encode()
+        )
+        self.assertEqual(status, 0)
+        self.assertEqual(stdout.decode().replace(os.linesep, "\n"), SHIFTED_SRT)
+
+    def test_serve_files(self):
+        with open(os.path.join(self.dir, "in.srt"), "w") as srt_file:
+            srt_file.write(SRT)
+
+        for _ in range(2):
+            status, stdout, _ = self.request(
+                "match",
+                ["--fm", "lambda x: x == 'A'", "-i", "in.srt", "-o", "out.srt"],
+            )
+            self.assertEqual((status, stdout), (0, b""))
+            with open(os.path.join(self.dir, "out.srt")) as srt_file:
+                self.assertEqual(srt_file.read(), SRT)
+
+    def test_serve_errors(self):
+        status, _, stderr = self.request("find", ["--bogus"])
+        self.assertEqual(status, 2)
+        self.assertIn(b"usage: find", stderr)
+
+        status, _, stderr = self.request("normalize", [], b"garbage\n")
+        self.assertEqual(status, 1)
+        self.assertIn(b"SRTParseError", stderr)
+
+        for command in ["not_a_tool", "serve"]:
+            status, _, stderr = self.request(command, [])
+            self.assertEqual(status, 1)
+            self.assertIn(b"Unknown command", stderr)
+
+    def test_serve_socket_permissions(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    @unittest.skipUnless(hasattr(socket, "SO_PEERCRED"), "SO_PEERCRED is needed")
+    def test_serve_other_user(self):
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            with self.assertRaises(ConnectionError):
+                self.request("normalize", [], SRT.encode())
+
+    def test_serve_socket_in_use(self):
+        from srt.tools.serve import Server
+
+        with self.assertRaises(OSError):
+            Server(self.socket_path)
+
+
+class TestServeUnavailable(unittest.TestCase):
+    def test_serve_needs_unix_sockets(self):
+        from srt.tools import serve
+
+        unix_server = socketserver.__dict__.pop("ThreadingUnixStreamServer", None)
+        try:
+            with mock.patch.object(sys, "argv", ["serve", "srt.sock"]):
+                with self.assertLogs(serve.log, "CRITICAL"):
+                    with self.assertRaises(SystemExit) as raised:
+                        serve.main()
+        finally:
+            if unix_server is not None:
+                socketserver.ThreadingUnixStreamServer = unix_server
+        self.assertEqual(raised.exception.code, 1)
+
+
+class TestConnect(unittest.TestCase):
+    def test_connect_without_command(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            with self.assertLogs(_connect.log, "ERROR"):
+                self.assertEqual(_connect.connect("srt.sock", []), 1)
+        self.assertEqual(stdout.getvalue(), "")
+
+    def run_srt(self, argv):
+        stdout = io.StringIO()
+        environ = {_srt.CONNECT_ENV_VAR: "srt.sock"}
+        with mock.patch.dict(os.environ, environ), mock.patch.object(
+            sys, "argv", ["srt"] + argv
+        ), mock.patch.object(_connect, "connect", return_value=0) as connect:
+            with contextlib.redirect_stdout(stdout):
+                with self.assertRaises(SystemExit) as raised:
+                    _srt.main()
+        return raised.exception.code, stdout.getvalue(), connect
+
+    def test_connect_env_var(self):
+        status, _, connect = self.run_srt(["normalize", "-i", "in.srt"])
+        self.assertEqual(status, 0)
+        connect.assert_called_once_with("srt.sock", ["normalize", "-i", "in.srt"])
+
+    def test_connect_env_var_help(self):
+        for argv in [[], ["--help"]]:
+            status, stdout, connect = self.run_srt(argv)
+            self.assertEqual(status, 0)
+            self.assertIn("Available commands", stdout)
+            connect.assert_not_called()
+
+        status, stdout, connect = self.run_srt(["not_a_tool"])
+        self.assertEqual(status, 1)
+        self.assertIn('Unknown command: "not_a_tool"', stdout)
+        connect.assert_not_called()
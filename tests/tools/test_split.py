@@ -50,6 +50,12 @@ class TestToolSplit(unittest.TestCase):
         ]
         self.assertEqual(list(result), a)  # append
 
+    def test_split_milliseconds(self):
+        for timestamp in ("00:00:12,000", "00:00:16,538", "00:00:17,500"):
+            expected = split(self.subs(), t(timestamp))
+            result = split(milliseconds(self.subs()), t(timestamp))
+            self.assertEqual(list(result), list(milliseconds(expected)))
+
 
 if __name__ == "__main__":
     unittest.main()